@@ -0,0 +1,110 @@
+"""
+Match quality and latency of AI scoring while Bedrock throttles or is down.
+
+Scores one JD against a set of resumes with semantic_match_with_ai from
+MAX_SCORING_CONCURRENCY threads, against the Bedrock stand-in. "direct"
+makes a single attempt per call like the previous code (every throttle
+becomes a keyword fallback); "invoker" goes through BedrockInvoker with its
+rate limiter, AIMD concurrency, retries and circuit breaker.
+
+Two scenarios:
+  throttled  the stand-in allows `rate_limit` calls per second
+  outage     every call fails; retries alone make every caller wait out its
+             backoff, the circuit breaker sends callers to the fallback at once
+
+Usage: python benchmarks/bench_bedrock_throttling.py [calls] [rate_limit] [latency_ms]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['BEDROCK_CACHE_ENABLED'] = 'false'
+os.environ['BEDROCK_CACHE_TABLE_NAME'] = ''
+os.environ['BEDROCK_BREAKER_COOLDOWN_SECONDS'] = '30'
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import lambda_function  # noqa: E402
+from stand_ins import CallCounter, FakeBedrock  # noqa: E402
+from bench_end_to_end import ROLE_PROFILES  # noqa: E402
+
+UNLIMITED = 10 ** 9
+
+
+def make_resumes(count: int, rng: random.Random):
+    roles = sorted(ROLE_PROFILES)
+    return [{'resume_id': f"resume_{i:05d}", 'role': roles[i % len(roles)], 's3_key': f"resumes/{i}.pdf",
+             'skills': rng.sample(ROLE_PROFILES[roles[i % len(roles)]], 8)} for i in range(count)]
+
+
+def run(label: str, invoker, bedrock: FakeBedrock, counter: CallCounter, resumes, requirements):
+    counter.reset()
+    lambda_function.bedrock_invoker = invoker
+    latencies = []
+
+    def score(resume):
+        start = time.perf_counter()
+        result = lambda_function.semantic_match_with_ai(requirements, resume)
+        latencies.append((time.perf_counter() - start) * 1000)
+        return result
+
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        with ThreadPoolExecutor(max_workers=lambda_function.MAX_SCORING_CONCURRENCY) as executor:
+            results = list(executor.map(score, resumes))
+    wall = time.perf_counter() - start
+
+    fallbacks = sum(r.get('explanation') == lambda_function.FALLBACK_EXPLANATION for r in results)
+    calls = counter.snapshot()
+    latencies.sort()
+    print(f"{label:<20} wall_s={wall:6.2f} fallback={fallbacks / len(results):6.1%} "
+          f"p50_ms={latencies[len(latencies) // 2]:8.1f} max_ms={latencies[-1]:8.1f} "
+          f"bedrock_calls={calls.get('bedrock.invoke_model', 0):<4} throttled={calls.get('bedrock.throttled', 0):<4} "
+          f"invoker={invoker.snapshot()}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rate_limit = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 200
+    rng = random.Random(5)
+    resumes = make_resumes(count, rng)
+    requirements = {'skills': rng.sample(ROLE_PROFILES['DevOps Engineer'], 6)}
+
+    counter = CallCounter()
+    bedrock = FakeBedrock(counter, lambda_function.extract_skills_from_dictionary, latency_ms=latency_ms,
+                          rate_limit=rate_limit)
+    lambda_function.bedrock_runtime = bedrock
+
+    def direct():
+        return lambda_function.BedrockInvoker(requests_per_minute=UNLIMITED, tokens_per_minute=UNLIMITED,
+                                              max_concurrency=UNLIMITED, max_attempts=1,
+                                              breaker_threshold=UNLIMITED)
+
+    def retries_only():
+        return lambda_function.BedrockInvoker(requests_per_minute=UNLIMITED, tokens_per_minute=UNLIMITED,
+                                              breaker_threshold=UNLIMITED)
+
+    def invoker():
+        # Request quota configured 50% above what the service actually allows; AIMD and retries absorb the rest
+        return lambda_function.BedrockInvoker(requests_per_minute=rate_limit * 60 * 1.5, tokens_per_minute=UNLIMITED)
+
+    print(f"calls={count} rate_limit={rate_limit}/s latency_ms={latency_ms} "
+          f"threads={lambda_function.MAX_SCORING_CONCURRENCY}")
+    print("throttled")
+    run('  direct', direct(), bedrock, counter, resumes, requirements)
+    time.sleep(2)
+    run('  invoker', invoker(), bedrock, counter, resumes, requirements)
+
+    print("outage")
+    bedrock.outage = True
+    run('  direct', direct(), bedrock, counter, resumes[:100], requirements)
+    run('  retries, no breaker', retries_only(), bedrock, counter, resumes[:100], requirements)
+    run('  invoker', invoker(), bedrock, counter, resumes[:100], requirements)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Throughput of bulk resume ingest against local stand-ins for S3, DynamoDB and Bedrock.
+
+Compares one uploader request per resume (the single-PDF API path, run
+sequentially) with bulk_ingest() over a zip archive of the same resumes.
+The stand-ins only sleep for a configurable latency, so the numbers show
+how well each path overlaps parsing and network waits.
+
+Usage: python benchmarks/bench_bulk_ingest.py [num_resumes] [bedrock_latency_ms]
+"""
+import base64
+import io
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('DYNAMODB_TABLE_NAME', 'resumes')
+os.environ.setdefault('SKILL_INDEX_TABLE_NAME', 'resumes-skill-index')
+os.environ.setdefault('S3_BUCKET_NAME', 'resumes-bucket')
+os.environ['BEDROCK_CACHE_ENABLED'] = 'false'
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'uploader', 'src'))
+
+import lambda_function  # noqa: E402
+from bench_pdf_extract import make_pdf  # noqa: E402
+
+S3_LATENCY = 0.02
+DYNAMODB_LATENCY = 0.005
+BATCH_WRITE_LATENCY = 0.02
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+    
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        time.sleep(S3_LATENCY)
+        self.objects[Key] = Body
+
+
+class FakeBatchWriter:
+    def __init__(self, table):
+        self.table = table
+        self.pending = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        # BatchWriteItem takes up to 25 items per request
+        time.sleep(BATCH_WRITE_LATENCY * -(-self.pending // 25))
+    
+    def put_item(self, Item):
+        self.pending += 1
+        self.table.items[Item['resume_id']] = Item
+
+
+class FakeTable:
+    def __init__(self):
+        self.items = {}
+        self.lock = threading.Lock()
+    
+    def query(self, **kwargs):
+        time.sleep(DYNAMODB_LATENCY)
+        return {'Items': []}
+    
+    def put_item(self, Item):
+        time.sleep(DYNAMODB_LATENCY)
+        self.items[Item['resume_id']] = Item
+    
+    def update_item(self, **kwargs):
+        time.sleep(DYNAMODB_LATENCY)
+    
+    def batch_writer(self):
+        return FakeBatchWriter(self)
+
+
+class FakeDynamoDB:
+    def __init__(self):
+        self.tables = {}
+    
+    def Table(self, name):
+        return self.tables.setdefault(name, FakeTable())
+    
+    def batch_write_item(self, RequestItems):
+        time.sleep(BATCH_WRITE_LATENCY)
+        for name, requests in RequestItems.items():
+            for request in requests:
+                item = request['PutRequest']['Item']
+                self.Table(name).items[item['resume_id']] = item
+        return {'UnprocessedItems': {}}
+
+
+class FakeBedrock:
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    def invoke_model(self, modelId, body):
+        time.sleep(self.latency)
+        text = json.dumps(['python', 'aws', 'docker', 'kubernetes', 'terraform'])
+        return {'body': io.BytesIO(json.dumps({'content': [{'text': text}]}).encode())}
+
+
+def install_fakes(bedrock_latency: float):
+    lambda_function.s3_client = FakeS3()
+    lambda_function.dynamodb = FakeDynamoDB()
+    lambda_function.bedrock_runtime = FakeBedrock(bedrock_latency)
+    return lambda_function.dynamodb
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    bedrock_latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 200) / 1000
+    pdfs = [make_pdf(2, line=f"Candidate {i} DevOps Engineer with Kubernetes, Terraform and AWS") for i in range(count)]
+    
+    # One API request per resume
+    install_fakes(bedrock_latency)
+    start = time.perf_counter()
+    for i, pdf_bytes in enumerate(pdfs):
+        event = {'body': json.dumps({'resume_data': base64.b64encode(pdf_bytes).decode(), 'resume_name': f"{i}.pdf"})}
+        assert lambda_function.lambda_handler(event, None)['statusCode'] == 200
+    sequential = time.perf_counter() - start
+    
+    # Bulk ingest of the same resumes from one archive
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zip_file:
+        for i, pdf_bytes in enumerate(pdfs):
+            zip_file.writestr(f"archive/{i}.pdf", pdf_bytes)
+    archive.seek(0)
+    
+    fake_dynamodb = install_fakes(bedrock_latency)
+    report = lambda_function.bulk_ingest(lambda_function.iter_zip_sources(archive))
+    assert report['ingested'] == count and not report['errors'], report
+    assert len(fake_dynamodb.Table(os.environ['DYNAMODB_TABLE_NAME']).items) == count
+    
+    print(f"resumes={count} bedrock_latency_ms={bedrock_latency * 1000:.0f} "
+          f"parse_workers={lambda_function.BULK_PARSE_WORKERS} "
+          f"bedrock_concurrency={lambda_function.BULK_BEDROCK_CONCURRENCY}")
+    print(f"sequential requests: {sequential:.2f}s ({count / sequential:.1f} resumes/sec)")
+    print(f"bulk ingest:         {report['elapsed_seconds']:.2f}s ({report['resumes_per_second']:.1f} resumes/sec)")
+
+
+if __name__ == '__main__':
+    main()
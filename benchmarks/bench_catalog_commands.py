@@ -0,0 +1,135 @@
+"""
+Cost of the /stats and /list Telegram commands as the catalog grows.
+
+For each catalog size a fresh matcher module (a cold container) is wired to
+the DynamoDB and Telegram stand-ins, the corpus is stored directly, and the
+catalog stats item is built when the handler supports it. Then /stats,
+/list, /list 2, /list 3 and a jump to /list 8 are sent through the real
+lambda_handler, reporting latency, DynamoDB calls, items read and the reply
+length (Telegram rejects messages over 4096 characters).
+
+For the current tree it also pages through the whole catalog with
+get_resume_page and checks every resume appears exactly once, and that the
+stats item matches a count of the catalog. --source runs the handlers of
+another checkout (e.g. a git worktree of the baseline commit).
+
+Usage: python benchmarks/bench_catalog_commands.py [--sizes 1000,10000,100000] [--source CHECKOUT]
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+
+from bench_end_to_end import (ROOT, RESUMES_TABLE, SKILL_INDEX_TABLE, BEDROCK_CACHE_TABLE, STATS_TABLE,
+                              configure_environment, load_handler, make_corpus)
+from stand_ins import CallCounter, FakeDynamoDB, TelegramStandIn, start_telegram_stand_in
+
+
+COMMANDS = ['/stats', '/list', '/list 2', '/list 3', '/list 8']
+CHAT_ID = 3000
+
+
+def fresh_matcher(source: str, counter: CallCounter, telegram_url: str, corpus):
+    dynamodb = FakeDynamoDB(counter, {
+        RESUMES_TABLE: ('resume_id', {'content-hash-index': 'content_hash', 'role-index': 'role',
+                                      'created-day-index': 'created_day'}),
+        SKILL_INDEX_TABLE: ('skill', {}),
+        BEDROCK_CACHE_TABLE: ('cache_key', {}),
+        STATS_TABLE: ('stats_id', {}),
+    }, latency_ms=2)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        matcher = load_handler('matcher', source)
+    matcher.dynamodb = dynamodb
+    matcher.TELEGRAM_API_URL = telegram_url
+
+    table = dynamodb.Table(RESUMES_TABLE)
+    for resume in corpus:
+        table.store({k: v for k, v in resume.items() if k != 'text'})
+    if hasattr(matcher, 'rebuild_catalog_stats'):
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            matcher.rebuild_catalog_stats()
+    return matcher
+
+
+def send(matcher, counter: CallCounter, text: str):
+    counter.reset()
+    TelegramStandIn.messages = []
+    event = {'body': json.dumps({'message': {'chat': {'id': CHAT_ID}, 'text': text}})}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        matcher.lambda_handler(event, None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    calls = counter.snapshot()
+    reply = TelegramStandIn.messages[-1][2] if TelegramStandIn.messages else ''
+    return {
+        'ms': elapsed_ms,
+        'dynamodb_calls': sum(n for name, n in calls.items()
+                              if name.startswith('dynamodb.') and name != 'dynamodb.items_read'),
+        'items_read': calls.get('dynamodb.items_read', 0),
+        'reply_chars': len(reply),
+    }
+
+
+def check_paging(matcher, corpus) -> list:
+    """Problems found paging through the whole catalog and comparing the stats item"""
+    problems = []
+    seen = []
+    page = 1
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        while True:
+            result = matcher.get_resume_page(page)
+            seen.extend(r['resume_id'] for r in result['resumes'])
+            if not result['has_more']:
+                break
+            page += 1
+        # Jumping straight to a page, with no cursors remembered, must land on the same resumes as paging to it
+        jump = random.Random(page).randint(2, max(2, page))
+        stats_table = matcher.dynamodb.Table(STATS_TABLE)
+        for stats_id in [key for key in stats_table.items if key.startswith('list#')]:
+            stats_table.remove(stats_id)
+        jumped = [r['resume_id'] for r in matcher.get_resume_page(jump)['resumes']]
+        stats = matcher.get_catalog_stats()
+    expected = sorted(r['resume_id'] for r in corpus)
+    if sorted(seen) != expected or len(seen) != len(set(seen)):
+        problems.append(f"paging returned {len(seen)} ids, {len(set(seen))} unique, expected {len(expected)}")
+    if jumped != seen[(jump - 1) * matcher.LIST_PAGE_SIZE:jump * matcher.LIST_PAGE_SIZE]:
+        problems.append(f"jump to page {jump} differs from paging to it")
+    if stats != matcher.summarize_catalog(matcher.count_catalog(corpus)):
+        problems.append("stats item differs from a count of the catalog")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--source', default=ROOT, help='checkout whose handlers are run')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    configure_environment([])
+    counter = CallCounter()
+    server, telegram_url = start_telegram_stand_in(counter)
+
+    failures = 0
+    print(f"{'resumes':>8} {'command':<9} {'ms':>9} {'ddb_calls':>9} {'items_read':>10} {'reply_chars':>11}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        corpus = make_corpus(size, random.Random(args.seed))
+        matcher = fresh_matcher(args.source, counter, telegram_url, corpus)
+        for command in COMMANDS:
+            result = send(matcher, counter, command)
+            print(f"{size:>8} {command:<9} {result['ms']:>9.1f} {result['dynamodb_calls']:>9} "
+                  f"{result['items_read']:>10} {result['reply_chars']:>11}")
+        if hasattr(matcher, 'get_resume_page') and size <= 10000:
+            problems = check_paging(matcher, corpus)
+            failures += len(problems)
+            print(f"{size:>8} paging and stats check: {'; '.join(problems) or 'ok'}")
+
+    server.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Cold-start cost of each Lambda handler path, with budgets.
+
+Every path runs in a fresh interpreter under `python -X importtime`, the way
+a new Lambda container would: import the handler module, then do the first
+piece of work that path needs. We report the median wall time, the heaviest
+imports, and which expensive modules got loaded. The script exits 1 when a
+path goes over its time budget or loads a module it should not need.
+
+Time budgets depend on the machine; scale them with COLD_START_BUDGET_SCALE.
+
+Usage: python benchmarks/bench_cold_start.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HEAVY_MODULES = ['boto3', 'botocore', 'numpy', 'PyPDF2', 'urllib3', 'multiprocessing']
+BUDGET_SCALE = float(os.environ.get('COLD_START_BUDGET_SCALE', '1'))
+
+TELEGRAM_START = "{'body': json.dumps({'message': {'chat': {'id': 1}, 'text': '/start'}})}"
+TOUCH_AWS = "lf.dynamodb.Table('resumes'); lf.s3_client.meta; lf.bedrock_runtime.meta"
+
+# (handler, path, code run after import, max_ms, modules the path must not load)
+PATHS = [
+    ('matcher', 'import', "", 150, ['boto3', 'numpy', 'PyPDF2']),
+    ('matcher', 'telegram /start', f"lf.lambda_handler({TELEGRAM_START}, None)", 200, ['boto3', 'numpy', 'PyPDF2']),
+    ('matcher', 'aws clients', TOUCH_AWS, 1000, ['numpy', 'PyPDF2']),
+    ('uploader', 'import', "", 100, ['boto3', 'PyPDF2', 'urllib3', 'multiprocessing']),
+    ('uploader', 'pdf parse', "lf.extract_text_from_pdf(open(os.environ['SAMPLE_PDF'], 'rb').read())", 400,
+     ['boto3', 'numpy']),
+    ('uploader', 'aws clients', TOUCH_AWS, 1000, ['PyPDF2', 'numpy']),
+]
+
+SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import lambda_function as lf
+{code}
+elapsed_ms = (time.perf_counter() - start) * 1000
+print('RESULT ' + json.dumps({{'ms': elapsed_ms, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_path(handler: str, code: str, sample_pdf: str):
+    script = SCRIPT.format(src=os.path.join(ROOT, 'lambda', handler, 'src'), code=code, heavy=HEAVY_MODULES)
+    env = dict(os.environ, AWS_DEFAULT_REGION='us-east-1', TELEGRAM_BOT_TOKEN='', SAMPLE_PDF=sample_pdf)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], capture_output=True, text=True, env=env)
+    result = next((json.loads(line[len('RESULT '):]) for line in proc.stdout.splitlines() if line.startswith('RESULT ')), None)
+    if result is None:
+        raise RuntimeError(f"{handler} path failed:\n{proc.stderr[-2000:]}")
+    return result, top_imports(proc.stderr)
+
+
+def top_imports(importtime_log: str, count: int = 3):
+    """Top-level imports with the largest cumulative time, from -X importtime output"""
+    entries = []
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level entries have exactly one space of indentation
+        if name.startswith(' ') and not name.startswith('  '):
+            entries.append((int(cumulative) / 1000, name.strip()))
+    entries.sort(reverse=True)
+    return [f"{name} {ms:.0f}ms" for ms, name in entries[:count]]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = []
+
+    from bench_pdf_extract import make_pdf
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as sample:
+        sample.write(make_pdf(1))
+
+    for handler, path, code, max_ms, forbidden in PATHS:
+        results = [run_path(handler, code, sample.name) for _ in range(runs)]
+        median_ms = statistics.median(r['ms'] for r, _ in results)
+        loaded = results[0][0]['loaded']
+        budget_ms = max_ms * BUDGET_SCALE
+
+        problems = [f"{median_ms:.0f}ms > {budget_ms:.0f}ms budget"] if median_ms > budget_ms else []
+        problems += [f"loads {m}" for m in forbidden if m in loaded]
+        failures += [f"{handler} {path}: {p}" for p in problems]
+
+        print(f"{handler:<9} {path:<16} median_ms={median_ms:7.1f} budget_ms={budget_ms:6.0f} "
+              f"{'FAIL' if problems else 'ok':<4} loaded={','.join(loaded) or '-'}")
+        print(f"{'':<26} heaviest imports: {', '.join(results[0][1])}")
+    os.unlink(sample.name)
+
+    if failures:
+        print("\nCold-start regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Bound-based early termination of AI scoring.
+
+For each JD, a shortlist of resumes is scored twice against the Bedrock
+stand-in with MATCH_ENGINE=ai semantics: exhaustively, and with top_k so
+candidates go out in descending match_score_upper_bound order and scoring
+stops once the top K is settled. The top K of both runs must be identical
+(same resumes, scores and order); any difference fails the run. Reports
+Bedrock calls made by each, calls skipped, and wall time, for single and
+batched scoring.
+
+The stand-in scores like a lenient model rather than by exact overlap: a
+required skill the taxonomy relates to the resume earns its taxonomy credit,
+and an unrelated one a stable share of up to unrelated_credit for transferable
+experience. Scores above match_score_upper_bound are counted as bound
+violations; raise unrelated_credit past RANKING_UNRELATED_CREDIT to see the
+cutoff break.
+
+Usage: python benchmarks/bench_early_termination.py [jds] [shortlist] [top_k] [latency_ms] [unrelated_credit]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+import zlib
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['BEDROCK_CACHE_ENABLED'] = 'false'
+os.environ['BEDROCK_CACHE_TABLE_NAME'] = ''
+os.environ['SCORE_CACHE_ENABLED'] = 'false'
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import lambda_function  # noqa: E402
+from stand_ins import CallCounter, FakeBedrock  # noqa: E402
+from bench_end_to_end import NOISE, ROLE_PROFILES  # noqa: E402
+
+UNLIMITED = 10 ** 9
+
+
+def make_resumes(count: int, rng: random.Random):
+    """Resumes with a varying share of one role's skills plus some from other roles"""
+    roles = sorted(ROLE_PROFILES)
+    resumes = []
+    for i in range(count):
+        role = roles[i % len(roles)]
+        other = ROLE_PROFILES[roles[(i + rng.randint(1, 4)) % len(roles)]]
+        skills = rng.sample(ROLE_PROFILES[role], rng.randint(2, 10)) + rng.sample(other, rng.randint(0, 4))
+        resumes.append({'resume_id': f"resume_{i:05d}", 'role': role, 's3_key': f"resumes/{i}.pdf",
+                        'skills': sorted(set(skills + rng.sample(NOISE, 2)))})
+    return resumes
+
+
+def make_requirements(rng: random.Random):
+    role = rng.choice(sorted(ROLE_PROFILES))
+    return {'skills': rng.sample(ROLE_PROFILES[role], rng.randint(4, 8)) + rng.sample(NOISE, rng.randint(0, 1)),
+            'role': role}
+
+
+def lenient_scorer(unrelated_credit: float):
+    """Partial and semantic credit per required skill, deterministic per (skill, resume)"""
+    def score(required, candidate):
+        credits, matched, missing = [], [], []
+        for skill in required:
+            credit = lambda_function.match_skills_with_taxonomy([skill], candidate)['score'] / 100
+            if credit:
+                matched.append(skill)
+            else:
+                missing.append(skill)
+                stable = zlib.crc32(f"{skill}|{','.join(sorted(candidate))}".encode('utf-8')) / 0xFFFFFFFF
+                credit = unrelated_credit * stable
+            credits.append(credit)
+        return {
+            'match_score': round(100 * sum(credits) / len(credits)) if credits else 0,
+            'matched_skills': matched,
+            'missing_skills': missing,
+            'explanation': f"Matched {len(matched)} of {len(required)} required skills, partly via related ones."
+        }
+    return score
+
+
+def bound_violations(requirements, shortlist, matches) -> int:
+    skills = {r['resume_id']: r['skills'] for r in shortlist}
+    return sum(1 for m in matches
+               if m['score'] > lambda_function.match_score_upper_bound(requirements['skills'], skills[m['resume_id']]))
+
+
+def top(matches, k: int):
+    ranked = sorted(matches, key=lambda m: m['score'], reverse=True)
+    return [(m['resume_id'], m['score']) for m in ranked[:k]]
+
+
+def run(counter: CallCounter, requirements, shortlist, batched: bool, top_k=None):
+    counter.reset()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        matches = lambda_function.score_resumes_concurrently(requirements, shortlist, batched=batched, top_k=top_k)
+    return matches, counter.snapshot().get('bedrock.invoke_model', 0), time.perf_counter() - start
+
+
+def main():
+    jds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    shortlist_size = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    top_k = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    latency_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 50
+    unrelated_credit = float(sys.argv[5]) if len(sys.argv) > 5 else 0.4
+    rng = random.Random(23)
+
+    counter = CallCounter()
+    bedrock = FakeBedrock(counter, lambda_function.extract_skills_from_dictionary, latency_ms=latency_ms,
+                          jitter_ms=latency_ms / 5, scorer=lenient_scorer(unrelated_credit))
+    lambda_function.bedrock_invoker = lambda_function.BedrockInvoker(
+        client=bedrock, requests_per_minute=UNLIMITED, tokens_per_minute=UNLIMITED)
+    corpus = make_resumes(5000, rng)
+    workload = []
+    for _ in range(jds):
+        requirements = make_requirements(rng)
+        workload.append((requirements, lambda_function.prefilter_resumes(
+            requirements['skills'], corpus, top_k=shortlist_size)))
+
+    print(f"jds={jds} shortlist={shortlist_size} top_k={top_k} bedrock_latency_ms={latency_ms} "
+          f"unrelated_credit={unrelated_credit} (bound assumes {lambda_function.RANKING_UNRELATED_CREDIT})")
+    mismatches = 0
+    violations = 0
+    scored = 0
+    for batched in (False, True):
+        totals = {'exhaustive_calls': 0, 'bounded_calls': 0, 'exhaustive_s': 0.0, 'bounded_s': 0.0,
+                  'resumes_scored': 0, 'resumes': 0}
+        for requirements, shortlist in workload:
+            exhaustive, calls, seconds = run(counter, requirements, shortlist, batched)
+            totals['exhaustive_calls'] += calls
+            totals['exhaustive_s'] += seconds
+            violations += bound_violations(requirements, shortlist, exhaustive)
+            scored += len(exhaustive)
+            bounded, calls, seconds = run(counter, requirements, shortlist, batched, top_k)
+            totals['bounded_calls'] += calls
+            totals['bounded_s'] += seconds
+            totals['resumes_scored'] += len(bounded)
+            totals['resumes'] += len(shortlist)
+            if top(exhaustive, top_k) != top(bounded, top_k):
+                mismatches += 1
+                print(f"  MISMATCH {requirements['skills']}: {top(exhaustive, top_k)} != {top(bounded, top_k)}")
+
+        skipped = totals['exhaustive_calls'] - totals['bounded_calls']
+        print(f"{'batched' if batched else 'single':<8} calls {totals['exhaustive_calls']} -> "
+              f"{totals['bounded_calls']} (skipped {skipped}, {skipped / max(1, totals['exhaustive_calls']):.0%}), "
+              f"resumes scored {totals['resumes_scored']}/{totals['resumes']}, "
+              f"wall {totals['exhaustive_s']:.2f}s -> {totals['bounded_s']:.2f}s")
+
+    print(f"scores above match_score_upper_bound: {violations}/{scored}")
+    print(f"top-{top_k} identical to exhaustive scan: {jds * 2 - mismatches}/{jds * 2}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Recall@K of embedding retrieval on a synthetic labelled resume corpus.
+
+Each resume is generated from a role profile, so its role is the relevance
+label. The reference ranking scores every resume exhaustively with the local
+taxonomy scorer, which is what the score-everything LLM path does, minus the
+network. Embedding search retrieves the handler's EMBEDDING_TOP_K candidates
+(or the given retrieve size); we report tie-aware recall of the reference top-K
+among them and the share of retrieved resumes carrying the JD's role label.
+
+Usage: python benchmarks/bench_embedding_recall.py [num_resumes] [k] [retrieve]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import lambda_function  # noqa: E402
+
+ROLE_PROFILES = {
+    'DevOps Engineer': ['kubernetes', 'docker', 'terraform', 'jenkins', 'github actions', 'ansible', 'prometheus',
+                        'grafana', 'aws', 'linux', 'bash', 'helm', 'argo cd'],
+    'Data Engineer': ['spark', 'kafka', 'airflow', 'python', 'sql', 'glue', 'emr', 'redshift', 'dbt', 'snowflake',
+                      'hadoop', 'kinesis', 'databricks'],
+    'Frontend Developer': ['react', 'typescript', 'javascript', 'css', 'html', 'redux', 'next.js', 'vue', 'angular',
+                           'svelte', 'graphql', 'webpack', 'jest'],
+    'Backend Developer': ['java', 'spring boot', 'postgresql', 'redis', 'rest api', 'microservices', 'kafka', 'go',
+                          'grpc', 'mongodb', 'rabbitmq', 'django', 'fastapi'],
+    'ML Engineer': ['python', 'pytorch', 'tensorflow', 'scikit-learn', 'sagemaker', 'mlops', 'nlp', 'keras',
+                    'xgboost', 'pandas', 'numpy', 'deep learning', 'spark'],
+}
+NOISE = ['excel', 'jira', 'scrum', 'git', 'communication', 'leadership', 'agile', 'confluence']
+
+
+def make_corpus(count: int, rng: random.Random):
+    roles = sorted(ROLE_PROFILES)
+    resumes = []
+    for i in range(count):
+        role = roles[i % len(roles)]
+        skills = rng.sample(ROLE_PROFILES[role], 8) + rng.sample(NOISE, 2)
+        text = (f"{role} with {rng.randint(2, 12)} years of experience. "
+                f"Worked extensively with {', '.join(skills[:4])}. "
+                f"Built production systems using {' and '.join(skills[4:7])}.")
+        resumes.append({
+            'resume_id': f"resume_{i:06d}",
+            'role': role,
+            's3_key': f"resumes/{i}.pdf",
+            'skills': skills,
+            'embedding': lambda_function.embed_text(lambda_function.resume_embedding_text(skills, text)),
+        })
+    return resumes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    retrieve = int(sys.argv[3]) if len(sys.argv) > 3 else lambda_function.EMBEDDING_TOP_K
+    rng = random.Random(11)
+    resumes = make_corpus(count, rng)
+
+    reference_recall, label_precision, search_ms = [], [], []
+    for role, pool in sorted(ROLE_PROFILES.items()):
+        for _ in range(5):
+            jd_skills = rng.sample(pool, 6)
+            jd_text = f"Hiring a {role}. Must have {', '.join(jd_skills)}."
+
+            requirements = {'skills': jd_skills}
+            scores = {r['resume_id']: lambda_function.taxonomy_match_result(requirements, r)['score'] for r in resumes}
+            # Tie-aware: anything scoring at least the k-th best exhaustive score counts as a hit
+            kth_score = sorted(scores.values(), reverse=True)[k - 1]
+
+            start = time.perf_counter()
+            retrieved = lambda_function.embedding_search(
+                lambda_function.jd_embedding_text(jd_text, jd_skills), resumes, top_k=retrieve
+            )
+            search_ms.append((time.perf_counter() - start) * 1000)
+
+            reference_recall.append(min(k, sum(scores[r['resume_id']] >= kth_score for r in retrieved)) / k)
+            label_precision.append(sum(r['role'] == role for r in retrieved) / max(1, len(retrieved)))
+
+    search_ms.sort()
+    print(f"resumes={count} k={k} retrieve={retrieve} queries={len(search_ms)}")
+    print(f"recall@{k} vs exhaustive scoring: {sum(reference_recall) / len(reference_recall):.3f}")
+    print(f"same-role precision of retrieved: {sum(label_precision) / len(label_precision):.3f}")
+    print(f"search_ms_p50={search_ms[len(search_ms) // 2]:.2f} (first query includes matrix build)")
+
+
+if __name__ == '__main__':
+    main()
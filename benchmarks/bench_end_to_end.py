@@ -0,0 +1,427 @@
+"""
+Offline end-to-end benchmark of both Lambda handlers.
+
+Runs the real lambda_handler functions of the matcher and the uploader
+against the stand-ins in stand_ins.py: Bedrock with configurable latency and
+throttling, DynamoDB, S3, and a local Telegram Bot API server. A synthetic
+resume corpus is seeded first; then three scenarios are replayed with
+concurrent requests:
+
+  uploader_api     base64 PDF uploads through the uploader API (10% duplicates)
+  telegram_upload  PDF documents sent to the bot, ingested inline
+  telegram_jd      job descriptions sent to the bot
+
+For the Telegram scenarios we also report time to first result: from the
+webhook arriving to the first message the user sees with a match score in it.
+Concurrent requests share one warm process, like several webhooks landing on
+the same container's module state. For every scenario we report end-to-end
+and per-stage latency percentiles and the calls made to each service, and
+write everything to a JSON file so two commits can be compared with
+--compare. --source runs the handlers of another checkout (e.g. a git
+worktree of the baseline commit) with this harness.
+
+Usage: python benchmarks/bench_end_to_end.py [--resumes 1000] [--jds 50] [--uploads 20]
+           [--concurrency 8] [--bedrock-latency-ms 300] [--bedrock-rate-limit RPS]
+           [--env NAME=VALUE ...] [--source CHECKOUT] [--output e2e.json] [--compare baseline.json]
+"""
+import argparse
+import base64
+import contextlib
+import importlib.util
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+MATCHER_SRC = os.path.join(ROOT, 'lambda', 'matcher', 'src')
+SCORE_PATTERN = re.compile(r"\d+%")
+
+from bench_pdf_extract import make_pdf  # noqa: E402
+from stand_ins import (CallCounter, FakeBedrock, FakeDynamoDB, FakeS3,  # noqa: E402
+                       TelegramStandIn, start_telegram_stand_in)
+
+RESUMES_TABLE = 'bench-resumes'
+SKILL_INDEX_TABLE = 'bench-resumes-skill-index'
+BEDROCK_CACHE_TABLE = 'bench-resumes-bedrock-cache'
+STATS_TABLE = 'bench-resumes-stats'
+BUCKET = 'bench-resumes-bucket'
+
+ROLE_PROFILES = {
+    'DevOps Engineer': ['kubernetes', 'docker', 'terraform', 'jenkins', 'github actions', 'ansible', 'prometheus',
+                        'grafana', 'aws', 'linux', 'bash', 'helm', 'argo cd'],
+    'Data Engineer': ['spark', 'kafka', 'airflow', 'python', 'sql', 'glue', 'emr', 'redshift', 'dbt', 'snowflake',
+                      'hadoop', 'kinesis', 'databricks'],
+    'Frontend Developer': ['react', 'typescript', 'javascript', 'css', 'html', 'redux', 'next.js', 'vue', 'angular',
+                           'svelte', 'graphql', 'webpack', 'jest'],
+    'Backend Developer': ['java', 'spring boot', 'postgresql', 'redis', 'rest api', 'microservices', 'kafka', 'go',
+                          'grpc', 'mongodb', 'rabbitmq', 'django', 'fastapi'],
+    'Cloud Engineer': ['aws', 'azure', 'gcp', 'terraform', 'cloudformation', 'lambda', 'ec2', 's3', 'iam', 'vpc',
+                       'kubernetes', 'networking', 'python'],
+}
+NOISE = ['excel', 'jira', 'scrum', 'git', 'communication', 'leadership', 'agile', 'confluence']
+
+# Functions timed as stages, when the handler module defines them
+STAGES = {
+    'matcher': ['extract_jd_requirements_with_ai', 'retrieve_candidates', 'get_catalog', 'get_resumes_for_skills',
+                'prefilter_resumes', 'embedding_search', 'score_resumes', 'explain_matches_with_ai',
+                'invoke_bedrock_uncached', 'generate_presigned_url', 'telegram_api', 'download_telegram_file',
+                'ingest_download', 'ingest_parse', 'ingest_extract_skills', 'ingest_store',
+                'find_resume_by_content_hash'],
+    'uploader': ['find_resume_by_content_hash', 'extract_text_from_pdf', 'extract_skills',
+                 'extract_skills_with_bedrock', 'update_skill_index', 'embed_text'],
+}
+
+
+class StageRecorder:
+    """Collects latency samples for the end-to-end request and for each wrapped stage"""
+
+    def __init__(self):
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, name: str, elapsed_ms: float):
+        with self.lock:
+            self.samples.setdefault(name, []).append(elapsed_ms)
+
+    def wrap(self, module, label: str, function_name: str):
+        function = getattr(module, function_name, None)
+        if function is None:
+            return
+        name = f"{label}.{function_name}"
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+
+        setattr(module, function_name, timed)
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(values) -> dict:
+    return {
+        'count': len(values),
+        'p50': round(percentile(values, 0.50), 2),
+        'p95': round(percentile(values, 0.95), 2),
+        'p99': round(percentile(values, 0.99), 2),
+        'max': round(max(values), 2),
+    }
+
+
+def configure_environment(overrides):
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.update({
+        'DYNAMODB_TABLE_NAME': RESUMES_TABLE,
+        'SKILL_INDEX_TABLE_NAME': SKILL_INDEX_TABLE,
+        'BEDROCK_CACHE_TABLE_NAME': BEDROCK_CACHE_TABLE,
+        'STATS_TABLE_NAME': STATS_TABLE,
+        'S3_BUCKET_NAME': BUCKET,
+        'TELEGRAM_BOT_TOKEN': 'bench-token',
+        'INGEST_QUEUE_URL': '',
+        'SKILL_DATA_DIR': MATCHER_SRC,
+    })
+    for override in overrides:
+        name, _, value = override.partition('=')
+        os.environ[name] = value
+
+
+def load_handler(name: str, source: str = ROOT):
+    """Import a handler module under its own name, so both lambda_function.py files can be loaded"""
+    path = os.path.join(source, 'lambda', name, 'src', 'lambda_function.py')
+    spec = importlib.util.spec_from_file_location(f"{name}_lambda_function", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def resume_text(role: str, skills, rng: random.Random) -> str:
+    return (f"{role} with {rng.randint(2, 12)} years of experience. Worked extensively with "
+            f"{', '.join(skills[:5])}. Built production systems using {' and '.join(skills[5:])}.")
+
+
+def make_corpus(count: int, rng: random.Random):
+    roles = sorted(ROLE_PROFILES)
+    resumes = []
+    for i in range(count):
+        role = roles[i % len(roles)]
+        skills = rng.sample(ROLE_PROFILES[role], 8) + rng.sample(NOISE, 2)
+        resumes.append({
+            'resume_id': f"{role.lower().replace(' ', '_')}_{i:06d}",
+            'role': role,
+            'skills': skills,
+            's3_key': f"resumes/{role.lower().replace(' ', '-')}/{i:06d}.pdf",
+            'created_at': datetime(2024, 1, 1).isoformat(),
+            'created_day': '2024-01-01',
+            'filename': f"resume_{i:06d}.pdf",
+            'content_hash': f"{i:064x}",
+            'text': resume_text(role, skills, rng),
+        })
+    return resumes
+
+
+def make_job_description(rng: random.Random) -> str:
+    role = rng.choice(sorted(ROLE_PROFILES))
+    skills = rng.sample(ROLE_PROFILES[role], 6)
+    return (f"We are hiring a {role} to join our platform team. Requirements: {', '.join(skills[:4])}. "
+            f"Nice to have: {' and '.join(skills[4:])}. Remote friendly, competitive salary.")
+
+
+def seed(matcher, dynamodb: FakeDynamoDB, s3: FakeS3, corpus):
+    """Load the corpus straight into the stand-ins, then build the skill index through the handler"""
+    table = dynamodb.Table(RESUMES_TABLE)
+    embed = matcher.RETRIEVAL_MODE == 'embedding'
+    for resume in corpus:
+        item = {k: v for k, v in resume.items() if k != 'text'}
+        if embed:
+            item['embedding'] = matcher.embed_text(matcher.resume_embedding_text(resume['skills'], resume['text']))
+        if hasattr(matcher, 'encode_skill_bits'):
+            item['skill_bits'] = matcher.encode_skill_bits(resume['skills'])
+        table.store(item)
+        s3.objects[(BUCKET, resume['s3_key'])] = b'%PDF-1.4'
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        matcher.rebuild_skill_index()
+        if hasattr(matcher, 'rebuild_catalog_stats'):
+            matcher.rebuild_catalog_stats()
+
+
+def replay(name: str, handler, events, concurrency: int, recorder: StageRecorder, counter: CallCounter):
+    """Send events to handler from `concurrency` threads; returns the scenario summary"""
+    recorder.reset()
+    counter.reset()
+    status_codes = {}
+    received = {}
+    lock = threading.Lock()
+    TelegramStandIn.messages = []
+
+    def invoke(event):
+        start = time.perf_counter()
+        chat_id = event_chat_id(event)
+        if chat_id is not None:
+            received[chat_id] = start
+        response = handler(event, None)
+        recorder.record('end_to_end', (time.perf_counter() - start) * 1000)
+        with lock:
+            code = str(response.get('statusCode', 'none')) if isinstance(response, dict) else 'none'
+            status_codes[code] = status_codes.get(code, 0) + 1
+
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(invoke, events))
+    wall_seconds = time.perf_counter() - start
+
+    samples = dict(recorder.samples)
+    end_to_end = samples.pop('end_to_end')
+    calls = counter.snapshot()
+    summary = {
+        'requests': len(events),
+        'status_codes': status_codes,
+        'wall_seconds': round(wall_seconds, 3),
+        'requests_per_second': round(len(events) / wall_seconds, 2),
+        'end_to_end_ms': summarize(end_to_end),
+        'stages_ms': {stage: summarize(values) for stage, values in sorted(samples.items())},
+        'calls': calls,
+        'calls_per_request': {k: round(v / len(events), 2) for k, v in calls.items()},
+    }
+    first_results = time_to_first_result(received, TelegramStandIn.messages)
+    if first_results:
+        summary['time_to_first_result_ms'] = summarize(first_results)
+    return summary
+
+
+def event_chat_id(event):
+    """Telegram chat of a webhook event, or None for API events"""
+    try:
+        return json.loads(event['body'])['message']['chat']['id']
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def time_to_first_result(received: dict, messages) -> list:
+    """Per chat, ms from the webhook arriving to the first sent or edited text showing a score"""
+    first = {}
+    for at, chat_id, text in sorted(messages, key=lambda message: message[0]):
+        if chat_id in received and chat_id not in first and SCORE_PATTERN.search(text):
+            first[chat_id] = (at - received[chat_id]) * 1000
+    return list(first.values())
+
+
+def git_revision(source: str = ROOT):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=source, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=source,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def print_report(results: dict):
+    for name, scenario in results['scenarios'].items():
+        e2e = scenario['end_to_end_ms']
+        print(f"\n{name}: {scenario['requests']} requests, {scenario['requests_per_second']}/s, "
+              f"status {scenario['status_codes']}")
+        print(f"  end_to_end_ms p50={e2e['p50']} p95={e2e['p95']} p99={e2e['p99']}")
+        if 'time_to_first_result_ms' in scenario:
+            first = scenario['time_to_first_result_ms']
+            print(f"  time_to_first_result_ms p50={first['p50']} p95={first['p95']} p99={first['p99']}")
+        for stage, stats in scenario['stages_ms'].items():
+            print(f"  {stage:<45} n={stats['count']:<6} p50={stats['p50']:<9} p95={stats['p95']:<9} "
+                  f"p99={stats['p99']}")
+        print(f"  calls/request {scenario['calls_per_request']}")
+
+
+def print_comparison(results: dict, baseline: dict):
+    """Per-scenario deltas of end-to-end percentiles, stage p95 and calls per request"""
+    def delta(old, new):
+        change = f"{(new - old) / old * 100:+.1f}%" if old else 'new'
+        return f"{old} -> {new} ({change})"
+
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    for name, scenario in results['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            print(f"  {name}: not in baseline")
+            continue
+        print(f"  {name}")
+        for key in ('p50', 'p95', 'p99'):
+            print(f"    end_to_end {key:<30} {delta(before['end_to_end_ms'][key], scenario['end_to_end_ms'][key])}")
+        if 'time_to_first_result_ms' in scenario and 'time_to_first_result_ms' in before:
+            for key in ('p50', 'p95', 'p99'):
+                print(f"    time_to_first_result {key:<20} "
+                      f"{delta(before['time_to_first_result_ms'][key], scenario['time_to_first_result_ms'][key])}")
+        for stage, stats in scenario['stages_ms'].items():
+            old = before['stages_ms'].get(stage)
+            if old:
+                print(f"    {stage + ' p95':<41} {delta(old['p95'], stats['p95'])}")
+        for call in sorted(set(scenario['calls_per_request']) | set(before['calls_per_request'])):
+            old, new = before['calls_per_request'].get(call, 0), scenario['calls_per_request'].get(call, 0)
+            if old != new:
+                print(f"    {call + '/request':<41} {delta(old, new)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=1000, help='seeded corpus size (100 to 100k)')
+    parser.add_argument('--jds', type=int, default=50, help='job descriptions replayed through Telegram')
+    parser.add_argument('--uploads', type=int, default=20, help='resume uploads per upload scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--bedrock-latency-ms', type=float, default=300)
+    parser.add_argument('--bedrock-jitter-ms', type=float, default=50)
+    parser.add_argument('--bedrock-ms-per-token', type=float, default=5.0)
+    parser.add_argument('--bedrock-rate-limit', type=float, default=None, help='requests/second before throttling')
+    parser.add_argument('--dynamodb-latency-ms', type=float, default=5)
+    parser.add_argument('--s3-latency-ms', type=float, default=15)
+    parser.add_argument('--telegram-latency-ms', type=float, default=20)
+    parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                        help='handler environment override, e.g. RETRIEVAL_MODE=embedding')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--source', default=ROOT, metavar='CHECKOUT', help='repository whose handlers are run')
+    parser.add_argument('--output', default='e2e_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help='results JSON from another commit')
+    args = parser.parse_args()
+
+    configure_environment(args.env)
+    matcher = load_handler('matcher', args.source)
+    uploader = load_handler('uploader', args.source)
+
+    counter = CallCounter()
+    bedrock = FakeBedrock(counter, matcher.extract_skills_from_dictionary, latency_ms=args.bedrock_latency_ms,
+                          jitter_ms=args.bedrock_jitter_ms, ms_per_output_token=args.bedrock_ms_per_token,
+                          rate_limit=args.bedrock_rate_limit, seed=args.seed)
+    dynamodb = FakeDynamoDB(counter, {
+        RESUMES_TABLE: ('resume_id', {'content-hash-index': 'content_hash', 'role-index': 'role',
+                                      'created-day-index': 'created_day'}),
+        SKILL_INDEX_TABLE: ('skill', {}),
+        BEDROCK_CACHE_TABLE: ('cache_key', {}),
+        STATS_TABLE: ('stats_id', {}),
+    }, latency_ms=0)
+    s3 = FakeS3(counter, latency_ms=args.s3_latency_ms)
+    server, telegram_url = start_telegram_stand_in(counter, latency_ms=args.telegram_latency_ms)
+    for module in (matcher, uploader):
+        module.dynamodb = dynamodb
+        module.s3_client = s3
+        module.bedrock_runtime = bedrock
+    matcher.TELEGRAM_API_URL = telegram_url
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    corpus = make_corpus(args.resumes, rng)
+    seed(matcher, dynamodb, s3, corpus)
+    dynamodb.latency_ms = args.dynamodb_latency_ms
+    print(f"Seeded {len(corpus)} resumes in {time.perf_counter() - start:.1f}s")
+
+    recorder = StageRecorder()
+    for label, module in (('matcher', matcher), ('uploader', uploader)):
+        for function_name in STAGES[label]:
+            recorder.wrap(module, label, function_name)
+
+    # Fresh PDFs for the upload scenarios; the last tenth of the API uploads repeat the first ones
+    def upload_pdf(i):
+        resume = rng.choice(corpus)
+        return make_pdf(2, line=f"Candidate {i}: {resume['text'][:90]}")
+
+    repeats = args.uploads // 10
+    api_pdfs = [upload_pdf(i) for i in range(args.uploads - repeats)]
+    api_pdfs += api_pdfs[:repeats]
+    api_events = [{'body': json.dumps({'resume_data': base64.b64encode(pdf).decode(), 'resume_name': f"{i}.pdf",
+                                       'role': rng.choice(sorted(ROLE_PROFILES))})}
+                  for i, pdf in enumerate(api_pdfs)]
+
+    document_events = []
+    for i in range(args.uploads):
+        file_id = f"bench-file-{i}"
+        TelegramStandIn.files[file_id] = upload_pdf(args.uploads + i)
+        document_events.append({'body': json.dumps({'message': {
+            'chat': {'id': 1000 + i},
+            'document': {'file_id': file_id, 'file_name': f"{file_id}.pdf", 'mime_type': 'application/pdf'}
+        }})})
+
+    jd_events = [{'body': json.dumps({'message': {'chat': {'id': 2000 + i}, 'text': make_job_description(rng)}})}
+                 for i in range(args.jds)]
+
+    scenarios = {}
+    for name, handler, events in (('uploader_api', uploader.lambda_handler, api_events),
+                                  ('telegram_upload', matcher.lambda_handler, document_events),
+                                  ('telegram_jd', matcher.lambda_handler, jd_events)):
+        if events:
+            scenarios[name] = replay(name, handler, events, args.concurrency, recorder, counter)
+    server.shutdown()
+
+    commit, dirty = git_revision(args.source)
+    results = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.utcnow().isoformat(),
+        'config': vars(args),
+        'scenarios': scenarios,
+    }
+    print_report(results)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare budgeted lazy PDF extraction against whole-document extraction.
+
+Generates multi-page text PDFs in memory and reports wall time and peak
+traced memory for both the previous extract-every-page loop and the
+current budget-aware extractor.
+
+Usage: python benchmarks/bench_pdf_extract.py [pages ...]
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import PyPDF2  # noqa: E402
+import lambda_function  # noqa: E402
+
+LINE = "Senior DevOps Engineer with Kubernetes, Terraform, Docker, AWS and Jenkins experience"
+LINES_PER_PAGE = 45
+
+
+def make_pdf(pages: int, line: str = LINE) -> bytes:
+    """Build a minimal PDF with one Helvetica text stream per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        body = "\n".join(f"({line} - page {page} line {i}) Tj T*" for i in range(LINES_PER_PAGE))
+        stream = f"BT /F1 10 Tf 12 TL 40 780 Td\n{body}\nET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref)
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def extract_all_pages(pdf_bytes: bytes) -> str:
+    """The previous implementation: parse every page and grow one string."""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text() + "\n"
+    return text.strip()
+
+
+def measure(fn, pdf_bytes: bytes):
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = fn(pdf_bytes)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / (1024 * 1024), len(text)
+
+
+def main():
+    page_counts = [int(arg) for arg in sys.argv[1:]] or [2, 20, 100, 300]
+    print(f"char_budget={lambda_function.PDF_TEXT_CHAR_BUDGET} max_pages={lambda_function.PDF_MAX_PAGES}")
+    for pages in page_counts:
+        pdf_bytes = make_pdf(pages)
+        for name, fn in (('full', extract_all_pages), ('budgeted', lambda_function.extract_text_from_pdf)):
+            elapsed_ms, peak_mb, chars = measure(fn, pdf_bytes)
+            print(f"pages={pages:<4} pdf_kb={len(pdf_bytes) // 1024:<6} {name:<9} "
+                  f"ms={elapsed_ms:9.1f} peak_mb={peak_mb:7.2f} chars={chars}")
+
+
+if __name__ == '__main__':
+    main()
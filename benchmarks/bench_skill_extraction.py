@@ -0,0 +1,136 @@
+"""
+Dictionary skill extraction at scale: the old per-keyword substring scan, one
+compiled alternation regex, and the token phrase table used by the Lambdas.
+
+The shipped taxonomy and skill dictionary are padded with synthetic skills up
+to the target size. Resumes are generated with known planted skills mixed with
+filler and trap words ("Google", "ready to go", "JavaScript"), so we can report
+precision and recall as well as speed.
+
+Usage: python benchmarks/bench_skill_extraction.py [dictionary_size] [resumes]
+"""
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import lambda_function  # noqa: E402
+
+FILLER = ("led team delivered platform improved reliability reduced latency designed built migrated owned "
+          "mentored engineers across product launch customers scale production services weekly roadmap "
+          "stakeholders quality velocity budget analysis reporting collaboration").split()
+TRAPS = ["Google", "ready to go", "the rest of the team", "going forward", "restaurant", "scalable",
+         "categories", "javascript-free", "Goldman", "carousel", "argon", "Rustic"]
+SYLLABLES = ["zor", "blax", "quen", "tri", "vel", "mar", "dox", "pli", "ner", "kast", "lum", "ori", "fex", "hul"]
+
+
+def synthetic_skills(count: int, rng: random.Random):
+    skills = set()
+    while len(skills) < count:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        shape = rng.random()
+        if shape < 0.2:
+            word = f"{word} {''.join(rng.choice(SYLLABLES) for _ in range(2))}"
+        elif shape < 0.3:
+            word = f"{word}.js"
+        skills.add(word)
+    return sorted(skills)
+
+
+def build_dictionary(size: int, rng: random.Random) -> str:
+    """Shipped dictionary padded with synthetic skills; returns the temp file path"""
+    with open(lambda_function.SKILL_DICTIONARY_PATH, encoding='utf-8') as f:
+        raw = json.load(f)
+    base = len(lambda_function.load_skill_phrases()['phrases'])
+    raw['skills'] = raw['skills'] + synthetic_skills(max(0, size - base), rng)
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(raw, f)
+    return f.name
+
+
+def make_resume(forms, rng: random.Random):
+    planted = rng.sample(forms, 15)
+    words = []
+    for form in planted + rng.sample(TRAPS, 4):
+        words += rng.sample(FILLER, 12) + [form + rng.choice([',', '.', '', ' and'])]
+    return ' '.join(words + rng.sample(FILLER, 20)), planted
+
+
+def substring_extract(forms, text):
+    """The previous fallback: `skill in text` for every dictionary entry"""
+    lowered = text.lower()
+    return {form for form in forms if form in lowered}
+
+
+def compile_alternation(forms):
+    alternatives = '|'.join(re.escape(form) for form in sorted(forms, key=len, reverse=True))
+    return re.compile(rf"(?<![A-Za-z0-9])(?:{alternatives})(?![A-Za-z0-9])", re.IGNORECASE)
+
+
+def time_per_resume(fn, corpus):
+    runs = []
+    results = []
+    for text, _ in corpus:
+        start = time.perf_counter()
+        results.append(fn(text))
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs), results
+
+
+def accuracy(results, corpus, to_skill):
+    tp = fp = fn = 0
+    for found, (_, planted) in zip(results, corpus):
+        found = {to_skill(f) for f in found}
+        truth = {to_skill(p) for p in planted}
+        tp += len(found & truth)
+        fp += len(found - truth)
+        fn += len(truth - found)
+    return tp / max(1, tp + fp), tp / max(1, tp + fn)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = random.Random(17)
+
+    lambda_function.SKILL_DICTIONARY_PATH = build_dictionary(size, rng)
+    lambda_function._skill_phrases = None
+    start = time.perf_counter()
+    table = lambda_function.load_skill_phrases()
+    table_build_ms = (time.perf_counter() - start) * 1000
+    os.unlink(lambda_function.SKILL_DICTIONARY_PATH)
+
+    # Surface form -> canonical skill, for every form the phrase table matches
+    canonical = {' '.join(key).replace(' . ', '.'): skill for key, skill in table['phrases'].items()}
+    forms = sorted(form for form in canonical if re.fullmatch(r"[a-z0-9 ]+", form) or form.endswith('.js'))
+    form_skill = {form: canonical[form] for form in forms}
+    to_skill = lambda text: form_skill.get(text.lower(), canonical.get(text.lower(), text.lower()))
+    corpus = [make_resume(forms, rng) for _ in range(count)]
+
+    start = time.perf_counter()
+    pattern = compile_alternation(forms)
+    regex_build_ms = (time.perf_counter() - start) * 1000
+
+    rows = [
+        ('substring', 0.0, lambda text: substring_extract(forms, text)),
+        ('alternation regex', regex_build_ms, lambda text: set(pattern.findall(text))),
+        ('token phrase table', table_build_ms, lambda_function.extract_skills_from_dictionary),
+    ]
+    print(f"dictionary_entries={len(table['phrases'])} resumes={count} "
+          f"avg_resume_chars={sum(len(t) for t, _ in corpus) // count}")
+    for name, build_ms, fn in rows:
+        p50_ms, results = time_per_resume(fn, corpus)
+        precision, recall = accuracy(results, corpus, to_skill)
+        print(f"{name:<19} build_ms={build_ms:8.1f} per_resume_ms_p50={p50_ms:8.3f} "
+              f"precision={precision:.3f} recall={recall:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Skill bitsets versus Python sets for matching a JD against a large catalog.
+
+Resumes get skills drawn from the shipped skill vocabulary, with a few
+skills outside it. The set-based approach keeps one lower-cased set per
+resume and intersects it with the JD's skills; the bitset approach stacks
+the stored skill_bits into one uint64 array and popcounts. Both compute
+containment (shared / required) and Jaccard (shared / union) for every
+resume, and the results are checked to be identical.
+
+Reports memory per catalog (tracemalloc for the sets, array bytes for the
+bitsets), build time, per-JD scoring time, and the stored size per item.
+
+Usage: python benchmarks/bench_skill_vectors.py [num_resumes] [skills_per_resume] [jds]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import numpy as np  # noqa: E402
+
+import lambda_function  # noqa: E402
+
+
+def make_resumes(count: int, per_resume: int, vocabulary, rng: random.Random):
+    outside = [f"in-house tool {i}" for i in range(200)]
+    resumes = []
+    for i in range(count):
+        skills = rng.sample(vocabulary, per_resume)
+        if rng.random() < 0.05:
+            skills.append(rng.choice(outside))
+        resumes.append({'resume_id': f"resume_{i:06d}",
+                        'skills': [s.title() if rng.random() < 0.3 else s for s in skills]})
+    return resumes
+
+
+def set_scores(sets, required):
+    required = {s.lower().strip() for s in required}
+    shared = np.fromiter((len(required & s) for s in sets), dtype=np.int64, count=len(sets))
+    union = np.fromiter((len(required | s) for s in sets), dtype=np.int64, count=len(sets))
+    return shared / len(required), shared / np.maximum(union, 1)
+
+
+def bitset_scores(matrix, required):
+    vocabulary = lambda_function.load_skill_vocabulary()
+    query = 0
+    for skill in {s.lower().strip() for s in required}:
+        query |= 1 << vocabulary['positions'][skill]
+    query = np.frombuffer(query.to_bytes(vocabulary['width'], 'little'), dtype='<u8')
+    shared = lambda_function.popcount_rows(matrix['bits'] & query)
+    union = lambda_function.popcount_rows(matrix['bits'] | query)
+    # Skills outside the vocabulary never match a JD skill from it, but still widen the union
+    for rows in matrix['outside'].values():
+        union[rows] += 1
+    return shared / len(required), shared / np.maximum(union, 1)
+
+
+def timed(fn, repeat: int):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs), result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    per_resume = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    jds = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    rng = random.Random(11)
+
+    vocabulary = list(lambda_function.load_skill_vocabulary()['positions'])
+    resumes = make_resumes(count, per_resume, vocabulary, rng)
+    queries = [rng.sample(vocabulary, 12) for _ in range(jds)]
+
+    start = time.perf_counter()
+    for resume in resumes:
+        resume['skill_bits'] = lambda_function.encode_skill_bits(resume['skills'])
+    encode_us = (time.perf_counter() - start) / count * 1e6
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    sets = [{s.lower().strip() for s in resume['skills']} for resume in resumes]
+    set_build_ms = (time.perf_counter() - start) * 1000
+    set_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    build_ms, matrix = timed(lambda: lambda_function.build_skill_matrix(resumes), 3)
+    bit_bytes = matrix['bits'].nbytes + sum(rows.nbytes for rows in matrix['outside'].values())
+
+    set_ms, bit_ms, mismatches = [], [], 0
+    for required in queries:
+        ms, expected = timed(lambda: set_scores(sets, required), 1)
+        set_ms.append(ms)
+        ms, actual = timed(lambda: bitset_scores(matrix, required), 3)
+        bit_ms.append(ms)
+        mismatches += not (np.allclose(expected[0], actual[0]) and np.allclose(expected[1], actual[1]))
+
+    stored_list = statistics.mean(sum(len(s) + 3 for s in r['skills']) for r in resumes)
+    stored_bits = statistics.mean(len(r['skill_bits']) for r in resumes)
+    print(f"resumes={count} skills_per_resume={per_resume} vocabulary={len(vocabulary)} jds={jds}")
+    print(f"sets    memory={set_bytes / 2 ** 20:7.1f}MB build_ms={set_build_ms:8.1f} "
+          f"score_ms_p50={statistics.median(set_ms):8.2f}")
+    print(f"bitsets memory={bit_bytes / 2 ** 20:7.1f}MB build_ms={build_ms:8.1f} "
+          f"score_ms_p50={statistics.median(bit_ms):8.2f}")
+    print(f"stored per item: skills list ~{stored_list:.0f}B, skill_bits {stored_bits:.0f}B; "
+          f"encode_us_per_resume={encode_us:.1f}")
+    print(f"containment and Jaccard identical: {jds - mismatches}/{jds}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Telegram API connections and calls per job description, measured against a
+local HTTP stand-in for api.telegram.org.
+
+"per-call" reproduces the previous client (a new PoolManager and a new
+sendMessage for every progress line); "pooled" is the current keep-alive
+client with one status message edited in place.
+
+Usage: python benchmarks/bench_telegram_client.py [requests]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ['TELEGRAM_BOT_TOKEN'] = 'bench-token'
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import urllib3  # noqa: E402
+import lambda_function  # noqa: E402
+from stand_ins import CallCounter, start_telegram_stand_in  # noqa: E402
+
+# Simulated TLS handshake cost, paid once per new connection
+HANDSHAKE_MS = 30
+
+
+def stub_matching():
+    """Replace Bedrock and DynamoDB work with canned results; only Telegram I/O remains"""
+    requirements = {'skills': ['python', 'aws', 'docker']}
+    best = {'resume_id': 'resume_1', 'role': 'DevOps Engineer', 's3_key': 'resumes/x.pdf', 'score': 90,
+            'matched_skills': ['python', 'aws'], 'explanation': 'Strong overlap.'}
+    
+    # Same callbacks as the real functions, so the leaderboard and streamed explanation edits still happen
+    def score_resumes(req, candidates, on_match=None, **kwargs):
+        matches = [dict(best)]
+        for match in matches:
+            if on_match:
+                on_match(match)
+        return matches
+    
+    def explain_matches_with_ai(req, matches, on_explanation=None, **kwargs):
+        for match in matches:
+            if on_explanation:
+                on_explanation(match)
+        return matches
+    
+    lambda_function.extract_jd_requirements_with_ai = lambda jd: requirements
+    lambda_function.retrieve_candidates = lambda jd, req: ([best], 1)
+    lambda_function.score_resumes = score_resumes
+    lambda_function.explain_matches_with_ai = explain_matches_with_ai
+    lambda_function.generate_presigned_url = lambda key: 'https://example.com/resume.pdf'
+
+
+def per_call_client():
+    """The previous behaviour: a fresh pool per request and a new message per update"""
+    lambda_function.telegram_http = lambda: urllib3.PoolManager()
+    lambda_function.TelegramStatus.update = (
+        lambda self, text, parse_mode=None: lambda_function.send_telegram_message(self.chat_id, text, parse_mode)
+    )
+
+
+def run(label: str, requests: int, counter: CallCounter):
+    counter.reset()
+    start = time.perf_counter()
+    for _ in range(requests):
+        lambda_function.process_job_description_with_ai(42, "Hiring a DevOps engineer with Python, AWS and Docker")
+    elapsed_ms = (time.perf_counter() - start) * 1000 / requests
+    counts = counter.snapshot()
+    connections = counts.pop('telegram.connections', 0)
+    calls = {name.split('.', 1)[1]: count for name, count in counts.items()}
+    print(f"{label:<9} connections/request={connections / requests:.2f} "
+          f"api_calls/request={sum(calls.values()) / requests:.2f} {calls} "
+          f"telegram_ms/request={elapsed_ms:.1f}")
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    counter = CallCounter()
+    server, lambda_function.TELEGRAM_API_URL = start_telegram_stand_in(counter, handshake_ms=HANDSHAKE_MS)
+    stub_matching()
+    
+    run('pooled', requests, counter)
+    per_call_client()
+    run('per-call', requests, counter)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
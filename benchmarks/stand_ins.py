@@ -0,0 +1,554 @@
+"""
+In-process stand-ins for the services the Lambdas call, for offline benchmarks.
+
+FakeBedrock, FakeDynamoDB and FakeS3 implement the subset of the boto3
+client/resource API the handlers use, with configurable latency and call
+counters. TelegramStandIn is a real local HTTP server, so the pooled
+Telegram client is exercised end to end.
+"""
+import io
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+
+class CallCounter:
+    """Thread-safe call counts shared by all stand-ins"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def add(self, name: str, amount: int = 1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(sorted(self.counts.items()))
+
+    def reset(self):
+        with self.lock:
+            self.counts.clear()
+
+
+def client_error(code: str, message: str, operation: str):
+    """A botocore ClientError when botocore is installed, else a plain exception with the same text"""
+    try:
+        from botocore.exceptions import ClientError
+        return ClientError({'Error': {'Code': code, 'Message': message}}, operation)
+    except ImportError:
+        return RuntimeError(f"An error occurred ({code}) when calling the {operation} operation: {message}")
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class FakeBedrock:
+    """
+    bedrock-runtime stand-in. Answers each prompt the handlers send with
+    well-formed JSON derived from the prompt itself, after latency_ms (+ jitter
+    and a per-output-token cost). With rate_limit set, calls beyond that many
+    per second raise ThrottlingException; throttle_probability throttles calls
+    at random, and while `outage` is set every call raises ServiceUnavailableException.
+    Match prompts are scored by scorer(required, candidate), exact overlap by default.
+    """
+
+    def __init__(self, counter: CallCounter, skill_extractor: Callable[[str], List[str]],
+                 latency_ms: float = 300, jitter_ms: float = 50, ms_per_output_token: float = 0.0,
+                 rate_limit: Optional[float] = None, throttle_probability: float = 0.0, seed: int = 0,
+                 scorer: Optional[Callable[[List[str], List[str]], Dict]] = None):
+        self.counter = counter
+        self.skill_extractor = skill_extractor
+        self.scorer = scorer or overlap_match
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.ms_per_output_token = ms_per_output_token
+        self.bucket = TokenBucket(rate_limit, max(1.0, rate_limit)) if rate_limit else None
+        self.throttle_probability = throttle_probability
+        self.outage = False
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+    def invoke_model(self, modelId: str, body: str, **kwargs):
+        self.counter.add('bedrock.invoke_model')
+        self.admit('InvokeModel')
+
+        prompt = json.loads(body)['messages'][0]['content']
+        text = self.respond(prompt)
+        output_tokens = max(1, len(text) // 4)
+        time.sleep(max(0.0, self.first_token_ms() + output_tokens * self.ms_per_output_token) / 1000)
+
+        payload = {'content': [{'type': 'text', 'text': text}],
+                   'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': output_tokens}}
+        return {'body': io.BytesIO(json.dumps(payload).encode('utf-8'))}
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str, **kwargs):
+        """Same answers as invoke_model, as Anthropic stream events of ~4 tokens each.
+        The first text arrives after latency_ms; each event then costs its tokens' ms_per_output_token."""
+        self.counter.add('bedrock.invoke_model_with_response_stream')
+        self.admit('InvokeModelWithResponseStream')
+
+        prompt = json.loads(body)['messages'][0]['content']
+        text = self.respond(prompt)
+        first_token_ms = self.first_token_ms()
+
+        def events():
+            time.sleep(max(0.0, first_token_ms) / 1000)
+            yield stream_event({'type': 'message_start', 'message': {'usage': {'input_tokens': len(prompt) // 4}}})
+            for start in range(0, len(text), 16):
+                time.sleep(4 * self.ms_per_output_token / 1000)
+                yield stream_event({'type': 'content_block_delta', 'index': 0,
+                                    'delta': {'type': 'text_delta', 'text': text[start:start + 16]}})
+            yield stream_event({'type': 'message_delta', 'usage': {'output_tokens': max(1, len(text) // 4)}})
+            yield stream_event({'type': 'message_stop'})
+
+        return {'body': events()}
+
+    def admit(self, operation: str):
+        """Raise the error a real endpoint would for an outage or throttled call"""
+        if self.outage:
+            self.counter.add('bedrock.unavailable')
+            raise client_error('ServiceUnavailableException', 'Service unavailable.', operation)
+        with self.rng_lock:
+            unlucky = self.rng.random() < self.throttle_probability
+        if unlucky or (self.bucket and not self.bucket.take()):
+            self.counter.add('bedrock.throttled')
+            raise client_error('ThrottlingException', 'Too many requests, please wait before trying again.',
+                               operation)
+
+    def first_token_ms(self) -> float:
+        with self.rng_lock:
+            return self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+
+    def respond(self, prompt: str) -> str:
+        if 'Analyze this job description' in prompt:
+            jd = section(prompt, 'Job Description:\n')
+            role = re.search(r"hiring an? ([A-Z][\w ]*?(?:Engineer|Developer))", jd)
+            return json.dumps({'skills': self.skill_extractor(jd), 'role': role.group(1) if role else 'Not specified',
+                               'experience_level': 'mid', 'key_requirements': []})
+        if 'Analyze this resume' in prompt:
+            return json.dumps(self.skill_extractor(section(prompt, 'Resume:\n')))
+        if 'Compare these skills' in prompt:
+            required = split_skills(section(prompt, 'Required Skills (from Job Description):\n'))
+            candidate = split_skills(section(prompt, 'Candidate Skills (from Resume):\n'))
+            return json.dumps(self.scorer(required, candidate))
+        if 'EACH candidate' in prompt:
+            required = split_skills(section(prompt, 'Required Skills (from Job Description):\n'))
+            results = []
+            for resume_id, skills in re.findall(r"^- (\S+): (.*)$", prompt, re.MULTILINE):
+                results.append(dict(self.scorer(required, split_skills(skills)), resume_id=resume_id))
+            return json.dumps(results)
+        if 'A recruiter is matching' in prompt:
+            ids = re.findall(r"^- (\S+) \(score", prompt, re.MULTILINE)
+            return json.dumps({resume_id: 'Strong overlap on the core skills; a few gaps remain.' for resume_id in ids})
+        return '[]'
+
+
+def stream_event(chunk: Dict) -> Dict:
+    return {'chunk': {'bytes': json.dumps(chunk).encode('utf-8')}}
+
+
+def section(prompt: str, header: str) -> str:
+    """Text following header, up to the next blank line"""
+    start = prompt.find(header)
+    if start < 0:
+        return ''
+    start += len(header)
+    end = prompt.find('\n\n', start)
+    return prompt[start:end if end >= 0 else len(prompt)]
+
+
+def split_skills(text: str) -> List[str]:
+    return [s.strip().lower() for s in text.split(',') if s.strip()]
+
+
+def overlap_match(required: List[str], candidate: List[str]) -> Dict:
+    candidate_set = set(candidate)
+    matched = [s for s in required if s in candidate_set]
+    return {
+        'match_score': round(100 * len(matched) / len(required)) if required else 0,
+        'matched_skills': matched,
+        'missing_skills': [s for s in required if s not in candidate_set],
+        'explanation': f"Matched {len(matched)} of {len(required)} required skills."
+    }
+
+
+def condition_matches(condition, item: Dict) -> bool:
+    """Evaluate a boto3 Key/Attr condition against an item"""
+    expression = condition.get_expression()
+    operator, values = expression['operator'], expression['values']
+    if operator == 'AND':
+        return all(condition_matches(v, item) for v in values)
+    if operator == 'OR':
+        return any(condition_matches(v, item) for v in values)
+    if operator == 'NOT':
+        return not condition_matches(values[0], item)
+
+    name = values[0].name
+    if operator == 'attribute_exists':
+        return name in item
+    if operator == 'attribute_not_exists':
+        return name not in item
+    if name not in item:
+        return False
+    value = item[name]
+    if operator == '=':
+        return value == values[1]
+    if operator == '<>':
+        return value != values[1]
+    if operator == '<':
+        return value < values[1]
+    if operator == '<=':
+        return value <= values[1]
+    if operator == '>':
+        return value > values[1]
+    if operator == '>=':
+        return value >= values[1]
+    if operator == 'BETWEEN':
+        return values[1] <= value <= values[2]
+    if operator == 'begins_with':
+        return str(value).startswith(values[1])
+    if operator == 'IN':
+        return value in values[1:]
+    if operator == 'contains':
+        return values[1] in value
+    raise NotImplementedError(f"Condition operator {operator} is not supported by the stand-in")
+
+
+def project(item: Dict, kwargs: Dict) -> Dict:
+    expression = kwargs.get('ProjectionExpression')
+    if not expression:
+        return dict(item)
+    names = kwargs.get('ExpressionAttributeNames', {})
+    attributes = [names.get(part.strip(), part.strip()) for part in expression.split(',')]
+    return {a: item[a] for a in attributes if a in item}
+
+
+class FakeBatchWriter:
+    def __init__(self, table: 'FakeTable'):
+        self.table = table
+        self.pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def flush(self):
+        # BatchWriteItem takes up to 25 requests per call
+        for _ in range(0, self.pending, 25):
+            self.table.service.call('dynamodb.batch_write_item')
+        self.pending = 0
+
+    def put_item(self, Item: Dict):
+        self.table.store(Item)
+        self.pending += 1
+        if self.pending == 25:
+            self.flush()
+
+    def delete_item(self, Key: Dict):
+        self.table.remove(Key[self.table.hash_key])
+        self.pending += 1
+        if self.pending == 25:
+            self.flush()
+
+
+class FakeTable:
+    def __init__(self, service: 'FakeDynamoDB', name: str, hash_key: str, indexes: Dict[str, str]):
+        self.service = service
+        self.name = name
+        self.hash_key = hash_key
+        self.indexes = indexes  # index name -> hash key attribute
+        self.items = {}
+        self.index_entries = {index: {} for index in indexes}
+        self.lock = threading.RLock()
+
+    # Storage helpers (no latency, no counting)
+    def store(self, item: Dict):
+        with self.lock:
+            key = item[self.hash_key]
+            if key in self.items:
+                self._unindex(self.items[key])
+            self.items[key] = dict(item)
+            for index, attribute in self.indexes.items():
+                if attribute in item:
+                    self.index_entries[index].setdefault(item[attribute], {})[key] = True
+
+    def remove(self, key):
+        with self.lock:
+            item = self.items.pop(key, None)
+            if item:
+                self._unindex(item)
+
+    def _unindex(self, item: Dict):
+        for index, attribute in self.indexes.items():
+            if attribute in item:
+                self.index_entries[index].get(item[attribute], {}).pop(item[self.hash_key], None)
+
+    # boto3 Table API
+    def get_item(self, Key: Dict, **kwargs):
+        self.service.call('dynamodb.get_item')
+        with self.lock:
+            item = self.items.get(Key[self.hash_key])
+        return {'Item': project(item, kwargs)} if item else {}
+
+    def put_item(self, Item: Dict, **kwargs):
+        self.service.call('dynamodb.put_item')
+        self.store(Item)
+        return {}
+
+    def delete_item(self, Key: Dict, **kwargs):
+        self.service.call('dynamodb.delete_item')
+        self.remove(Key[self.hash_key])
+        return {}
+
+    def update_item(self, Key: Dict, UpdateExpression: str, ExpressionAttributeValues: Dict = None,
+                    ExpressionAttributeNames: Dict = None, **kwargs):
+        """Supports SET a = :v and ADD a :v (numbers and sets), comma separated"""
+        self.service.call('dynamodb.update_item')
+        values = ExpressionAttributeValues or {}
+        names = ExpressionAttributeNames or {}
+        with self.lock:
+            item = dict(self.items.get(Key[self.hash_key], Key))
+            for action, body in re.findall(r"(SET|ADD)\s+(.*?)(?=\s+(?:SET|ADD)\s+|$)", UpdateExpression.strip()):
+                for clause in body.split(','):
+                    if action == 'SET':
+                        attribute, placeholder = [part.strip() for part in clause.split('=')]
+                        item[names.get(attribute, attribute)] = values[placeholder]
+                    else:
+                        attribute, placeholder = clause.split()
+                        attribute = names.get(attribute, attribute)
+                        value = values[placeholder]
+                        if isinstance(value, set):
+                            item[attribute] = set(item.get(attribute, set())) | value
+                        else:
+                            item[attribute] = item.get(attribute, 0) + value
+            self.store(item)
+        return {'Attributes': item} if kwargs.get('ReturnValues') else {}
+
+    def query(self, KeyConditionExpression, IndexName: str = None, Limit: int = None,
+              ExclusiveStartKey: Dict = None, **kwargs):
+        """Supports hash = :v, optionally AND a condition on the range key (items come back in range key order)"""
+        self.service.call('dynamodb.query')
+        expression = KeyConditionExpression.get_expression()
+        range_condition = None
+        if expression['operator'] == 'AND':
+            KeyConditionExpression, range_condition = expression['values']
+            expression = KeyConditionExpression.get_expression()
+        if expression['operator'] != '=':
+            raise NotImplementedError("The stand-in only supports equality hash key conditions")
+        value = expression['values'][1]
+        with self.lock:
+            if IndexName:
+                keys = list(self.index_entries[IndexName].get(value, {}))
+            else:
+                keys = [value] if value in self.items else []
+            items = [self.items[k] for k in keys]
+        if range_condition is not None:
+            range_key = range_condition.get_expression()['values'][0].name
+            items = sorted((item for item in items if condition_matches(range_condition, item)),
+                           key=lambda item: item[range_key])
+        return self._page(items, kwargs, Limit, ExclusiveStartKey)
+
+    def scan(self, Segment: int = 0, TotalSegments: int = 1, Limit: int = None,
+             ExclusiveStartKey: Dict = None, FilterExpression=None, **kwargs):
+        self.service.call('dynamodb.scan')
+        with self.lock:
+            keys = sorted(self.items)
+            items = [self.items[k] for k in keys
+                     if TotalSegments == 1 or zlib.crc32(str(k).encode()) % TotalSegments == Segment]
+        return self._page(items, kwargs, Limit, ExclusiveStartKey, FilterExpression)
+
+    def _page(self, items: List[Dict], kwargs: Dict, limit: Optional[int], start_key: Optional[Dict],
+              filter_expression=None):
+        if start_key:
+            position = next((i for i, item in enumerate(items)
+                             if item[self.hash_key] == start_key[self.hash_key]), len(items) - 1) + 1
+            items = items[position:]
+        page_size = min(limit or self.service.page_items, self.service.page_items)
+        page, rest = items[:page_size], items[page_size:]
+        self.service.counter.add('dynamodb.items_read', len(page))
+        matched = [project(item, kwargs) for item in page
+                   if filter_expression is None or condition_matches(filter_expression, item)]
+        response = {'Items': matched, 'Count': len(matched), 'ScannedCount': len(page)}
+        if rest:
+            response['LastEvaluatedKey'] = {self.hash_key: page[-1][self.hash_key]}
+        return response
+
+    def batch_writer(self, **kwargs):
+        return FakeBatchWriter(self)
+
+
+class FakeDynamoDB:
+    """
+    boto3 DynamoDB resource stand-in. tables maps table name -> (hash key,
+    {index name: index hash key}). Scans and queries return page_items items
+    per page, roughly DynamoDB's 1 MB page for small resume items. Items
+    returned by reads are counted as dynamodb.items_read, a proxy for read cost.
+    """
+
+    def __init__(self, counter: CallCounter, tables: Dict[str, tuple], latency_ms: float = 5,
+                 page_items: int = 1000):
+        self.counter = counter
+        self.latency_ms = latency_ms
+        self.page_items = page_items
+        self.tables = {name: FakeTable(self, name, hash_key, indexes)
+                       for name, (hash_key, indexes) in tables.items()}
+
+    def call(self, operation: str):
+        self.counter.add(operation)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def Table(self, name: str) -> FakeTable:
+        return self.tables[name]
+
+    def batch_get_item(self, RequestItems: Dict, **kwargs):
+        self.call('dynamodb.batch_get_item')
+        responses = {}
+        for name, request in RequestItems.items():
+            table = self.tables[name]
+            with table.lock:
+                found = [table.items.get(key[table.hash_key]) for key in request['Keys']]
+            responses[name] = [project(item, request) for item in found if item]
+            self.counter.add('dynamodb.items_read', len(responses[name]))
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+
+class FakeS3:
+    def __init__(self, counter: CallCounter, latency_ms: float = 15):
+        self.counter = counter
+        self.latency_ms = latency_ms
+        self.objects = {}
+        self.lock = threading.Lock()
+
+    def _call(self, operation: str):
+        self.counter.add(operation)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs):
+        self._call('s3.put_object')
+        with self.lock:
+            self.objects[(Bucket, Key)] = Body
+        return {}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs):
+        self._call('s3.get_object')
+        with self.lock:
+            body = self.objects[(Bucket, Key)]
+        return {'Body': io.BytesIO(body)}
+
+    def generate_presigned_url(self, ClientMethod: str, Params: Dict, ExpiresIn: int = 3600, **kwargs):
+        # Presigning is local signing work, no request is made
+        self.counter.add('s3.generate_presigned_url')
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+    def get_paginator(self, operation: str):
+        stand_in = self
+
+        class Paginator:
+            def paginate(self, Bucket: str, Prefix: str = '', **kwargs):
+                stand_in._call('s3.list_objects_v2')
+                with stand_in.lock:
+                    keys = sorted(k for b, k in stand_in.objects if b == Bucket and k.startswith(Prefix))
+                yield {'Contents': [{'Key': k} for k in keys]}
+
+        return Paginator()
+
+
+class TelegramStandIn(BaseHTTPRequestHandler):
+    """
+    Local Telegram Bot API. Counts new connections and calls per method,
+    serves files registered in `files` (file_id -> bytes) through getFile
+    and the /file/ download path, and waits latency_ms per request.
+    Every sent or edited text is logged in `messages` as (perf_counter, chat_id, text).
+    """
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this Nagle + delayed ACK add ~40ms per kept-alive call
+    disable_nagle_algorithm = True
+    handshake_ms = 0.0
+    latency_ms = 0.0
+    counter = CallCounter()
+    files = {}
+    messages = []
+    message_ids = iter(range(1, 10 ** 9))
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        self.counter.add('telegram.connections')
+        if self.handshake_ms:
+            time.sleep(self.handshake_ms / 1000)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])) or b'{}')
+        method = self.path.rsplit('/', 1)[-1]
+        self.counter.add(f"telegram.{method}")
+        if method == 'getFile':
+            result = {'file_id': payload['file_id'], 'file_path': f"documents/{payload['file_id']}.pdf"}
+        else:
+            with self.lock:
+                result = {'message_id': payload.get('message_id') or next(self.message_ids)}
+                if 'text' in payload:
+                    self.messages.append((time.perf_counter(), payload.get('chat_id'), payload['text']))
+        self.respond(json.dumps({'ok': True, 'result': result}).encode(), 'application/json')
+
+    def do_GET(self):
+        self.counter.add('telegram.file_download')
+        file_id = self.path.rsplit('/', 1)[-1][:-len('.pdf')]
+        body = self.files.get(file_id)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.respond(body, 'application/pdf')
+
+    def respond(self, body: bytes, content_type: str):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_telegram_stand_in(counter: CallCounter, latency_ms: float = 0.0, handshake_ms: float = 0.0):
+    """Start a TelegramStandIn on a free local port; returns (server, base_url)"""
+    TelegramStandIn.counter = counter
+    TelegramStandIn.latency_ms = latency_ms
+    TelegramStandIn.handshake_ms = handshake_ms
+    TelegramStandIn.messages = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TelegramStandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -1,30 +1,390 @@
+import hashlib
+import heapq
 import json
+import math
 import os
-import boto3
-from typing import Dict, List, Optional, Tuple
+import queue
+import random
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import urllib3
-from datetime import datetime
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
 
-# Initialize AWS clients
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+class LazyAWS:
+    """
+    A boto3 client or resource that is only created on first use, so code
+    paths that never touch AWS (/start, /help, /upload acks) skip importing boto3.
+    """
+    _lock = threading.Lock()
+    
+    def __init__(self, kind: str, service: str, **kwargs):
+        self._kind = kind
+        self._service = service
+        self._kwargs = kwargs
+        self._instance = None
+    
+    def __getattr__(self, name):
+        if self._instance is None:
+            # boto3's default session is not thread-safe while creating clients
+            with LazyAWS._lock:
+                if self._instance is None:
+                    import boto3
+                    kwargs = dict(self._kwargs)
+                    if isinstance(kwargs.get('config'), dict):
+                        from botocore.config import Config
+                        kwargs['config'] = Config(**kwargs['config'])
+                    self._instance = getattr(boto3, self._kind)(self._service, **kwargs)
+        return getattr(self._instance, name)
+
+
+# Initialize AWS clients (lazily, on first use)
+s3_client = LazyAWS('client', 's3')
+sqs_client = LazyAWS('client', 'sqs')
+dynamodb = LazyAWS('resource', 'dynamodb')
+# BedrockInvoker does its own throttle-aware retries, so botocore must not retry underneath it
+bedrock_runtime = LazyAWS('client', 'bedrock-runtime', region_name='us-east-1',
+                          config={'retries': {'mode': 'standard', 'max_attempts': 1}})
 
 # Environment variables
 S3_BUCKET = os.environ.get('S3_BUCKET_NAME')
 DYNAMODB_TABLE = os.environ.get('DYNAMODB_TABLE_NAME')
+SKILL_INDEX_TABLE = os.environ.get('SKILL_INDEX_TABLE_NAME', '')
+BEDROCK_CACHE_TABLE = os.environ.get('BEDROCK_CACHE_TABLE_NAME', '')
+STATS_TABLE = os.environ.get('STATS_TABLE_NAME', '')
 BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN', '')
+TELEGRAM_API_URL = os.environ.get('TELEGRAM_API_URL', 'https://api.telegram.org')
+TELEGRAM_CONNECT_TIMEOUT = float(os.environ.get('TELEGRAM_CONNECT_TIMEOUT', '3'))
+TELEGRAM_READ_TIMEOUT = float(os.environ.get('TELEGRAM_READ_TIMEOUT', '10'))
+TELEGRAM_RETRIES = int(os.environ.get('TELEGRAM_RETRIES', '3'))
+TELEGRAM_PROGRESS_INTERVAL_SECONDS = float(os.environ.get('TELEGRAM_PROGRESS_INTERVAL_SECONDS', '1'))
+INGEST_QUEUE_URL = os.environ.get('INGEST_QUEUE_URL', '')
+INGEST_STAGE_ATTEMPTS = int(os.environ.get('INGEST_STAGE_ATTEMPTS', '3'))
+INGEST_RETRY_BASE_SECONDS = float(os.environ.get('INGEST_RETRY_BASE_SECONDS', '1'))
+CONTENT_HASH_INDEX = 'content-hash-index'
+ROLE_INDEX = 'role-index'
+CREATED_DAY_INDEX = 'created-day-index'
+PDF_TEXT_CHAR_BUDGET = int(os.environ.get('PDF_TEXT_CHAR_BUDGET', '20000'))
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', '30'))
+PDF_TIME_BUDGET_SECONDS = float(os.environ.get('PDF_TIME_BUDGET_SECONDS', '10'))
+BEDROCK_MODEL_ID = 'anthropic.claude-3-haiku-20240307-v1:0'
+# Optional per-container pacing: this container's share of the account quota (the quota divided
+# by the containers expected to call Bedrock at once). 0 leaves it to AIMD and throttle retries.
+BEDROCK_REQUESTS_PER_MINUTE = float(os.environ.get('BEDROCK_REQUESTS_PER_MINUTE', '0'))
+BEDROCK_TOKENS_PER_MINUTE = float(os.environ.get('BEDROCK_TOKENS_PER_MINUTE', '0'))
+BEDROCK_MAX_ATTEMPTS = int(os.environ.get('BEDROCK_MAX_ATTEMPTS', '4'))
+BEDROCK_BACKOFF_BASE_SECONDS = float(os.environ.get('BEDROCK_BACKOFF_BASE_SECONDS', '0.5'))
+BEDROCK_BACKOFF_MAX_SECONDS = float(os.environ.get('BEDROCK_BACKOFF_MAX_SECONDS', '8'))
+BEDROCK_BREAKER_THRESHOLD = int(os.environ.get('BEDROCK_BREAKER_THRESHOLD', '5'))
+BEDROCK_BREAKER_COOLDOWN_SECONDS = float(os.environ.get('BEDROCK_BREAKER_COOLDOWN_SECONDS', '30'))
+BEDROCK_RETRYABLE_ERRORS = {'ThrottlingException', 'ServiceUnavailableException', 'ModelNotReadyException',
+                            'InternalServerException', 'ModelTimeoutException'}
+MAX_SCORING_CONCURRENCY = int(os.environ.get('MAX_SCORING_CONCURRENCY', '8'))
+BEDROCK_MAX_CONCURRENCY = int(os.environ.get('BEDROCK_MAX_CONCURRENCY', str(MAX_SCORING_CONCURRENCY)))
+BATCH_SCORING_ENABLED = os.environ.get('BATCH_SCORING_ENABLED', 'true').lower() == 'true'
+BATCH_MAX_RESUMES = int(os.environ.get('BATCH_MAX_RESUMES', '10'))
+BATCH_PROMPT_TOKEN_BUDGET = int(os.environ.get('BATCH_PROMPT_TOKEN_BUDGET', '6000'))
+BATCH_OUTPUT_TOKENS_PER_RESUME = 250
+PREFILTER_TOP_K = int(os.environ.get('PREFILTER_TOP_K', '20'))
+PREFILTER_MIN_OVERLAP = int(os.environ.get('PREFILTER_MIN_OVERLAP', '1'))
+# Stop sending candidates to Bedrock once no remaining upper bound can enter the shown top-K
+RANKING_EARLY_STOP_ENABLED = os.environ.get('RANKING_EARLY_STOP_ENABLED', 'true').lower() == 'true'
+# Most credit the AI is assumed to give a required skill the taxonomy does not relate to the resume
+RANKING_UNRELATED_CREDIT = float(os.environ.get('RANKING_UNRELATED_CREDIT', '0.5'))
+CATALOG_SCAN_SEGMENTS = int(os.environ.get('CATALOG_SCAN_SEGMENTS', '4'))
+RETRIEVAL_MODE = os.environ.get('RETRIEVAL_MODE', 'skills')  # skills | role | embedding | hybrid
+# Role mode widens to skill retrieval when the JD's role partitions yield fewer candidates
+ROLE_MIN_CANDIDATES = int(os.environ.get('ROLE_MIN_CANDIDATES', str(PREFILTER_TOP_K)))
+EMBEDDING_DIMS = int(os.environ.get('EMBEDDING_DIMS', '256'))
+# Embedding similarity is a rough proxy for the match score: 20 recovers ~58% of the
+# exhaustive top 20 on bench_embedding_recall, 100 recovers ~95%
+EMBEDDING_TOP_K = int(os.environ.get('EMBEDDING_TOP_K', '100'))
+# Hybrid already has the skill shortlist, so it adds fewer embedding neighbours
+HYBRID_EMBEDDING_TOP_K = int(os.environ.get('HYBRID_EMBEDDING_TOP_K', '20'))
+EMBEDDING_TEXT_CHARS = 4000
+EMBEDDING_NGRAMS = (3, 4)
+CATALOG_ATTRIBUTES = ['resume_id', 'role', 's3_key', 'skills', 'skill_bits', 'created_at'] + (
+    ['embedding'] if RETRIEVAL_MODE in ('embedding', 'hybrid') else []
+)
+CATALOG_CACHE_TTL_SECONDS = float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', '30'))
+CATALOG_FULL_RELOAD_SECONDS = float(os.environ.get('CATALOG_FULL_RELOAD_SECONDS', '900'))
+CATALOG_REFRESH_OVERLAP_SECONDS = float(os.environ.get('CATALOG_REFRESH_OVERLAP_SECONDS', '60'))
+CATALOG_STATS_ID = 'catalog'
+# Roles and skills kept on the catalog stats item for /stats; the rest live in their own counter items
+STATS_TOP_COUNTERS = 20
+STATS_SUMMARY_ATTEMPTS = 5
+# Entries are capped in length, so a page of at most 15 stays under Telegram's 4096 characters
+LIST_PAGE_SIZE = max(1, min(15, int(os.environ.get('LIST_PAGE_SIZE', '10'))))
+LIST_CURSOR_TTL_SECONDS = int(os.environ.get('LIST_CURSOR_TTL_SECONDS', '3600'))
+
+BEDROCK_CACHE_ENABLED = os.environ.get('BEDROCK_CACHE_ENABLED', 'true').lower() == 'true'
+BEDROCK_CACHE_MAX_ENTRIES = int(os.environ.get('BEDROCK_CACHE_MAX_ENTRIES', '512'))
+BEDROCK_CACHE_TTL_SECONDS = int(os.environ.get('BEDROCK_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+SCORE_CACHE_ENABLED = os.environ.get('SCORE_CACHE_ENABLED', 'true').lower() == 'true'
+SCORE_CACHE_MAX_ENTRIES = int(os.environ.get('SCORE_CACHE_MAX_ENTRIES', '5000'))
+FALLBACK_EXPLANATION = 'Fallback matching used'
+MATCH_ENGINE = os.environ.get('MATCH_ENGINE', 'taxonomy')
+SKILL_TAXONOMY_PATH = os.environ.get(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_taxonomy.json')
+)
+SKILL_DICTIONARY_PATH = os.environ.get(
+    'SKILL_DICTIONARY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_dictionary.json')
+)
+# Append-only skill list: bit positions of the packed skill_bits stored with each resume
+SKILL_VOCABULARY_PATH = os.environ.get(
+    'SKILL_VOCABULARY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_vocabulary.json')
+)
+SKILL_EXTRACTION_MODE = os.environ.get('SKILL_EXTRACTION_MODE', 'bedrock')  # bedrock | dictionary
+# Alphanumeric runs and single symbols, so "node.js", "c++" and "ci/cd" tokenize consistently
+SKILL_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+|[^\sA-Za-z0-9]")
+# A separator inside a skill name that resumes also drop or space out (node.js, ci/cd, http/2)
+SKILL_SEPARATOR_PATTERN = re.compile(r"(?<=[a-z])[.\-/_](?=[a-z0-9])|(?<=[0-9])[.\-/_](?=[a-z])")
+TRACE_ENABLED = os.environ.get('TRACE_ENABLED', 'true').lower() == 'true'
+TRACE_NAMESPACE = os.environ.get('TRACE_NAMESPACE', 'TalentMatch')
+LOG_EVENT_MAX_CHARS = int(os.environ.get('LOG_EVENT_MAX_CHARS', '2000'))  # 0 disables event logging
+LOG_FIELD_MAX_CHARS = int(os.environ.get('LOG_FIELD_MAX_CHARS', '200'))
+LOG_PARSE_MAX_CHARS = 64 * 1024
+LOG_REDACTED_FIELDS = {'resume_data', 'authorization', 'cookie', 'x-telegram-bot-api-secret-token',
+                       'first_name', 'last_name', 'username', 'phone_number'}
+
+# Bedrock response cache: in-process LRU in front of the DynamoDB cache table
+_bedrock_cache_lock = threading.Lock()
+_bedrock_cache = OrderedDict()
+_bedrock_cache_stats = {'memory_hits': 0, 'persistent_hits': 0, 'misses': 0, 'bypassed': 0}
+
+# In-memory stand-in for the ingest queue (INGEST_QUEUE_URL=local)
+_local_ingest_queue = queue.Queue()
+
+# Keep-alive Telegram connection pool, reused across warm invocations
+_telegram_http = None
+_telegram_http_lock = threading.Lock()
+
+# Skill taxonomy, loaded once per container
+_taxonomy = None
+
+# Skill dictionary compiled into a token phrase table, built once per container
+_skill_phrases = None
+
+# Skill vocabulary (skill -> bit position), loaded once per container
+_skill_vocabulary = None
+
+# IDF-weighted embedding matrix for the last catalog searched
+_embedding_index = {'resumes': None, 'matrix': None, 'idf': None}
+
+# Skill bitset matrix of the last catalog list shortlisted
+_skill_matrix_index = {'resumes': None, 'matrix': None}
+
+# JD/resume match scores keyed by (JD skill fingerprint, resume_id)
+_score_cache_lock = threading.Lock()
+_score_cache = OrderedDict()
+
+# Resume catalog cache, kept across warm invocations of this container
+_catalog_lock = threading.Lock()
+_catalog_cache = {
+    'resumes': {},
+    'ordered': [],
+    'watermark': '',
+    'refreshed_at': None,
+    'full_loaded_at': None,
+    'hits': 0,
+    'misses': 0,
+    'incremental_refreshes': 0,
+    'full_reloads': 0,
+    'last_refresh_ms': 0.0
+}
+
+# Trace of the invocation in progress; Lambda runs one invocation per container at a time
+_trace = None
+
+
+class Trace:
+    """
+    Span timings and counters for one invocation, emitted as a single CloudWatch
+    Embedded Metric Format record. Worker threads add to the same trace.
+    """
+    
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.route = 'unknown'
+        self.started = time.perf_counter()
+        self.spans = {}  # name -> [count, total_ms, max_ms]
+        self.counters = {}
+        self.lock = threading.Lock()
+    
+    def add_span(self, name: str, elapsed_ms: float):
+        with self.lock:
+            entry = self.spans.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+    
+    def count(self, name: str, amount: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def record(self) -> Dict:
+        """The EMF record: one metric per span total, span count and counter"""
+        record = {
+            'Handler': self.handler,
+            'Route': self.route,
+            'duration_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'span_max_ms': {}
+        }
+        metrics = [{'Name': 'duration_ms', 'Unit': 'Milliseconds'}]
+        with self.lock:
+            for name, (count, total_ms, max_ms) in sorted(self.spans.items()):
+                record[f"{name}_ms"] = round(total_ms, 2)
+                record[f"{name}_count"] = count
+                record['span_max_ms'][name] = round(max_ms, 2)
+                metrics.append({'Name': f"{name}_ms", 'Unit': 'Milliseconds'})
+                metrics.append({'Name': f"{name}_count", 'Unit': 'Count'})
+            for name, value in sorted(self.counters.items()):
+                record[name] = value
+                metrics.append({'Name': name, 'Unit': 'Count'})
+        
+        record['_aws'] = {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': TRACE_NAMESPACE,
+                'Dimensions': [['Handler', 'Route']],
+                'Metrics': metrics
+            }]
+        }
+        return record
+
+
+class Span:
+    """Times a `with` block into a trace"""
+    __slots__ = ('trace', 'name', 'started')
+    
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.trace.add_span(self.name, (time.perf_counter() - self.started) * 1000)
+
+
+class NoSpan:
+    """Shared do-nothing span used while tracing is off"""
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        pass
+
+
+_no_span = NoSpan()
+
+
+def span(name: str):
+    """Context manager timing a block as span `name` of the current invocation"""
+    trace = _trace
+    return Span(trace, name) if trace is not None else _no_span
+
+
+def trace_count(name: str, amount: int = 1):
+    """Add to a counter of the current invocation (tokens, cache hits)"""
+    trace = _trace
+    if trace is not None:
+        trace.count(name, amount)
+
+
+def set_trace_route(route: str):
+    """Name the code path this invocation took; used as a metric dimension"""
+    if _trace is not None:
+        _trace.route = route
+
+
+def start_trace(handler: str):
+    global _trace
+    _trace = Trace(handler) if TRACE_ENABLED else None
+
+
+def finish_trace():
+    """Print the invocation's EMF record; CloudWatch extracts the metrics from the log line"""
+    global _trace
+    trace, _trace = _trace, None
+    if trace is not None:
+        print(json.dumps(trace.record()))
+
+
+def redact_for_log(value):
+    """Copy of an event with secrets, personal fields and uploads masked and long strings cut"""
+    if isinstance(value, dict):
+        return {
+            key: f"[redacted {len(str(item))} chars]" if str(key).lower() in LOG_REDACTED_FIELDS else redact_for_log(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_for_log(item) for item in value[:20]] + ([f"[{len(value) - 20} more]"] if len(value) > 20 else [])
+    if isinstance(value, str) and value[:1] in ('{', '['):
+        # API Gateway bodies are JSON strings: parse small ones so their fields are redacted too
+        if len(value) > LOG_PARSE_MAX_CHARS:
+            return f"[{len(value)} chars of JSON not logged]"
+        try:
+            return redact_for_log(json.loads(value))
+        except ValueError:
+            pass
+    if isinstance(value, str) and len(value) > LOG_FIELD_MAX_CHARS:
+        return f"{value[:LOG_FIELD_MAX_CHARS]}...[{len(value)} chars]"
+    return value
+
+
+def log_event(event: Dict):
+    """Log the incoming event, redacted and capped at LOG_EVENT_MAX_CHARS"""
+    if LOG_EVENT_MAX_CHARS <= 0:
+        return
+    
+    text = json.dumps(redact_for_log(event), ensure_ascii=False, default=str)
+    if len(text) > LOG_EVENT_MAX_CHARS:
+        text = f"{text[:LOG_EVENT_MAX_CHARS]}...[{len(text)} chars]"
+    print(f"Received event: {text}")
+
 
 def lambda_handler(event, context):
     """Main Lambda handler for resume matching and uploads"""
+    start_trace('matcher')
     try:
-        print(f"Received event: {json.dumps(event)}")
+        log_event(event)
+        
+        if event.get('action') == 'rebuild_skill_index':
+            set_trace_route('rebuild_skill_index')
+            return {'statusCode': 200, 'body': json.dumps(rebuild_skill_index())}
+        
+        if event.get('action') == 'migrate_skill_vectors':
+            set_trace_route('migrate_skill_vectors')
+            return {'statusCode': 200, 'body': json.dumps(migrate_skill_vectors())}
+        
+        if event.get('action') == 'rebuild_catalog_stats':
+            set_trace_route('rebuild_catalog_stats')
+            return {'statusCode': 200, 'body': json.dumps(rebuild_catalog_stats())}
+        
+        records = event.get('Records') or []
+        if records and all(r.get('eventSource') == 'aws:sqs' for r in records):
+            set_trace_route('ingest_worker')
+            return handle_ingest_records(records)
         
         body = json.loads(event.get('body', '{}'))
         
         if 'message' in body:
             return handle_telegram_message(body['message'])
         else:
+            set_trace_route('api')
             return handle_direct_api(body)
         
     except Exception as e:
@@ -35,6 +395,8 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
+    finally:
+        finish_trace()
 
 
 def handle_telegram_message(message: Dict):
@@ -43,11 +405,13 @@ def handle_telegram_message(message: Dict):
     
     # Check if message contains a document (PDF)
     if 'document' in message:
+        set_trace_route('telegram_document')
         return handle_document_upload(message)
     
     # Regular text message
     text = message.get('text', '').strip()
-    print(f"Telegram message from {chat_id}: {text}")
+    set_trace_route('telegram_command' if text.startswith('/') else 'telegram_jd')
+    print(f"Telegram message from {chat_id}: {text[:LOG_FIELD_MAX_CHARS]}")
     
     # Handle commands
     if text.startswith('/start'):
@@ -76,7 +440,7 @@ Send a PDF resume and I'll:
 
 *📋 Commands:*
 /help - Detailed help
-/list - View all resumes
+/list - Browse resumes (`/list 2` for page 2)
 /stats - System statistics
 
 💡 *Try it:* Send a job description or upload a PDF!
@@ -106,7 +470,7 @@ The AI will:
 - Provide detailed match analysis
 
 *📋 Commands:*
-/list - View all available resumes
+/list [page] - Browse available resumes
 /stats - System statistics
 /upload - Upload instructions
 
@@ -119,33 +483,43 @@ The AI will:
         return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
     
     if text.startswith('/list'):
-        resumes = get_all_resumes()
-        if not resumes:
-            send_telegram_message(chat_id, "📭 No resumes in database yet. Upload one by sending a PDF!")
+        args = text.split()[1:]
+        page_number = int(args[0]) if args and args[0].isdigit() and int(args[0]) > 0 else 1
+        page = get_resume_page(page_number)
+        if not page['resumes']:
+            if page_number == 1:
+                send_telegram_message(chat_id, "📭 No resumes in database yet. Upload one by sending a PDF!")
+            else:
+                send_telegram_message(chat_id, f"📭 No resumes on page {page_number}. Send /list to start over.")
             return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
         
-        msg = f"📋 *Available Resumes ({len(resumes)})*\n\n"
-        for resume in resumes:
-            msg += f"• *{resume['resume_id']}*\n"
-            msg += f"  Role: {resume.get('role', 'N/A')}\n"
-            msg += f"  Skills: {len(resume.get('skills', []))} found\n"
-            msg += f"  Top: {', '.join(resume.get('skills', [])[:6])}\n\n"
+        total = f" of {page['total']}" if page['total'] is not None else ''
+        msg = f"📋 *Available Resumes* (page {page_number}{total})\n\n"
+        for resume in page['resumes']:
+            skills = resume.get('skills', [])
+            msg += f"• *{clip_text(resume['resume_id'], 60)}*\n"
+            msg += f"  Role: {clip_text(resume.get('role', 'N/A'), 40)}\n"
+            msg += f"  Skills: {len(skills)} found\n"
+            msg += f"  Top: {clip_text(', '.join(skills[:6]), 120)}\n\n"
+        if page['has_more']:
+            msg += f"➡️ Next page: /list {page_number + 1}"
         
         send_telegram_message(chat_id, msg, parse_mode='Markdown')
         return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
     
     if text.startswith('/stats'):
-        resumes = get_all_resumes()
-        all_skills = set()
-        for resume in resumes:
-            all_skills.update(resume.get('skills', []))
+        stats = get_catalog_stats()
+        top_skills = list(stats['skills'].items())[:12]
+        top_roles = list(stats['roles'].items())[:8]
         
         msg = f"📊 *System Statistics*\n\n"
         msg += f"🤖 AI Engine: Amazon Bedrock (Claude)\n"
-        msg += f"📄 Total Resumes: {len(resumes)}\n"
-        msg += f"🔧 Unique Skills: {len(all_skills)}\n\n"
-        if all_skills:
-            msg += f"Top Skills: {', '.join(sorted(list(all_skills))[:12])}"
+        msg += f"📄 Total Resumes: {stats['resumes']}\n"
+        msg += f"🔧 Unique Skills: {stats['unique_skills']}\n\n"
+        if top_roles:
+            msg += f"Roles: {', '.join(f'{clip_text(role, 40)} ({count})' for role, count in top_roles)}\n"
+        if top_skills:
+            msg += f"Top Skills: {', '.join(f'{skill} ({count})' for skill, count in top_skills)}"
         
         send_telegram_message(chat_id, msg, parse_mode='Markdown')
         return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
@@ -180,7 +554,11 @@ The AI will:
 
 
 def handle_document_upload(message: Dict):
-    """Handle PDF resume upload from Telegram"""
+    """
+    Handle PDF resume upload from Telegram.
+    With an ingest queue configured the webhook only enqueues the job and
+    acknowledges; the ingest worker does the actual processing.
+    """
     chat_id = message['chat']['id']
     document = message['document']
     
@@ -188,82 +566,273 @@ def handle_document_upload(message: Dict):
         send_telegram_message(chat_id, "⚠️ Please send a PDF file only!")
         return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
     
+    job = {
+        'chat_id': chat_id,
+        'file_id': document['file_id'],
+        'file_name': document.get('file_name', 'resume.pdf')
+    }
+    
+    if not INGEST_QUEUE_URL:
+        process_ingest_job(job)
+        return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
+    
+    # The worker edits this acknowledgement as the job progresses
+    status = TelegramStatus(chat_id)
     try:
-        send_telegram_message(chat_id, "📄 Processing your resume...")
-        
-        file_id = document['file_id']
-        file_name = document.get('file_name', 'resume.pdf')
-        
-        # Get file from Telegram
-        file_info = get_telegram_file(file_id)
-        if not file_info:
-            send_telegram_message(chat_id, "❌ Error: Could not download file from Telegram")
-            return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
-        
-        file_path = file_info['file_path']
-        pdf_bytes = download_telegram_file(file_path)
-        
-        if not pdf_bytes:
-            send_telegram_message(chat_id, "❌ Error: Could not download file")
-            return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
-        
-        # Extract text from PDF
-        resume_text = extract_text_from_pdf(pdf_bytes)
-        
-        if not resume_text:
-            send_telegram_message(chat_id, "❌ Could not extract text from PDF. Make sure it's a text-based PDF!")
-            return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
-        
-        print(f"Extracted text length: {len(resume_text)}")
-        
-        # Use Bedrock to extract skills
-        send_telegram_message(chat_id, "🤖 Analyzing resume with AI to extract skills...")
-        skills = extract_skills_with_bedrock(resume_text)
-        
-        if not skills:
-            send_telegram_message(chat_id, "⚠️ Could not extract skills. Using fallback...")
-            skills = extract_skills_fallback(resume_text)
-        
-        # Auto-detect role
-        detected_role = detect_role_from_text(resume_text)
-        
-        # Generate unique resume ID
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        resume_id = f"resume_{timestamp}"
-        
-        # Upload to S3
-        s3_key = f"resumes/{detected_role.lower().replace(' ', '-')}/{file_name}"
+        status.update("📄 Got your resume! Processing it now, I'll message you when it's ready...")
+        job['status_message_id'] = status.message_id
+        enqueue_ingest_job(job)
+    except Exception as e:
+        print(f"Error queueing document: {str(e)}")
+        status.update(f"❌ Error processing resume: {str(e)}")
+    
+    return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
+
+
+class IngestStageError(Exception):
+    """A resume ingestion stage failed; user_message is sent to the uploader"""
+    
+    def __init__(self, user_message: str, retryable: bool = True):
+        super().__init__(user_message)
+        self.user_message = user_message
+        self.retryable = retryable
+
+
+def enqueue_ingest_job(job: Dict):
+    """Put a resume ingestion job on SQS, or on the in-memory queue when INGEST_QUEUE_URL is 'local'"""
+    if INGEST_QUEUE_URL == 'local':
+        _local_ingest_queue.put(json.dumps(job))
+        return
+    
+    with span('sqs_send'):
+        sqs_client.send_message(QueueUrl=INGEST_QUEUE_URL, MessageBody=json.dumps(job))
+    print(f"Queued ingest job for chat {job['chat_id']}: {job['file_name']}")
+
+
+def drain_local_ingest_queue() -> int:
+    """Run every job on the in-memory ingest queue; returns the number processed"""
+    processed = 0
+    while True:
+        try:
+            body = _local_ingest_queue.get_nowait()
+        except queue.Empty:
+            return processed
+        process_ingest_job(json.loads(body))
+        processed += 1
+
+
+def handle_ingest_records(records: List[Dict]) -> Dict:
+    """
+    SQS worker entry point: process each queued ingest job.
+    Jobs that failed retryably are reported in batchItemFailures so SQS
+    redelivers them (and dead-letters them after maxReceiveCount); malformed
+    records and permanent failures are dropped.
+    """
+    failures = []
+    for record in records:
+        job = parse_ingest_job(record)
+        if job is None:
+            continue
+        try:
+            process_ingest_job(job, redeliverable=True)
+        except Exception as e:
+            print(f"Error processing ingest record {record.get('messageId')}: {str(e)}")
+            failures.append({'itemIdentifier': record.get('messageId')})
+    
+    return {'batchItemFailures': failures}
+
+
+def parse_ingest_job(record: Dict) -> Optional[Dict]:
+    """The ingest job in an SQS record, or None if the body can never be processed"""
+    try:
+        job = json.loads(record['body'])
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Dropping malformed ingest record {record.get('messageId')}: {str(e)}")
+        return None
+    
+    if not isinstance(job, dict) or not {'chat_id', 'file_id'} <= set(job):
+        print(f"Dropping ingest record {record.get('messageId')} without chat_id and file_id")
+        return None
+    job.setdefault('file_name', 'resume.pdf')
+    return job
+
+
+def run_ingest_stage(name: str, stage, *args):
+    """Run one ingestion stage, retrying retryable failures with exponential backoff"""
+    for attempt in range(1, INGEST_STAGE_ATTEMPTS + 1):
+        started = time.perf_counter()
+        try:
+            result = stage(*args)
+            print(f"Ingest stage {name} took {(time.perf_counter() - started) * 1000:.1f}ms (attempt {attempt})")
+            return result
+        except Exception as e:
+            retryable = not isinstance(e, IngestStageError) or e.retryable
+            print(f"Ingest stage {name} failed (attempt {attempt}): {str(e)}")
+            if not retryable or attempt == INGEST_STAGE_ATTEMPTS:
+                raise
+            time.sleep(INGEST_RETRY_BASE_SECONDS * (2 ** (attempt - 1)))
+
+
+def ingest_download(job: Dict) -> bytes:
+    """Stage 1: fetch the PDF from Telegram"""
+    file_info = get_telegram_file(job['file_id'])
+    if not file_info:
+        raise IngestStageError("❌ Error: Could not download file from Telegram")
+    
+    pdf_bytes = download_telegram_file(file_info['file_path'])
+    if not pdf_bytes:
+        raise IngestStageError("❌ Error: Could not download file")
+    return pdf_bytes
+
+
+def ingest_parse(pdf_bytes: bytes) -> str:
+    """Stage 2: extract text; a PDF without text will not improve on retry"""
+    resume_text = extract_text_from_pdf(pdf_bytes)
+    if not resume_text:
+        raise IngestStageError("❌ Could not extract text from PDF. Make sure it's a text-based PDF!", retryable=False)
+    
+    print(f"Extracted text length: {len(resume_text)}")
+    return resume_text
+
+
+def ingest_extract_skills(status: 'TelegramStatus', resume_text: str) -> List[str]:
+    """Stage 3: extract skills with Bedrock (or only the skill dictionary), falling back to the dictionary"""
+    if SKILL_EXTRACTION_MODE == 'dictionary':
+        return extract_skills_from_dictionary(resume_text)
+    
+    skills = extract_skills_with_bedrock(resume_text)
+    
+    if not skills:
+        status.update("⚠️ Could not extract skills. Using fallback...")
+        skills = extract_skills_from_dictionary(resume_text)
+    return skills
+
+
+def content_hash(pdf_bytes: bytes) -> str:
+    """SHA-256 of the uploaded PDF; identical files share one resume"""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def content_s3_key(role: str, digest: str) -> str:
+    """Content-addressed S3 key, so different files never overwrite each other"""
+    return f"resumes/{role.lower().replace(' ', '-')}/{digest}.pdf"
+
+
+def find_resume_by_content_hash(digest: str) -> Optional[Dict]:
+    """Return the resume already stored for this PDF content, if any"""
+    from boto3.dynamodb.conditions import Key
+    
+    try:
+        table = dynamodb.Table(DYNAMODB_TABLE)
+        with span('dynamodb_query'):
+            response = table.query(
+                IndexName=CONTENT_HASH_INDEX,
+                KeyConditionExpression=Key('content_hash').eq(digest),
+                Limit=1
+            )
+    except Exception as e:
+        print(f"Content hash lookup failed: {str(e)}")
+        return None
+    
+    items = response.get('Items', [])
+    return items[0] if items else None
+
+
+def ingest_store(job: Dict, pdf_bytes: bytes, resume_text: str, skills: List[str], digest: str) -> Dict:
+    """Stage 4: store the PDF in S3 and its metadata in DynamoDB"""
+    chat_id = job['chat_id']
+    file_name = job['file_name']
+    
+    # Auto-detect role
+    detected_role = detect_role_from_text(resume_text)
+    
+    # Generate unique resume ID
+    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    resume_id = f"resume_{timestamp}_{digest[:8]}"
+    
+    # Upload to S3
+    s3_key = content_s3_key(detected_role, digest)
+    with span('s3_put'):
         s3_client.put_object(
             Bucket=S3_BUCKET,
             Key=s3_key,
             Body=pdf_bytes,
             ContentType='application/pdf'
         )
+    
+    print(f"Uploaded to S3: {s3_key}")
+    
+    # Save metadata to DynamoDB
+    created_at = datetime.utcnow().isoformat()
+    item = {
+        'resume_id': resume_id,
+        'role': detected_role,
+        'skills': skills,
+        's3_key': s3_key,
+        'created_at': created_at,
+        'created_day': created_at[:10],
+        'filename': file_name,
+        'content_hash': digest,
+        'uploaded_by': str(chat_id),
+        'skill_bits': encode_skill_bits(skills),
+        'embedding': embed_text(resume_embedding_text(skills, resume_text))
+    }
+    table = dynamodb.Table(DYNAMODB_TABLE)
+    with span('dynamodb_put'):
+        table.put_item(Item=item)
+    
+    print(f"Saved to DynamoDB: {resume_id}")
+    remember_resume(item)
+    
+    update_skill_index(resume_id, skills)
+    update_catalog_stats(1, {detected_role: 1}, {skill: 1 for skill in index_skill_keys(skills)})
+    return item
+
+
+def process_ingest_job(job: Dict, redeliverable: bool = False):
+    """
+    Run the resume ingestion pipeline (download, parse, extract skills, store)
+    and report the outcome to the uploader on Telegram.
+    With redeliverable (the SQS worker) retryable failures are re-raised once
+    reported, so the message is retried; permanent ones are only reported.
+    """
+    chat_id = job['chat_id']
+    status = TelegramStatus(chat_id, job.get('status_message_id'))
+    
+    try:
+        status.progress("📄 Processing your resume...")
         
-        print(f"Uploaded to S3: {s3_key}")
+        pdf_bytes = run_ingest_stage('download', ingest_download, job)
         
-        # Save metadata to DynamoDB
-        table = dynamodb.Table(DYNAMODB_TABLE)
-        table.put_item(
-            Item={
-                'resume_id': resume_id,
-                'role': detected_role,
-                'skills': skills,
-                's3_key': s3_key,
-                'created_at': datetime.utcnow().isoformat(),
-                'filename': file_name,
-                'uploaded_by': str(chat_id)
-            }
-        )
+        # Identical PDFs reuse the stored resume: no parsing, Bedrock or writes
+        digest = content_hash(pdf_bytes)
+        existing = find_resume_by_content_hash(digest)
+        if existing:
+            print(f"Duplicate upload of {existing['resume_id']} ({digest})")
+            status.update(f"""♻️ *Resume Already Uploaded*
+
+📋 *Details:*
+- Resume ID: `{existing['resume_id']}`
+- Detected Role: {existing.get('role', 'Unknown')}
+- Skills Found: {len(existing.get('skills', []))}
+
+This file is already available for smart matching.
+""", parse_mode='Markdown')
+            return
         
-        print(f"Saved to DynamoDB: {resume_id}")
+        resume_text = run_ingest_stage('parse', ingest_parse, pdf_bytes)
+        
+        status.progress("🤖 Analyzing resume with AI to extract skills...")
+        skills = run_ingest_stage('extract_skills', ingest_extract_skills, status, resume_text)
+        
+        item = run_ingest_stage('store', ingest_store, job, pdf_bytes, resume_text, skills, digest)
         
         # Success message
         success_msg = f"""✅ *Resume Uploaded Successfully!*
 
 📋 *Details:*
-- Resume ID: `{resume_id}`
-- Detected Role: {detected_role}
+- Resume ID: `{item['resume_id']}`
+- Detected Role: {item['role']}
 - Skills Found: {len(skills)}
 
 🔧 *Extracted Skills:*
@@ -272,47 +841,57 @@ def handle_document_upload(message: Dict):
 🤖 Powered by Amazon Bedrock AI
 Your resume is now available for smart matching! 🎉
 """
-        send_telegram_message(chat_id, success_msg, parse_mode='Markdown')
-        
-        return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
+        status.update(success_msg, parse_mode='Markdown')
         
+    except IngestStageError as e:
+        status.update(e.user_message)
+        if redeliverable and e.retryable:
+            raise
     except Exception as e:
         print(f"Error uploading document: {str(e)}")
         import traceback
         traceback.print_exc()
-        send_telegram_message(chat_id, f"❌ Error processing resume: {str(e)}")
-        return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
+        status.update(f"❌ Error processing resume: {str(e)}")
+        if redeliverable:
+            raise
 
 
 def process_job_description_with_ai(chat_id: int, job_description: str):
     """
     Process job description using AI for intelligent matching
     """
-    send_telegram_message(chat_id, "🤖 Using AI to analyze job description...")
+    # One status message, edited in place, carries progress and the final result
+    status = TelegramStatus(chat_id)
+    status.progress("🤖 Using AI to analyze job description...")
     
     # Step 1: Extract requirements using AI
     jd_requirements = extract_jd_requirements_with_ai(job_description)
     
     if not jd_requirements or not jd_requirements.get('skills'):
-        send_telegram_message(chat_id, "❌ Couldn't extract requirements from job description. Try including specific technologies.")
+        status.update("❌ Couldn't extract requirements from job description. Try including specific technologies.")
         return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
     
     required_skills = jd_requirements['skills']
     
-    # Get all resumes
-    resumes = get_all_resumes()
+    # Step 2: Retrieve and shortlist candidate resumes locally
+    candidates, pool_size = retrieve_candidates(job_description, jd_requirements)
     
-    if not resumes:
-        send_telegram_message(chat_id, "⚠️ No resumes in database. Upload one by sending a PDF!")
+    if not pool_size:
+        status.update(f"⚠️ No resumes found with any of the required skills:\n{', '.join(required_skills[:10])}\n\nUpload one by sending a PDF!")
         return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
     
-    send_telegram_message(chat_id, f"🔍 Found {len(required_skills)} required skills. Performing semantic matching...")
+    if not candidates:
+        status.update(f"❌ None of the {pool_size} resumes share any of the required skills:\n{', '.join(required_skills[:10])}")
+        return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
     
-    # Step 2: Semantic matching with AI for each resume
-    matches = []
-    for resume in resumes:
-        match_result = semantic_match_with_ai(jd_requirements, resume)
-        matches.append(match_result)
+    status.progress(f"🔍 Found {len(required_skills)} required skills. Performing semantic matching on top {len(candidates)} of {pool_size} resumes...")
+    
+    # Step 3: Semantic matching with AI for each shortlisted resume. Bedrock
+    # scores trickle in, so a leaderboard shows a provisional best as soon as one
+    # clears 75%; taxonomy scoring is local and finishes before that would help
+    leaderboard = MatchLeaderboard(status, len(candidates)) if MATCH_ENGINE != 'taxonomy' else None
+    matches = score_resumes(jd_requirements, candidates, on_match=leaderboard and leaderboard.add, top_k=3)
+    print(f"Bedrock cache: {json.dumps(bedrock_cache_stats())}, invoker: {json.dumps(bedrock_invoker.snapshot())}")
     
     # Sort by score
     matches.sort(key=lambda x: x['score'], reverse=True)
@@ -331,13 +910,25 @@ def process_job_description_with_ai(chat_id: int, job_description: str):
             msg += f"   Score: {m['score']}%\n"
             msg += f"   Matched: {', '.join(m.get('matched_skills', [])[:5])}\n\n"
         
-        send_telegram_message(chat_id, msg, parse_mode='Markdown')
+        status.update(msg, parse_mode='Markdown')
         return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
     
-    # Best match found!
+    # Best match found! Send it now and edit in the AI explanation as it streams in.
+    # Resumes skipped by the early stop may still clear 75% when three already have
+    more_possible = len(matches) < len(candidates) and len(good_matches) >= 3
     best = good_matches[0]
     url = generate_presigned_url(best['s3_key'])
+    status.update(best_match_message(best, good_matches, required_skills, url, more_possible), parse_mode='Markdown')
     
+    if MATCH_ENGINE == 'taxonomy':
+        explain_matches_with_ai(jd_requirements, [best], on_explanation=lambda match: status.update(
+            best_match_message(best, good_matches, required_skills, url, more_possible), parse_mode='Markdown'))
+    return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
+
+
+def best_match_message(best: Dict, good_matches: List[Dict], required_skills: List[str],
+                       url: Optional[str], more_possible: bool = False) -> str:
+    """Final Telegram result for a JD; more_possible marks the other-matches count as a lower bound"""
     msg = f"✅ *Best Match Found!* (AI-Powered)\n\n"
     msg += f"📄 *Resume:* {best['resume_id']}\n"
     msg += f"👔 *Role:* {best['role']}\n"
@@ -352,14 +943,379 @@ def process_job_description_with_ai(chat_id: int, job_description: str):
         msg += f"📥 [Download Resume]({url})\n\n"
     
     if len(good_matches) > 1:
-        msg += f"*Other good matches ({len(good_matches)-1}):*\n"
+        msg += f"*Other good matches ({len(good_matches)-1}{'+' if more_possible else ''}):*\n"
         for m in good_matches[1:3]:
             msg += f"• {m['resume_id']} - {m['score']}%\n"
     
     msg += f"\n🤖 *Powered by Amazon Bedrock AI*"
+    return msg
+
+
+def invoke_bedrock(prompt: str, max_tokens: int, use_cache: bool = True, expect_json: bool = True) -> str:
+    """
+    Send a single-turn prompt to Claude on Bedrock and return the cleaned response text.
+    Responses are cached by model id, prompt and max_tokens; with expect_json only
+    responses that parse as JSON are cached.
+    """
+    if not (use_cache and BEDROCK_CACHE_ENABLED):
+        with _bedrock_cache_lock:
+            _bedrock_cache_stats['bypassed'] += 1
+        return invoke_bedrock_uncached(prompt, max_tokens)
     
-    send_telegram_message(chat_id, msg, parse_mode='Markdown')
-    return {'statusCode': 200, 'body': json.dumps({'message': 'OK'})}
+    cache_key = bedrock_cache_key(BEDROCK_MODEL_ID, prompt, max_tokens)
+    cached = bedrock_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    result_text = invoke_bedrock_uncached(prompt, max_tokens)
+    if not expect_json or is_json(result_text):
+        bedrock_cache_put(cache_key, result_text)
+    return result_text
+
+
+def invoke_bedrock_uncached(prompt: str, max_tokens: int) -> str:
+    """Call Bedrock invoke_model through the shared rate limiter, retries and circuit breaker"""
+    with span('bedrock_invoke'):
+        response_body = bedrock_invoker.invoke(prompt, max_tokens)
+    
+    usage = response_body.get('usage', {})
+    trace_count('bedrock_input_tokens', usage.get('input_tokens', 0))
+    trace_count('bedrock_output_tokens', usage.get('output_tokens', 0))
+    result_text = response_body['content'][0]['text'].strip()
+    return result_text.replace('```json', '').replace('```', '').strip()
+
+
+def invoke_bedrock_streaming(prompt: str, max_tokens: int, use_cache: bool = True) -> Iterator[str]:
+    """
+    Like invoke_bedrock, but yields the response text as the model writes it.
+    A cached response is yielded in one piece; a complete JSON response is cached.
+    """
+    cache_key = bedrock_cache_key(BEDROCK_MODEL_ID, prompt, max_tokens)
+    if use_cache and BEDROCK_CACHE_ENABLED:
+        cached = bedrock_cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+    
+    parts = []
+    with span('bedrock_stream'):
+        for kind, value in bedrock_invoker.stream(prompt, max_tokens):
+            if kind == 'text':
+                parts.append(value)
+                yield value
+            else:
+                trace_count('bedrock_input_tokens', value.get('input_tokens', 0))
+                trace_count('bedrock_output_tokens', value.get('output_tokens', 0))
+    
+    result_text = ''.join(parts).strip().replace('```json', '').replace('```', '').strip()
+    if use_cache and BEDROCK_CACHE_ENABLED and is_json(result_text):
+        bedrock_cache_put(cache_key, result_text)
+
+
+class BedrockUnavailable(Exception):
+    """Bedrock was not called (circuit open) or kept failing; callers use their fallback"""
+
+
+class TokenBucket:
+    """
+    Refills rate_per_minute units per minute but holds at most one second's worth,
+    so a burst cannot spend a whole minute of quota at once
+    """
+    
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self, amount: float) -> float:
+        """Take amount now (the balance may go negative); returns seconds to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+
+class BedrockInvoker:
+    """
+    Every Bedrock call in this container goes through one invoker, which
+    - optionally paces requests and tokens with token buckets (the quota counts max_tokens up front),
+    - bounds calls in flight with AIMD: +1/limit per success, halved on throttling,
+    - retries throttles and transient errors with full-jitter exponential backoff,
+    - opens a circuit breaker after repeated failures, so callers fall back at once
+      until one probe call succeeds after the cooldown.
+    The uploader has a copy without stream(), which only Telegram replies use;
+    keep the rest of the two in step.
+    """
+    
+    def __init__(self, client=None, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_concurrency: Optional[int] = None,
+                 max_attempts: Optional[int] = None, breaker_threshold: Optional[int] = None, sleep=time.sleep):
+        self.client = client
+        # An explicit 0 disables pacing or the breaker, so only None falls back to the settings
+        if requests_per_minute is None:
+            requests_per_minute = BEDROCK_REQUESTS_PER_MINUTE
+        if tokens_per_minute is None:
+            tokens_per_minute = BEDROCK_TOKENS_PER_MINUTE
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_concurrency = max(1, BEDROCK_MAX_CONCURRENCY if max_concurrency is None else max_concurrency)
+        self.max_attempts = max(1, BEDROCK_MAX_ATTEMPTS if max_attempts is None else max_attempts)
+        self.breaker_threshold = BEDROCK_BREAKER_THRESHOLD if breaker_threshold is None else breaker_threshold
+        self.sleep = sleep
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.decreased_at = 0.0
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.condition = threading.Condition()
+        self.stats = {'calls': 0, 'throttles': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+    
+    def invoke(self, prompt: str, max_tokens: int) -> Dict:
+        """Send one Anthropic messages request; returns the parsed response body"""
+        self.enter_breaker()
+        body = self.request_body(prompt, max_tokens)
+        
+        for attempt in range(1, self.max_attempts + 1):
+            self.pace(prompt, max_tokens)
+            self.acquire()
+            try:
+                self.count('calls')
+                response = (self.client or bedrock_runtime).invoke_model(modelId=BEDROCK_MODEL_ID, body=body)
+                result = json.loads(response['body'].read())
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+            else:
+                self.increase()
+                self.record_success()
+                return result
+            finally:
+                self.release()
+            self.sleep(delay)
+    
+    def stream(self, prompt: str, max_tokens: int) -> Iterator[Tuple[str, Dict]]:
+        """
+        Send one request with invoke_model_with_response_stream and yield
+        ('text', text_delta) as the model writes, then ('usage', token counts).
+        Failures are only retried before the first text arrives; after that the
+        error goes to the caller, who already has part of the answer.
+        """
+        self.enter_breaker()
+        body = self.request_body(prompt, max_tokens)
+        
+        for attempt in range(1, self.max_attempts + 1):
+            self.pace(prompt, max_tokens)
+            self.acquire()
+            started = False
+            usage = {}
+            try:
+                self.count('calls')
+                response = (self.client or bedrock_runtime).invoke_model_with_response_stream(
+                    modelId=BEDROCK_MODEL_ID, body=body)
+                for event in response['body']:
+                    chunk = json.loads(event['chunk']['bytes']) if 'chunk' in event else {}
+                    if chunk.get('type') == 'message_start':
+                        usage.update(chunk['message'].get('usage', {}))
+                    elif chunk.get('type') == 'message_delta':
+                        usage.update(chunk.get('usage', {}))
+                    elif chunk.get('type') == 'content_block_delta' and chunk['delta'].get('text'):
+                        started = True
+                        yield 'text', chunk['delta']['text']
+            except GeneratorExit:
+                # The caller stopped reading; Bedrock itself was fine
+                self.record_success()
+                raise
+            except Exception as e:
+                delay = self.retry_delay(e, attempt, retryable=not started)
+            else:
+                self.increase()
+                self.record_success()
+                yield 'usage', usage
+                return
+            finally:
+                self.release()
+            self.sleep(delay)
+    
+    @staticmethod
+    def request_body(prompt: str, max_tokens: int) -> str:
+        return json.dumps({
+            'anthropic_version': 'bedrock-2023-05-31',
+            'max_tokens': max_tokens,
+            'messages': [{'role': 'user', 'content': prompt}]
+        })
+    
+    def pace(self, prompt: str, max_tokens: int):
+        """Wait for the configured buckets; the token quota is charged for max_tokens up front"""
+        wait = self.requests.reserve(1) if self.requests else 0.0
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(estimate_tokens(prompt) + max_tokens))
+        if wait:
+            self.sleep(wait)
+    
+    def retry_delay(self, error: Exception, attempt: int, retryable: bool = True) -> float:
+        """Account for a failed attempt; re-raises it unless it should be retried, else returns the backoff"""
+        code = bedrock_error_code(error)
+        if code == 'ThrottlingException':
+            self.count('throttles')
+            self.decrease()
+        if not retryable or code not in BEDROCK_RETRYABLE_ERRORS or attempt == self.max_attempts:
+            self.record_failure()
+            raise error
+        self.count('retries')
+        delay = random.uniform(0, min(BEDROCK_BACKOFF_MAX_SECONDS, BEDROCK_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+        print(f"Bedrock {code} (attempt {attempt}/{self.max_attempts}), retrying in {delay:.2f}s")
+        return delay
+    
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+    
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+    
+    def increase(self):
+        with self.condition:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+    
+    def decrease(self):
+        """Halve the concurrency limit, at most once per second so one burst of throttles counts once"""
+        with self.condition:
+            now = time.monotonic()
+            if now - self.decreased_at >= 1.0:
+                self.limit = max(1.0, self.limit / 2)
+                self.decreased_at = now
+    
+    def enter_breaker(self):
+        """Raise BedrockUnavailable while the breaker is open; after the cooldown let one probe through"""
+        with self.condition:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < BEDROCK_BREAKER_COOLDOWN_SECONDS or self.probing:
+                self.stats['rejected'] += 1
+                trace_count('bedrock_rejected')
+                raise BedrockUnavailable('Bedrock circuit breaker is open')
+            self.probing = True
+    
+    def record_success(self):
+        with self.condition:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+    
+    def record_failure(self):
+        with self.condition:
+            self.stats['failures'] += 1
+            self.failures += 1
+            if self.probing or 0 < self.breaker_threshold <= self.failures:
+                if self.opened_at is None or self.probing:
+                    print(f"Bedrock circuit breaker opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+                self.probing = False
+    
+    def count(self, name: str):
+        with self.condition:
+            self.stats[name] += 1
+        trace_count(f"bedrock_{name}")
+    
+    def snapshot(self) -> Dict:
+        with self.condition:
+            return dict(self.stats, limit=round(self.limit, 2), breaker_open=self.opened_at is not None)
+
+
+def bedrock_error_code(error: Exception) -> Optional[str]:
+    """Error code of a botocore ClientError (or anything shaped like one)"""
+    return getattr(error, 'response', {}).get('Error', {}).get('Code')
+
+
+bedrock_invoker = BedrockInvoker()
+
+
+def is_json(text: str) -> bool:
+    """Check whether text parses as JSON"""
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
+def bedrock_cache_key(model_id: str, prompt: str, max_tokens: int) -> str:
+    """Content-addressed cache key for a Bedrock request"""
+    payload = json.dumps([model_id, prompt, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def bedrock_cache_get(cache_key: str) -> Optional[str]:
+    """Look up a cached response, in memory first and then in the cache table"""
+    with _bedrock_cache_lock:
+        if cache_key in _bedrock_cache:
+            _bedrock_cache.move_to_end(cache_key)
+            _bedrock_cache_stats['memory_hits'] += 1
+            trace_count('bedrock_cache_hits')
+            return _bedrock_cache[cache_key]
+    
+    if BEDROCK_CACHE_TABLE:
+        try:
+            with span('dynamodb_get'):
+                item = dynamodb.Table(BEDROCK_CACHE_TABLE).get_item(Key={'cache_key': cache_key}).get('Item')
+            # DynamoDB TTL deletes lazily, so check expiry ourselves
+            if item and int(item.get('expires_at', 0)) > time.time():
+                remember_bedrock_response(cache_key, item['response'])
+                with _bedrock_cache_lock:
+                    _bedrock_cache_stats['persistent_hits'] += 1
+                trace_count('bedrock_cache_hits')
+                return item['response']
+        except Exception as e:
+            print(f"Error reading Bedrock cache: {e}")
+    
+    with _bedrock_cache_lock:
+        _bedrock_cache_stats['misses'] += 1
+    trace_count('bedrock_cache_misses')
+    return None
+
+
+def bedrock_cache_put(cache_key: str, response_text: str):
+    """Store a response in memory and in the cache table"""
+    remember_bedrock_response(cache_key, response_text)
+    
+    if BEDROCK_CACHE_TABLE:
+        try:
+            with span('dynamodb_put'):
+                dynamodb.Table(BEDROCK_CACHE_TABLE).put_item(Item={
+                    'cache_key': cache_key,
+                    'model_id': BEDROCK_MODEL_ID,
+                    'response': response_text,
+                    'expires_at': int(time.time()) + BEDROCK_CACHE_TTL_SECONDS
+                })
+        except Exception as e:
+            print(f"Error writing Bedrock cache: {e}")
+
+
+def remember_bedrock_response(cache_key: str, response_text: str):
+    """Insert into the in-process LRU, evicting the least recently used entries"""
+    with _bedrock_cache_lock:
+        _bedrock_cache[cache_key] = response_text
+        _bedrock_cache.move_to_end(cache_key)
+        while len(_bedrock_cache) > BEDROCK_CACHE_MAX_ENTRIES:
+            _bedrock_cache.popitem(last=False)
+
+
+def bedrock_cache_stats() -> Dict:
+    """Hit-rate metrics of the Bedrock response cache"""
+    with _bedrock_cache_lock:
+        stats = dict(_bedrock_cache_stats, size=len(_bedrock_cache))
+    lookups = stats['memory_hits'] + stats['persistent_hits'] + stats['misses']
+    stats['hit_rate'] = round((stats['memory_hits'] + stats['persistent_hits']) / lookups, 3) if lookups else 0.0
+    return stats
 
 
 def extract_jd_requirements_with_ai(jd_text: str) -> Dict:
@@ -389,18 +1345,7 @@ Be comprehensive - include:
 
 Return ONLY valid JSON, no explanation."""
 
-        response = bedrock_runtime.invoke_model(
-            modelId='anthropic.claude-3-haiku-20240307-v1:0',
-            body=json.dumps({
-                'anthropic_version': 'bedrock-2023-05-31',
-                'max_tokens': 1000,
-                'messages': [{'role': 'user', 'content': prompt}]
-            })
-        )
-        
-        response_body = json.loads(response['body'].read())
-        result_text = response_body['content'][0]['text'].strip()
-        result_text = result_text.replace('```json', '').replace('```', '').strip()
+        result_text = invoke_bedrock(prompt, max_tokens=1000)
         
         requirements = json.loads(result_text)
         print(f"Extracted JD requirements: {requirements}")
@@ -411,7 +1356,7 @@ Return ONLY valid JSON, no explanation."""
         print(f"Error extracting JD requirements: {str(e)}")
         # Fallback to simple extraction
         return {
-            'skills': extract_skills_fallback(jd_text),
+            'skills': extract_skills_from_dictionary(jd_text),
             'role': 'Not specified',
             'experience_level': 'Not specified',
             'key_requirements': []
@@ -455,25 +1400,17 @@ Be generous with semantic matches. Examples:
 
 Match score should be 0-100. Return ONLY valid JSON."""
 
-        response = bedrock_runtime.invoke_model(
-            modelId='anthropic.claude-3-haiku-20240307-v1:0',
-            body=json.dumps({
-                'anthropic_version': 'bedrock-2023-05-31',
-                'max_tokens': 800,
-                'messages': [{'role': 'user', 'content': prompt}]
-            })
-        )
-        
-        response_body = json.loads(response['body'].read())
-        result_text = response_body['content'][0]['text'].strip()
-        result_text = result_text.replace('```json', '').replace('```', '').strip()
+        result_text = invoke_bedrock(prompt, max_tokens=800)
         
         match_data = json.loads(result_text)
+        score = parse_match_score(match_data.get('match_score'))
+        if score is None:
+            raise ValueError(f"Unusable match_score {match_data.get('match_score')!r}")
         
         return {
             'resume_id': resume['resume_id'],
             'role': resume.get('role', 'N/A'),
-            'score': match_data.get('match_score', 0),
+            'score': score,
             's3_key': resume['s3_key'],
             'matched_skills': match_data.get('matched_skills', []),
             'missing_skills': match_data.get('missing_skills', []),
@@ -483,63 +1420,1057 @@ Match score should be 0-100. Return ONLY valid JSON."""
     except Exception as e:
         print(f"Error in semantic matching: {str(e)}")
         # Fallback to simple matching
-        return {
-            'resume_id': resume['resume_id'],
-            'role': resume.get('role', 'N/A'),
-            'score': calculate_match_score_simple(jd_requirements.get('skills', []), resume.get('skills', [])),
-            's3_key': resume['s3_key'],
-            'matched_skills': [],
-            'missing_skills': [],
-            'explanation': 'Fallback matching used'
-        }
+        return simple_match_result(jd_requirements, resume)
 
 
-def calculate_match_score_simple(required: List[str], resume: List[str]) -> float:
-    """Simple fallback matching"""
-    if not required:
-        return 0.0
-    req_set = set(s.lower() for s in required)
-    res_set = set(s.lower() for s in resume)
-    matched = len(req_set.intersection(res_set))
-    return round((matched / len(req_set)) * 100, 2)
+def parse_match_score(value) -> Optional[float]:
+    """
+    A model's match_score as a number clamped to 0-100. Numeric strings such as
+    "85" or "85%" are accepted; booleans, NaN and anything else give None.
+    """
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().rstrip('%'))
+        except ValueError:
+            return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return None
+    return max(0, min(100, value))
 
 
-# Keep all existing helper functions below...
-def get_telegram_file(file_id: str) -> Optional[Dict]:
-    """Get file info from Telegram"""
-    if not BOT_TOKEN:
-        return None
+BATCH_MATCH_INSTRUCTIONS = """Compare the required skills against EACH candidate below and provide a match analysis per candidate.
+
+Analyze each match considering:
+1. Direct matches (exact skill names)
+2. Semantic matches (synonyms, related technologies)
+3. Skill categories (e.g., "CI/CD" matches "Jenkins", "GitHub Actions")
+
+Be generous with semantic matches. Examples:
+- "container orchestration" matches "kubernetes", "docker"
+- "CI/CD" matches "jenkins", "github actions", "gitlab"
+- "infrastructure as code" matches "terraform", "ansible"
+- "cloud" matches "aws", "azure", "gcp"
+
+Return ONLY a JSON array with one object per candidate:
+[
+  {
+    "resume_id": "id from the candidate list",
+    "match_score": 85,
+    "matched_skills": ["skill1", "skill2"],
+    "missing_skills": ["skill3"],
+    "explanation": "Brief explanation of the match quality"
+  }
+]
+
+Match score should be 0-100. Return ONLY valid JSON."""
+
+
+def format_batch_candidate(resume: Dict) -> str:
+    """Render a single candidate line for the batched prompt"""
+    return f"- {resume['resume_id']}: {', '.join(resume.get('skills', []))}"
+
+
+def semantic_match_batch_with_ai(jd_requirements: Dict, resumes: List[Dict]) -> List[Dict]:
+    """
+    Use AI to score several resumes in a single Bedrock call.
+    Entries that are missing or malformed in the response are re-scored one by one.
+    """
+    required_skills = jd_requirements.get('skills', [])
+    candidates = '\n'.join(format_batch_candidate(resume) for resume in resumes)
     
-    http = urllib3.PoolManager()
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/getFile"
+    prompt = f"""{BATCH_MATCH_INSTRUCTIONS}
+
+Required Skills (from Job Description):
+{', '.join(required_skills)}
+
+Candidates (resume_id: skills):
+{candidates}"""
     
+    parsed = {}
     try:
-        response = http.request(
-            'POST',
-            url,
-            body=json.dumps({'file_id': file_id}).encode('utf-8'),
-            headers={'Content-Type': 'application/json'}
-        )
+        result_text = invoke_bedrock(prompt, max_tokens=BATCH_OUTPUT_TOKENS_PER_RESUME * len(resumes))
+        entries = json.loads(result_text)
+        if not isinstance(entries, list):
+            raise ValueError('Batch response is not a JSON array')
         
-        data = json.loads(response.data.decode('utf-8'))
-        if data.get('ok'):
-            return data['result']
-        return None
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            score = parse_match_score(entry.get('match_score'))
+            if score is None:
+                continue
+            parsed[str(entry.get('resume_id'))] = dict(entry, match_score=score)
     except Exception as e:
-        print(f"Error getting file info: {str(e)}")
-        return None
-
-
+        print(f"Error in batched semantic matching: {str(e)}")
+    
+    results = []
+    for resume in resumes:
+        match_data = parsed.get(resume['resume_id'])
+        if match_data is None:
+            print(f"Re-scoring {resume['resume_id']} individually")
+            results.append(semantic_match_with_ai(jd_requirements, resume))
+            continue
+        
+        results.append({
+            'resume_id': resume['resume_id'],
+            'role': resume.get('role', 'N/A'),
+            'score': match_data['match_score'],
+            's3_key': resume['s3_key'],
+            'matched_skills': match_data.get('matched_skills', []),
+            'missing_skills': match_data.get('missing_skills', []),
+            'explanation': match_data.get('explanation', '')
+        })
+    
+    return results
+
+
+def score_resumes(jd_requirements: Dict, resumes: List[Dict],
+                  on_match: Optional[Callable[[Dict], None]] = None,
+                  top_k: Optional[int] = None) -> List[Dict]:
+    """
+    Score resumes against the JD. The taxonomy engine scores locally; the AI
+    engine reuses stored scores and only sends the rest to Bedrock.
+    on_match, if given, is called with each result as soon as it is available
+    (stored scores first), on the calling thread.
+    With top_k, the AI engine may skip resumes that provably cannot make the
+    top_k (see score_resumes_concurrently), so fewer results can come back.
+    """
+    if MATCH_ENGINE == 'taxonomy':
+        matches = [taxonomy_match_result(jd_requirements, resume) for resume in resumes]
+        for match in matches if on_match else []:
+            on_match(match)
+        return matches
+    
+    if not SCORE_CACHE_ENABLED:
+        return score_resumes_concurrently(jd_requirements, resumes, on_match=on_match, top_k=top_k)
+    
+    fingerprint = jd_skill_fingerprint(jd_requirements.get('skills', []))
+    stored = load_stored_scores(fingerprint, resumes)
+    pending = [resume for resume in resumes if resume['resume_id'] not in stored]
+    print(f"Score store: {len(stored)} reused, {len(pending)} to score")
+    
+    for match in stored.values() if on_match else []:
+        on_match(match)
+    fresh = score_resumes_concurrently(jd_requirements, pending, on_match=on_match, top_k=top_k,
+                                       known_scores=[m['score'] for m in stored.values()]) if pending else []
+    save_scores(fingerprint, pending, fresh)
+    
+    scored = dict(stored)
+    scored.update((match['resume_id'], match) for match in fresh)
+    return [scored[resume['resume_id']] for resume in resumes if resume['resume_id'] in scored]
+
+
+def jd_skill_fingerprint(skills: List[str]) -> str:
+    """Order- and case-insensitive fingerprint of a JD's required skills"""
+    canonical = sorted({normalize_skill(skill) for skill in skills if normalize_skill(skill)})
+    return hashlib.sha256(json.dumps(canonical).encode('utf-8')).hexdigest()[:32]
+
+
+def resume_skills_hash(resume: Dict) -> str:
+    """Hash of a resume's skills; changes whenever the stored skills change"""
+    canonical = sorted({normalize_skill(skill) for skill in resume.get('skills', []) or []})
+    return hashlib.sha256(json.dumps(canonical).encode('utf-8')).hexdigest()[:32]
+
+
+def score_cache_key(fingerprint: str, resume_id: str) -> str:
+    """Score store key; one entry per JD fingerprint and resume"""
+    return f"score#{fingerprint}#{resume_id}"
+
+
+def load_stored_scores(fingerprint: str, resumes: List[Dict]) -> Dict[str, Dict]:
+    """
+    Return stored match results for resumes whose skills hash still matches.
+    Checks the in-process store first, then the cache table.
+    """
+    found = {}
+    missing = {}
+    with _score_cache_lock:
+        for resume in resumes:
+            key = score_cache_key(fingerprint, resume['resume_id'])
+            entry = _score_cache.get(key)
+            if entry and entry['skills_hash'] == resume_skills_hash(resume):
+                _score_cache.move_to_end(key)
+                found[resume['resume_id']] = score_from_entry(entry['match'], resume)
+            else:
+                missing[key] = resume
+    
+    if missing and BEDROCK_CACHE_TABLE:
+        try:
+            items = batch_get_items(BEDROCK_CACHE_TABLE, 'cache_key', list(missing))
+            now = time.time()
+            for item in items:
+                resume = missing[item['cache_key']]
+                if item.get('skills_hash') != resume_skills_hash(resume) or int(item.get('expires_at', 0)) <= now:
+                    continue
+                match = json.loads(item['match'])
+                remember_score(item['cache_key'], item['skills_hash'], match)
+                found[resume['resume_id']] = score_from_entry(match, resume)
+        except Exception as e:
+            print(f"Error reading score store: {e}")
+    
+    trace_count('score_cache_hits', len(found))
+    return found
+
+
+def score_from_entry(match: Dict, resume: Dict) -> Dict:
+    """Rebuild a match result from a stored score and the current resume"""
+    return {
+        'resume_id': resume['resume_id'],
+        'role': resume.get('role', 'N/A'),
+        'score': match['score'],
+        's3_key': resume['s3_key'],
+        'matched_skills': match.get('matched_skills', []),
+        'missing_skills': match.get('missing_skills', []),
+        'explanation': match.get('explanation', '')
+    }
+
+
+def save_scores(fingerprint: str, resumes: List[Dict], matches: List[Dict]):
+    """
+    Store AI match results, paired with resumes by resume_id (early stopping can
+    leave resumes without a match); keyword fallbacks are not stored so they get re-scored
+    """
+    by_id = {resume['resume_id']: resume for resume in resumes}
+    items = []
+    for match in matches:
+        resume = by_id.get(match['resume_id'])
+        if resume is None or match.get('explanation') == FALLBACK_EXPLANATION:
+            continue
+        key = score_cache_key(fingerprint, resume['resume_id'])
+        stored = {k: match.get(k) for k in ('score', 'matched_skills', 'missing_skills', 'explanation')}
+        skills_hash = resume_skills_hash(resume)
+        remember_score(key, skills_hash, stored)
+        items.append({
+            'cache_key': key,
+            'skills_hash': skills_hash,
+            'match': json.dumps(stored),
+            'expires_at': int(time.time()) + BEDROCK_CACHE_TTL_SECONDS
+        })
+    
+    if items and BEDROCK_CACHE_TABLE:
+        try:
+            with span('dynamodb_batch_write'), dynamodb.Table(BEDROCK_CACHE_TABLE).batch_writer() as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+        except Exception as e:
+            print(f"Error writing score store: {e}")
+
+
+def remember_score(key: str, skills_hash: str, match: Dict):
+    """Insert into the in-process score store, evicting the least recently used entries"""
+    with _score_cache_lock:
+        _score_cache[key] = {'skills_hash': skills_hash, 'match': match}
+        _score_cache.move_to_end(key)
+        while len(_score_cache) > SCORE_CACHE_MAX_ENTRIES:
+            _score_cache.popitem(last=False)
+
+
+def score_resumes_concurrently(jd_requirements: Dict, resumes: List[Dict],
+                               max_workers: Optional[int] = None,
+                               batched: Optional[bool] = None,
+                               on_match: Optional[Callable[[Dict], None]] = None,
+                               top_k: Optional[int] = None,
+                               known_scores: Optional[List[float]] = None) -> List[Dict]:
+    """
+    Score resumes against the JD with at most max_workers Bedrock calls in flight.
+    In batched mode each call scores a whole batch of resumes.
+    Results are returned in the same order as the input resumes; on_match, if
+    given, sees each one on the calling thread as soon as its call completes.
+    
+    With top_k (and RANKING_EARLY_STOP_ENABLED), resumes are sent in descending
+    order of match_score_upper_bound and no further calls are made once the k-th
+    best score so far (known_scores included) beats every remaining bound; the
+    skipped resumes are left out of the results. Until then as many calls are in
+    flight as without top_k.
+    """
+    if not resumes:
+        return []
+    
+    if batched is None:
+        batched = BATCH_SCORING_ENABLED
+    
+    def score_one(resume: Dict) -> Dict:
+        try:
+            return semantic_match_with_ai(jd_requirements, resume)
+        except Exception as e:
+            print(f"Error scoring {resume.get('resume_id')}: {str(e)}")
+            return simple_match_result(jd_requirements, resume)
+    
+    def score_single(unit: List[Dict]) -> List[Dict]:
+        return [score_one(unit[0])]
+    
+    def score_batch(batch: List[Dict]) -> List[Dict]:
+        if len(batch) == 1:
+            return [score_one(batch[0])]
+        try:
+            return semantic_match_batch_with_ai(jd_requirements, batch)
+        except Exception as e:
+            print(f"Error scoring batch of {len(batch)}: {str(e)}")
+            return [score_one(resume) for resume in batch]
+    
+    required_skills = jd_requirements.get('skills', [])
+    early_stop = bool(top_k) and RANKING_EARLY_STOP_ENABLED
+    ordered = resumes
+    bounds = {}
+    if early_stop:
+        bounds = {r['resume_id']: match_score_upper_bound(required_skills, r.get('skills', [])) for r in resumes}
+        ordered = sorted(resumes, key=lambda r: bounds[r['resume_id']], reverse=True)
+    
+    if batched:
+        units = plan_scoring_batches(required_skills, ordered)
+        work = score_batch
+    else:
+        units = [[resume] for resume in ordered]
+        work = score_single
+    
+    workers = max(1, min(max_workers or MAX_SCORING_CONCURRENCY, len(units)))
+    
+    # Min-heap of the best top_k scores so far
+    best = []
+    for score in known_scores if early_stop and known_scores else []:
+        keep_best(best, score, top_k)
+    
+    def settled(unit: List[Dict]) -> bool:
+        """True once nothing in unit (or after it, bounds only fall) can enter the top_k"""
+        return early_stop and len(best) >= top_k and best[0] > bounds[unit[0]['resume_id']]
+    
+    def completed(result: List[Dict]) -> List[Dict]:
+        for match in result:
+            if early_stop:
+                keep_best(best, match['score'], top_k)
+                if match['score'] > bounds.get(match['resume_id'], 100):
+                    print(f"Score {match['score']} of {match['resume_id']} is above its bound "
+                          f"{bounds[match['resume_id']]}; consider raising RANKING_UNRELATED_CREDIT")
+                    trace_count('ranking_bound_violations')
+            if on_match:
+                on_match(match)
+        return result
+    
+    results = {}
+    if workers == 1:
+        for i, unit in enumerate(units):
+            if settled(unit):
+                break
+            results[i] = completed(work(unit))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+            next_unit = 0
+            while True:
+                while next_unit < len(units) and len(in_flight) < workers and not settled(units[next_unit]):
+                    in_flight[executor.submit(work, units[next_unit])] = next_unit
+                    next_unit += 1
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[in_flight.pop(future)] = completed(future.result())
+    
+    scored = {match['resume_id']: match for result in results.values() for match in result}
+    skipped = [unit for i, unit in enumerate(units) if i not in results]
+    if skipped:
+        print(f"Early stop: top {top_k} settled after {len(results)} of {len(units)} scoring calls; "
+              f"skipped {len(skipped)} calls for {sum(len(unit) for unit in skipped)} resumes")
+        trace_count('ranking_calls_skipped', len(skipped))
+        trace_count('ranking_resumes_skipped', sum(len(unit) for unit in skipped))
+    return [scored[resume['resume_id']] for resume in resumes if resume['resume_id'] in scored]
+
+
+def keep_best(best: List[float], score: float, top_k: int):
+    """Push score onto a min-heap holding the top_k largest scores"""
+    if len(best) < top_k:
+        heapq.heappush(best, score)
+    elif score > best[0]:
+        heapq.heapreplace(best, score)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def plan_scoring_batches(required_skills: List[str], resumes: List[Dict],
+                         max_batch: Optional[int] = None,
+                         token_budget: Optional[int] = None) -> List[List[Dict]]:
+    """
+    Split resumes into consecutive batches whose prompt fits the token budget.
+    The instruction block and required skills are counted once per batch.
+    """
+    max_batch = max_batch or BATCH_MAX_RESUMES
+    token_budget = token_budget or BATCH_PROMPT_TOKEN_BUDGET
+    
+    fixed_cost = estimate_tokens(BATCH_MATCH_INSTRUCTIONS) + estimate_tokens(', '.join(required_skills))
+    
+    batches = []
+    current = []
+    used = fixed_cost
+    for resume in resumes:
+        cost = estimate_tokens(format_batch_candidate(resume))
+        if current and (len(current) >= max_batch or used + cost > token_budget):
+            batches.append(current)
+            current = []
+            used = fixed_cost
+        current.append(resume)
+        used += cost
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def simple_match_result(jd_requirements: Dict, resume: Dict) -> Dict:
+    """Build a match result without Bedrock, used when AI scoring fails"""
+    return dict(taxonomy_match_result(jd_requirements, resume), explanation=FALLBACK_EXPLANATION)
+
+
+def calculate_match_score_simple(required: List[str], resume: List[str]) -> float:
+    """Simple fallback matching"""
+    if not required:
+        return 0.0
+    req_set = set(s.lower() for s in required)
+    res_set = set(s.lower() for s in resume)
+    matched = len(req_set.intersection(res_set))
+    return round((matched / len(req_set)) * 100, 2)
+
+
+def normalize_skill(skill: str) -> str:
+    """Normalize a skill name for comparison"""
+    return str(skill).lower().strip()
+
+
+SKILL_BITS_HEADER = struct.Struct('<HH')  # vocabulary version, skills outside the vocabulary
+
+
+def load_skill_vocabulary() -> Dict:
+    """
+    Load the versioned skill vocabulary. It is append-only: a skill keeps its bit
+    position for good and new skills go at the end with a version bump, so bitsets
+    written under an older version stay valid. Without it every skill is encoded
+    as outside the vocabulary, which is slower but still correct.
+    """
+    global _skill_vocabulary
+    if _skill_vocabulary is not None:
+        return _skill_vocabulary
+    
+    try:
+        with open(SKILL_VOCABULARY_PATH, encoding='utf-8') as f:
+            raw = json.load(f)
+        skills = [normalize_skill(skill) for skill in raw['skills']]
+        version = int(raw['version'])
+    except Exception as e:
+        print(f"WARNING: could not load skill vocabulary from {SKILL_VOCABULARY_PATH}: {e}. "
+              "Every skill will be encoded as outside the vocabulary: prefiltering stays correct but runs slower.")
+        skills, version = [], 0
+    
+    _skill_vocabulary = {
+        'version': version,
+        'positions': {skill: i for i, skill in enumerate(skills)},
+        # Bitset bytes, padded to whole 64-bit words
+        'width': (len(skills) + 63) // 64 * 8
+    }
+    return _skill_vocabulary
+
+
+def encode_skill_bits(skills: List[str]) -> bytes:
+    """
+    Pack a resume's normalized skills as a header (vocabulary version, count of
+    skills outside the vocabulary) followed by a little-endian bitset with one
+    bit per vocabulary skill. Stored as the skill_bits Binary attribute.
+    """
+    vocabulary = load_skill_vocabulary()
+    mask = 0
+    outside = 0
+    for skill in index_skill_keys(skills):
+        position = vocabulary['positions'].get(skill)
+        if position is None:
+            outside += 1
+        else:
+            mask |= 1 << position
+    return SKILL_BITS_HEADER.pack(vocabulary['version'], min(outside, 0xFFFF)) + mask.to_bytes(vocabulary['width'], 'little')
+
+
+def decode_skill_bits(blob) -> Optional[Tuple[bytes, int]]:
+    """
+    Bitset of a stored skill_bits at the current vocabulary width, and the count
+    of skills outside the vocabulary. None when it has to be re-encoded from the
+    skills: missing, written under a newer vocabulary, or under an older one
+    with skills outside it (they may have a bit by now).
+    """
+    if blob is None:
+        return None
+    raw = bytes(blob.value) if hasattr(blob, 'value') else bytes(blob)
+    if len(raw) < SKILL_BITS_HEADER.size:
+        return None
+    
+    version, outside = SKILL_BITS_HEADER.unpack_from(raw)
+    vocabulary = load_skill_vocabulary()
+    if version > vocabulary['version'] or (version < vocabulary['version'] and outside):
+        return None
+    bits = raw[SKILL_BITS_HEADER.size:SKILL_BITS_HEADER.size + vocabulary['width']]
+    return bits.ljust(vocabulary['width'], b'\0'), outside
+
+
+def build_skill_matrix(resumes: List[Dict]) -> Dict:
+    """
+    Stack the resumes' skill bitsets into one contiguous (resumes x words) uint64
+    array. Resumes stored without a usable skill_bits are encoded from their
+    skills; skills outside the vocabulary are kept in a small skill -> rows map.
+    """
+    import numpy as np
+    
+    vocabulary = load_skill_vocabulary()
+    rows = []
+    outside = {}
+    for i, resume in enumerate(resumes):
+        decoded = decode_skill_bits(resume.get('skill_bits'))
+        if decoded is None:
+            decoded = decode_skill_bits(encode_skill_bits(resume.get('skills', [])))
+        bits, outside_count = decoded
+        rows.append(bits)
+        if outside_count:
+            for skill in index_skill_keys(resume.get('skills', [])):
+                if skill not in vocabulary['positions']:
+                    outside.setdefault(skill, []).append(i)
+    
+    return {
+        'bits': np.frombuffer(b''.join(rows), dtype='<u8').reshape(len(resumes), vocabulary['width'] // 8),
+        'outside': {skill: np.asarray(indices, dtype=np.int64) for skill, indices in outside.items()},
+        'num_resumes': len(resumes)
+    }
+
+
+def skill_matrix(resumes: List[Dict]) -> Dict:
+    """build_skill_matrix, cached while the same catalog list is shortlisted again"""
+    if _skill_matrix_index['resumes'] is not resumes:
+        _skill_matrix_index.update(resumes=resumes, matrix=build_skill_matrix(resumes))
+    return _skill_matrix_index['matrix']
+
+
+def skill_overlap_counts(matrix: Dict, required_skills: List[str]):
+    """
+    Count, in one vectorized pass, how many required skills each resume has:
+    popcount(resume bits & query bits), plus the required skills outside the vocabulary
+    """
+    import numpy as np
+    
+    vocabulary = load_skill_vocabulary()
+    query = 0
+    outside = []
+    for skill in set(normalize_skill(s) for s in required_skills):
+        position = vocabulary['positions'].get(skill)
+        if position is None:
+            outside.append(skill)
+        else:
+            query |= 1 << position
+    
+    query = np.frombuffer(query.to_bytes(vocabulary['width'], 'little'), dtype='<u8')
+    overlap = popcount_rows(matrix['bits'] & query)
+    for skill in outside:
+        if skill in matrix['outside']:
+            overlap[matrix['outside'][skill]] += 1
+    return overlap.astype(np.int32)
+
+
+def popcount_rows(words):
+    """Set bits in each row of a uint64 matrix"""
+    import numpy as np
+    
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def migrate_skill_vectors() -> Dict:
+    """
+    Write skill_bits for resumes stored without one, or whose bitset does not
+    decode under the current vocabulary. Safe to re-run. Reports the most common
+    skills outside the vocabulary, candidates for its next version.
+    """
+    vocabulary = load_skill_vocabulary()
+    table = dynamodb.Table(DYNAMODB_TABLE)
+    outside = {}
+    summary = {'vocabulary_version': vocabulary['version'], 'resumes': 0, 'updated': 0, 'errors': 0}
+    
+    def update(item: Dict) -> bool:
+        try:
+            with span('dynamodb_update'):
+                table.update_item(
+                    Key={'resume_id': item['resume_id']},
+                    UpdateExpression='SET skill_bits = :bits',
+                    ConditionExpression='attribute_exists(resume_id)',
+                    ExpressionAttributeValues={':bits': encode_skill_bits(item.get('skills', []))}
+                )
+            return True
+        except Exception as e:
+            print(f"Error migrating {item['resume_id']}: {e}")
+            return False
+    
+    with ThreadPoolExecutor(max_workers=MAX_SCORING_CONCURRENCY) as executor:
+        for page in iter_resume_pages(attributes=['resume_id', 'skills', 'skill_bits']):
+            summary['resumes'] += len(page)
+            stale = [item for item in page if decode_skill_bits(item.get('skill_bits')) is None]
+            for ok in executor.map(update, stale):
+                summary['updated' if ok else 'errors'] += 1
+            for item in page:
+                for skill in index_skill_keys(item.get('skills', [])):
+                    if skill not in vocabulary['positions']:
+                        outside[skill] = outside.get(skill, 0) + 1
+    
+    summary['outside_vocabulary'] = dict(sorted(outside.items(), key=lambda kv: -kv[1])[:25])
+    print(f"Migrated skill vectors: {summary}")
+    return summary
+
+
+def prefilter_resumes(required_skills: List[str], resumes: List[Dict],
+                      top_k: Optional[int] = None, min_overlap: Optional[int] = None,
+                      matrix: Optional[Dict] = None) -> List[Dict]:
+    """
+    Shortlist the top_k resumes by number of shared skills with the JD.
+    Resumes with fewer than min_overlap shared skills are dropped.
+    Ties keep catalog order so the shortlist is deterministic.
+    """
+    import numpy as np
+    
+    top_k = PREFILTER_TOP_K if top_k is None else top_k
+    min_overlap = PREFILTER_MIN_OVERLAP if min_overlap is None else min_overlap
+    
+    if not resumes or not required_skills:
+        return []
+    
+    if matrix is None:
+        matrix = skill_matrix(resumes)
+    
+    overlap = skill_overlap_counts(matrix, expand_skills(required_skills))
+    eligible = np.flatnonzero(overlap >= min_overlap)
+    eligible = eligible[np.argsort(-overlap[eligible], kind='stable')]
+    if top_k > 0:
+        eligible = eligible[:top_k]
+    
+    return [resumes[i] for i in eligible]
+
+
+def retrieve_candidates(jd_text: str, jd_requirements: Dict) -> Tuple[List[Dict], int]:
+    """
+    Pick the resumes to score for a JD, without any LLM calls.
+    RETRIEVAL_MODE selects skill-overlap shortlisting ('skills'), the same over
+    only the JD role's partitions of the role index ('role'), embedding cosine
+    top-K over the catalog ('embedding'), or the union of skills and embedding
+    ('hybrid'). Returns the candidates and the size of the pool they were drawn from.
+    """
+    skills = jd_requirements.get('skills', [])
+    catalog = cached_catalog()
+    
+    if RETRIEVAL_MODE == 'role':
+        roles = jd_role_partitions(jd_requirements.get('role', ''))
+        if roles:
+            try:
+                if catalog is not None:
+                    candidates, pool_size = shortlist_catalog(skills, catalog, roles)
+                else:
+                    resumes = get_resumes_for_roles(roles)
+                    candidates, pool_size = prefilter_resumes(skills, resumes), len(resumes)
+                if len(candidates) >= ROLE_MIN_CANDIDATES:
+                    return candidates, pool_size
+                print(f"Role retrieval: {len(candidates)} candidates in {roles}, widening to all roles")
+            except Exception as e:
+                print(f"Error querying {ROLE_INDEX}, widening to all roles: {e}")
+    
+    if RETRIEVAL_MODE in ('embedding', 'hybrid') and catalog is None:
+        catalog = get_all_resumes()
+    
+    if RETRIEVAL_MODE == 'embedding':
+        return embedding_search(jd_embedding_text(jd_text, skills), catalog), len(catalog)
+    
+    if catalog is not None:
+        candidates, pool_size = shortlist_catalog(skills, catalog)
+    else:
+        resumes = get_resumes_for_skills(skills)
+        candidates, pool_size = prefilter_resumes(skills, resumes), len(resumes)
+    
+    if RETRIEVAL_MODE == 'hybrid':
+        seen = {r['resume_id'] for r in candidates}
+        for resume in embedding_search(jd_embedding_text(jd_text, skills), catalog, HYBRID_EMBEDDING_TOP_K):
+            if resume['resume_id'] not in seen:
+                candidates.append(resume)
+                seen.add(resume['resume_id'])
+        return candidates, len(catalog)
+    
+    return candidates, pool_size
+
+
+def shortlist_catalog(skills: List[str], catalog: List[Dict],
+                      roles: Optional[List[str]] = None) -> Tuple[List[Dict], int]:
+    """
+    Shortlist a fresh cached catalog as a whole, so its skill matrix is built once
+    per catalog snapshot rather than for a filtered copy on every request.
+    Resumes sharing no skill never pass the overlap threshold, so the result is
+    the same as prefiltering the resumes found through the skill index. The pool
+    is the whole catalog, or with roles only the resumes in those roles.
+    """
+    min_overlap = max(1, PREFILTER_MIN_OVERLAP)
+    if roles is None:
+        return prefilter_resumes(skills, catalog, min_overlap=min_overlap), len(catalog)
+    
+    wanted = set(roles)
+    ranked = [r for r in prefilter_resumes(skills, catalog, top_k=0, min_overlap=min_overlap) if r.get('role') in wanted]
+    if PREFILTER_TOP_K > 0:
+        ranked = ranked[:PREFILTER_TOP_K]
+    return ranked, sum(1 for r in catalog if r.get('role') in wanted)
+
+
+def resume_embedding_text(skills: List[str], resume_text: str) -> str:
+    """Text embedded for a resume: its skill list plus the start of its extracted text"""
+    return ' '.join(skills) + '\n' + resume_text[:EMBEDDING_TEXT_CHARS]
+
+
+def jd_embedding_text(jd_text: str, skills: List[str]) -> str:
+    """Text embedded for a job description query"""
+    return ' '.join(skills) + '\n' + jd_text[:EMBEDDING_TEXT_CHARS]
+
+
+def embed_text(text: str, dims: Optional[int] = None) -> bytes:
+    """
+    Embed text as a hashed character n-gram vector with sublinear term frequency,
+    L2-normalized and packed as little-endian float16. IDF weighting is applied at
+    search time from the catalog itself, so no corpus is needed at upload.
+    """
+    dims = dims or EMBEDDING_DIMS
+    counts = [0] * dims
+    normalized = ' ' + ' '.join(text.lower().split()) + ' '
+    for n in EMBEDDING_NGRAMS:
+        for i in range(len(normalized) - n + 1):
+            counts[zlib.crc32(normalized[i:i + n].encode('utf-8')) % dims] += 1
+    
+    weights = [1 + math.log(c) if c else 0.0 for c in counts]
+    norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+    return struct.pack(f'<{dims}e', *(w / norm for w in weights))
+
+
+def decode_embedding(blob) -> Optional[bytes]:
+    """Raw bytes of a stored embedding (boto3 returns Binary for B attributes)"""
+    if blob is None:
+        return None
+    raw = bytes(blob.value) if hasattr(blob, 'value') else bytes(blob)
+    return raw if len(raw) == EMBEDDING_DIMS * 2 else None
+
+
+def embedding_matrix(resumes: List[Dict]) -> Dict:
+    """
+    IDF-weighted, row-normalized embedding matrix for a catalog, cached while the
+    same catalog list is searched again. Resumes stored without an embedding
+    (uploaded before embeddings existed) are embedded from their skills.
+    """
+    import numpy as np
+    
+    if _embedding_index['resumes'] is resumes:
+        return _embedding_index
+    
+    rows = []
+    for resume in resumes:
+        raw = decode_embedding(resume.get('embedding'))
+        if raw is None:
+            raw = embed_text(resume_embedding_text(resume.get('skills', []), ''))
+        rows.append(raw)
+    
+    matrix = np.frombuffer(b''.join(rows), dtype='<f2').reshape(len(resumes), EMBEDDING_DIMS).astype(np.float32)
+    df = np.count_nonzero(matrix > 0, axis=0)
+    idf = (np.log((1 + len(resumes)) / (1 + df)) + 1).astype(np.float32)
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms > 0, norms, 1)
+    
+    _embedding_index.update(resumes=resumes, matrix=matrix, idf=idf)
+    return _embedding_index
+
+
+def embedding_search(query_text: str, resumes: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
+    """Cosine top-K resumes for a query; ties keep catalog order"""
+    import numpy as np
+    
+    top_k = top_k or EMBEDDING_TOP_K
+    if not resumes:
+        return []
+    
+    index = embedding_matrix(resumes)
+    query = np.frombuffer(embed_text(query_text), dtype='<f2').astype(np.float32) * index['idf']
+    norm = np.linalg.norm(query)
+    if not norm:
+        return []
+    
+    similarity = index['matrix'] @ (query / norm)
+    order = np.argsort(-similarity, kind='stable')[:top_k]
+    return [resumes[i] for i in order if similarity[i] > 0]
+
+
+def load_taxonomy() -> Optional[Dict]:
+    """
+    Load the versioned skill taxonomy and precompute lookups:
+    alias -> canonical skill, category -> all (transitive) members,
+    skill -> categories containing it, canonical skill -> surface forms.
+    """
+    global _taxonomy
+    if _taxonomy is not None:
+        return _taxonomy or None
+    
+    try:
+        with open(SKILL_TAXONOMY_PATH, encoding='utf-8') as f:
+            raw = json.load(f)
+        
+        aliases = {normalize_skill(k): normalize_skill(v) for k, v in raw.get('aliases', {}).items()}
+        canonical = lambda skill: aliases.get(normalize_skill(skill), normalize_skill(skill))
+        
+        direct = {canonical(category): {canonical(m) for m in members}
+                  for category, members in raw.get('categories', {}).items()}
+        
+        members = {}
+        def closure(category: str, seen: frozenset) -> set:
+            if category in members:
+                return members[category]
+            result = set()
+            for member in direct.get(category, ()):
+                result.add(member)
+                if member in direct and member not in seen:
+                    result |= closure(member, seen | {member})
+            members[category] = result
+            return result
+        
+        for category in direct:
+            closure(category, frozenset([category]))
+        
+        parents = {}
+        for category, category_members in members.items():
+            for member in category_members:
+                parents.setdefault(member, set()).add(category)
+        
+        surface = {}
+        for alias, target in aliases.items():
+            surface.setdefault(target, {target}).add(alias)
+        
+        _taxonomy = {
+            'version': raw.get('version', 'unknown'),
+            'weights': raw.get('weights', {}),
+            'aliases': aliases,
+            'direct': direct,
+            'members': members,
+            'parents': parents,
+            'sibling_excluded': {canonical(c) for c in raw.get('sibling_excluded', [])},
+            'surface': surface
+        }
+        print(f"Loaded skill taxonomy v{_taxonomy['version']}: {len(aliases)} aliases, {len(direct)} categories")
+    except Exception as e:
+        print(f"Error loading skill taxonomy: {e}")
+        _taxonomy = {}
+    
+    return _taxonomy or None
+
+
+def canonical_skill(skill: str, taxonomy: Optional[Dict] = None) -> str:
+    """Map a skill name onto its canonical taxonomy name"""
+    taxonomy = taxonomy or load_taxonomy() or {}
+    name = normalize_skill(skill)
+    return taxonomy.get('aliases', {}).get(name, name)
+
+
+def expand_skills(skills: List[str]) -> List[str]:
+    """
+    All surface forms that satisfy the given skills: the canonical names, their
+    aliases, and every member of a category. Used to retrieve candidates.
+    """
+    taxonomy = load_taxonomy()
+    if not taxonomy:
+        return index_skill_keys(skills)
+    
+    expanded = set()
+    for skill in skills:
+        name = canonical_skill(skill, taxonomy)
+        for related in {name} | taxonomy['members'].get(name, set()):
+            expanded |= taxonomy['surface'].get(related, {related})
+    return sorted(s for s in expanded if s)
+
+
+def match_skills_with_taxonomy(required: List[str], resume_skills: List[str]) -> Dict:
+    """
+    Score required skills against resume skills with no network calls.
+    Each required skill earns the best of:
+      exact            - the resume has the skill (after alias resolution)
+      category_member  - the skill is a category and the resume has a member
+      sibling          - the resume has a skill from the same narrow category
+      parent           - the resume only lists a category containing the skill
+    The score is the average credit as a percentage.
+    """
+    taxonomy = load_taxonomy()
+    if not taxonomy:
+        return {
+            'score': calculate_match_score_simple(required, resume_skills),
+            'matched_skills': [],
+            'missing_skills': []
+        }
+    
+    weights = taxonomy['weights']
+    have = sorted({canonical_skill(s, taxonomy) for s in resume_skills or [] if normalize_skill(s)})
+    have_set = set(have)
+    
+    seen = set()
+    total = 0.0
+    matched = []
+    missing = []
+    for skill in required:
+        name = canonical_skill(skill, taxonomy)
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        
+        credit, label = 0.0, None
+        if name in have_set:
+            credit, label = weights.get('exact', 1.0), skill
+        else:
+            candidates = []
+            
+            direct = taxonomy['direct'].get(name, ())
+            via = sorted((s for s in have if s in taxonomy['members'].get(name, ())), key=lambda s: (s not in direct, s))
+            if via:
+                candidates.append((weights.get('category_member', 0.9), f"{skill} ({via[0]})"))
+            
+            categories = taxonomy['parents'].get(name, set())
+            narrow = [c for c in categories if c not in taxonomy['sibling_excluded']]
+            via = [s for s in have if any(s in taxonomy['direct'].get(c, ()) for c in narrow)]
+            if via:
+                candidates.append((weights.get('sibling', 0.5), f"{skill} (~{via[0]})"))
+            
+            via = [s for s in have if s in categories]
+            if via:
+                candidates.append((weights.get('parent', 0.4), f"{skill} (~{via[0]})"))
+            
+            if candidates:
+                credit, label = max(candidates, key=lambda c: c[0])
+        
+        total += credit
+        if label:
+            matched.append(label)
+        else:
+            missing.append(skill)
+    
+    return {
+        'score': round(total / len(seen) * 100, 2) if seen else 0.0,
+        'matched_skills': matched,
+        'missing_skills': missing
+    }
+
+
+def match_score_upper_bound(required: List[str], resume_skills: List[str]) -> float:
+    """
+    Cheap ceiling on a resume's AI match score, used to order and cut off
+    Bedrock scoring. A required skill the taxonomy relates to the resume in any
+    way may earn full credit; any other at most RANKING_UNRELATED_CREDIT.
+    """
+    match = match_skills_with_taxonomy(required, resume_skills)
+    total = len(match['matched_skills']) + len(match['missing_skills'])
+    related = len(match['matched_skills']) / total if total else match['score'] / 100
+    return round(100 * (related + (1 - related) * RANKING_UNRELATED_CREDIT), 2)
+
+
+def taxonomy_match_result(jd_requirements: Dict, resume: Dict) -> Dict:
+    """Build a match result with the local taxonomy engine"""
+    required = jd_requirements.get('skills', [])
+    match = match_skills_with_taxonomy(required, resume.get('skills', []))
+    total = len(match['matched_skills']) + len(match['missing_skills'])
+    
+    explanation = f"Matched {len(match['matched_skills'])} of {total} required skills."
+    if match['missing_skills']:
+        explanation += f" Missing: {', '.join(match['missing_skills'][:5])}."
+    
+    return {
+        'resume_id': resume['resume_id'],
+        'role': resume.get('role', 'N/A'),
+        'score': match['score'],
+        's3_key': resume['s3_key'],
+        'matched_skills': match['matched_skills'],
+        'missing_skills': match['missing_skills'],
+        'explanation': explanation
+    }
+
+
+def explain_matches_with_ai(jd_requirements: Dict, matches: List[Dict],
+                            on_explanation: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    """
+    Use AI to write explanations for the matches that will be shown to the user.
+    The response is streamed and on_explanation, if given, is called with each
+    match as soon as its explanation is complete.
+    Scores are left untouched; on failure the local explanations are kept.
+    """
+    if not matches:
+        return matches
+    
+    candidates = '\n'.join(
+        f"- {m['resume_id']} (score {m['score']}%): matched {', '.join(m.get('matched_skills', [])) or 'none'}; "
+        f"missing {', '.join(m.get('missing_skills', [])) or 'none'}"
+        for m in matches
+    )
+    prompt = f"""A recruiter is matching candidates to a job description.
+
+Required Skills (from Job Description):
+{', '.join(jd_requirements.get('skills', []))}
+
+Candidates:
+{candidates}
+
+For each candidate, write a brief (2-3 sentence) explanation of the match quality,
+mentioning the strongest matches and the most important gaps.
+
+Return ONLY a JSON object mapping resume_id to explanation, e.g.:
+{{"resume_id": "explanation"}}"""
+    
+    by_id = {match['resume_id']: match for match in matches}
+    try:
+        for resume_id, explanation in iter_json_string_pairs(
+                invoke_bedrock_streaming(prompt, max_tokens=200 * len(matches))):
+            match = by_id.pop(resume_id, None)
+            if match is not None and explanation.strip():
+                match['explanation'] = explanation.strip()
+                if on_explanation:
+                    on_explanation(match)
+    except Exception as e:
+        print(f"Error generating explanations: {str(e)}")
+    
+    return matches
+
+
+JSON_STRING_PAIR = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def iter_json_string_pairs(parts: Iterator[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield each "key": "string" pair of a flat JSON object as soon as its closing
+    quote has streamed in, without waiting for the rest of the object
+    """
+    text = ''
+    position = 0
+    for part in parts:
+        text += part
+        for pair in JSON_STRING_PAIR.finditer(text, position):
+            position = pair.end()
+            yield json.loads(f'"{pair.group(1)}"'), json.loads(f'"{pair.group(2)}"')
+
+
+# Keep all existing helper functions below...
+def get_telegram_file(file_id: str) -> Optional[Dict]:
+    """Get file info from Telegram"""
+    if not BOT_TOKEN:
+        return None
+    
+    return telegram_api('getFile', {'file_id': file_id})
+
+
 def download_telegram_file(file_path: str) -> Optional[bytes]:
     """Download file from Telegram servers"""
     if not BOT_TOKEN:
         return None
     
-    http = urllib3.PoolManager()
-    url = f"https://api.telegram.org/file/bot{BOT_TOKEN}/{file_path}"
+    url = f"{TELEGRAM_API_URL}/file/bot{BOT_TOKEN}/{file_path}"
     
     try:
-        response = http.request('GET', url)
+        with span('telegram_download'):
+            response = telegram_http().request('GET', url)
         if response.status == 200:
             return response.data
         return None
@@ -548,44 +2479,95 @@ def download_telegram_file(file_path: str) -> Optional[bytes]:
         return None
 
 
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
-    """Extract text from PDF bytes"""
+def iter_pdf_pages(pdf_bytes: bytes, max_pages: Optional[int] = None,
+                   time_budget: Optional[float] = None) -> Iterator[str]:
+    """
+    Lazily yield the text of each PDF page, parsing a page only when it is requested.
+    Stops after max_pages pages or once time_budget seconds have passed.
+    """
+    import PyPDF2
+    import io
+    
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    time_budget = PDF_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+    deadline = time.monotonic() + time_budget
+    
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    for page_number, page in enumerate(pdf_reader.pages):
+        if page_number >= max_pages:
+            print(f"PDF page cap reached ({max_pages} pages)")
+            return
+        if time.monotonic() > deadline:
+            print(f"PDF time budget reached after {page_number} pages")
+            return
+        yield page.extract_text() or ''
+
+
+def extract_text_from_pdf(pdf_bytes: bytes, char_budget: Optional[int] = None) -> str:
+    """
+    Extract text from PDF bytes, stopping once char_budget characters are collected.
+    Page texts are joined once at the end instead of being concatenated repeatedly.
+    """
+    char_budget = PDF_TEXT_CHAR_BUDGET if char_budget is None else char_budget
     try:
-        import PyPDF2
-        import io
-        
-        pdf_file = io.BytesIO(pdf_bytes)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        chunks = []
+        collected = 0
+        with span('pdf_parse'):
+            for page_text in iter_pdf_pages(pdf_bytes):
+                chunks.append(page_text)
+                collected += len(page_text) + 1
+                if collected >= char_budget:
+                    break
         
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
+        return '\n'.join(chunks)[:char_budget].strip()
     except Exception as e:
         print(f"Error extracting text: {str(e)}")
         return ""
 
 
+ROLE_KEYWORDS = {
+    'DevOps Engineer': ['devops', 'site reliability', 'sre', 'platform engineer'],
+    'Cloud Engineer': ['cloud engineer', 'cloud architect', 'aws engineer', 'solutions architect'],
+    'Data Engineer': ['data engineer', 'data scientist', 'ml engineer', 'machine learning'],
+    'Full Stack Developer': ['full stack', 'fullstack', 'full-stack'],
+    'Backend Developer': ['backend', 'back-end', 'server-side'],
+    'Frontend Developer': ['frontend', 'front-end', 'ui developer'],
+}
+DEFAULT_ROLE = 'Software Engineer'
+# Roles whose candidates often fit each other's JDs
+ADJACENT_ROLES = {
+    'DevOps Engineer': ['Cloud Engineer'],
+    'Cloud Engineer': ['DevOps Engineer'],
+    'Data Engineer': ['Backend Developer'],
+    'Full Stack Developer': ['Backend Developer', 'Frontend Developer'],
+    'Backend Developer': ['Full Stack Developer'],
+    'Frontend Developer': ['Full Stack Developer'],
+}
+# Roles stored when none was detected (bot uploads) or given (API and bulk uploads)
+CATCH_ALL_ROLES = [DEFAULT_ROLE, 'General']
+
+
 def detect_role_from_text(text: str) -> str:
     """Auto-detect role from resume text"""
     text_lower = text.lower()
     
-    roles = {
-        'DevOps Engineer': ['devops', 'site reliability', 'sre', 'platform engineer'],
-        'Cloud Engineer': ['cloud engineer', 'cloud architect', 'aws engineer', 'solutions architect'],
-        'Data Engineer': ['data engineer', 'data scientist', 'ml engineer', 'machine learning'],
-        'Full Stack Developer': ['full stack', 'fullstack', 'full-stack'],
-        'Backend Developer': ['backend', 'back-end', 'server-side'],
-        'Frontend Developer': ['frontend', 'front-end', 'ui developer'],
-    }
-    
-    for role, keywords in roles.items():
+    for role, keywords in ROLE_KEYWORDS.items():
         for keyword in keywords:
             if keyword in text_lower:
                 return role
     
-    return 'Software Engineer'
+    return DEFAULT_ROLE
+
+
+def jd_role_partitions(jd_role: str) -> List[str]:
+    """
+    Role index partitions to read for a JD's role: the matching role, its adjacent
+    roles and the catch-all roles. Empty when the role is too vague to narrow on.
+    """
+    role = detect_role_from_text(jd_role or '')
+    if role == DEFAULT_ROLE:
+        return []
+    return [role] + ADJACENT_ROLES.get(role, []) + CATCH_ALL_ROLES
 
 
 def extract_skills_with_bedrock(resume_text: str) -> List[str]:
@@ -607,18 +2589,7 @@ Example: ["python", "aws", "docker", "kubernetes", "k8s", "ci/cd", "devops"]
 
 Skills:"""
 
-        response = bedrock_runtime.invoke_model(
-            modelId='anthropic.claude-3-haiku-20240307-v1:0',
-            body=json.dumps({
-                'anthropic_version': 'bedrock-2023-05-31',
-                'max_tokens': 1500,
-                'messages': [{'role': 'user', 'content': prompt}]
-            })
-        )
-        
-        response_body = json.loads(response['body'].read())
-        skills_text = response_body['content'][0]['text'].strip()
-        skills_text = skills_text.replace('```json', '').replace('```', '').strip()
+        skills_text = invoke_bedrock(prompt, max_tokens=1500)
         
         skills = json.loads(skills_text)
         
@@ -629,63 +2600,861 @@ Skills:"""
         
     except Exception as e:
         print(f"Bedrock error: {str(e)}")
-        return extract_skills_fallback(resume_text)
-
-
-def extract_skills_fallback(text: str) -> List[str]:
-    """Fallback skill extraction"""
-    common_skills = [
-        'python', 'java', 'javascript', 'typescript', 'go', 'golang', 'rust', 'c++', 'c#',
-        'aws', 'azure', 'gcp', 'cloud', 'docker', 'kubernetes', 'k8s', 'terraform', 'ansible',
-        'react', 'angular', 'vue', 'node', 'nodejs', 'django', 'flask', 'fastapi', 'spring',
-        'sql', 'mongodb', 'postgresql', 'mysql', 'dynamodb', 'redis',
-        'ci/cd', 'cicd', 'devops', 'jenkins', 'github actions', 'gitlab',
-        'git', 'github', 'linux', 'bash', 'prometheus', 'grafana', 'cloudwatch'
-    ]
+        return extract_skills_from_dictionary(resume_text)
+
+
+def load_skill_phrases() -> Dict:
+    """
+    Compile the skill dictionary (taxonomy skills and aliases plus SKILL_DICTIONARY_PATH)
+    into a token phrase table: token tuple -> canonical skill, with every proper prefix
+    recorded so matching can stop as soon as no longer phrase is possible.
+    """
+    global _skill_phrases
+    if _skill_phrases is not None:
+        return _skill_phrases
     
-    text_lower = text.lower()
-    return list(set([skill for skill in common_skills if skill in text_lower]))
+    taxonomy = load_taxonomy() or {}
+    forms = dict(taxonomy.get('aliases', {}))
+    for category, members in taxonomy.get('direct', {}).items():
+        for skill in members | {category}:
+            forms.setdefault(skill, skill)
+    
+    case_sensitive, ignore, version = [], set(), 'unknown'
+    try:
+        with open(SKILL_DICTIONARY_PATH, encoding='utf-8') as f:
+            raw = json.load(f)
+        for skill in raw.get('skills', []):
+            forms.setdefault(normalize_skill(skill), normalize_skill(skill))
+        for alias, skill in raw.get('aliases', {}).items():
+            forms.setdefault(normalize_skill(alias), canonical_skill(skill))
+        case_sensitive = raw.get('case_sensitive', [])
+        ignore = {normalize_skill(skill) for skill in raw.get('ignore', [])}
+        version = raw.get('version', version)
+    except Exception as e:
+        print(f"Error loading skill dictionary: {e}")
+    
+    for form, skill in list(forms.items()):
+        for variant in skill_spelling_variants(form):
+            forms.setdefault(variant, skill)
+    print(f"Loaded skill dictionary v{version}: {len(forms)} surface forms")
+    
+    # Ambiguous words ("Go", "R", "REST") only count when written exactly as listed
+    ambiguous = {form.lower() for form in case_sensitive}
+    phrases, prefixes, exact = {}, set(), {}
+    for form, skill in forms.items():
+        if form in ambiguous or skill in ignore:
+            continue
+        key = tuple(SKILL_TOKEN_PATTERN.findall(form))
+        if key:
+            phrases[key] = skill
+            prefixes.update(key[:i] for i in range(1, len(key)))
+    for form in case_sensitive:
+        exact[form] = forms.get(form.lower(), form.lower())
+    
+    _skill_phrases = {'phrases': phrases, 'prefixes': prefixes, 'exact': exact}
+    return _skill_phrases
+
+
+def skill_spelling_variants(form: str) -> Set[str]:
+    """
+    Other spellings resumes use for a dictionary form: separators dropped or spaced
+    out (node.js -> nodejs, node js; ci/cd -> cicd, ci cd) and words hyphenated
+    (machine learning -> machine-learning)
+    """
+    variants = {SKILL_SEPARATOR_PATTERN.sub('', form), SKILL_SEPARATOR_PATTERN.sub(' ', form)}
+    if ' ' in form:
+        variants.add(form.replace(' ', '-'))
+    return {variant for variant in variants if variant != form and len(variant) > 2}
 
 
-def send_telegram_message(chat_id: int, text: str, parse_mode: str = None):
-    """Send message to Telegram"""
+def extract_skills_from_dictionary(text: str) -> List[str]:
+    """
+    Extract canonical skills in one pass over the text's tokens, taking the longest
+    dictionary phrase at each position. Matching whole tokens means "go" does not
+    match "google" and "java" does not match "javascript".
+    """
+    table = load_skill_phrases()
+    phrases, prefixes, exact = table['phrases'], table['prefixes'], table['exact']
+    tokens = SKILL_TOKEN_PATTERN.findall(text)
+    lowered = [token.lower() for token in tokens]
+    
+    found = set()
+    i = 0
+    while i < len(lowered):
+        skill, end = None, i + 1
+        key = ()
+        for j in range(i, len(lowered)):
+            key += (lowered[j],)
+            if key in phrases:
+                skill, end = phrases[key], j + 1
+            if key not in prefixes:
+                break
+        if skill is None:
+            skill = exact.get(tokens[i])
+        if skill:
+            found.add(skill)
+        i = end
+    
+    return sorted(found)
+
+
+def telegram_http() -> urllib3.PoolManager:
+    """Shared keep-alive connection pool for the Telegram API, created on first use"""
+    global _telegram_http
+    if _telegram_http is None:
+        with _telegram_http_lock:
+            if _telegram_http is None:
+                _telegram_http = urllib3.PoolManager(
+                    maxsize=4,
+                    timeout=urllib3.Timeout(connect=TELEGRAM_CONNECT_TIMEOUT, read=TELEGRAM_READ_TIMEOUT),
+                    # Retry connection failures, 429s and 5xxs, but never a POST whose
+                    # response was lost: Telegram may already have delivered the message
+                    retries=urllib3.Retry(
+                        total=TELEGRAM_RETRIES,
+                        read=0,
+                        backoff_factor=0.5,
+                        status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=None,
+                        raise_on_status=False
+                    )
+                )
+    return _telegram_http
+
+
+def telegram_api(method: str, payload: Dict) -> Optional[Dict]:
+    """Call a Telegram Bot API method; returns its result, or None on failure"""
     if not BOT_TOKEN:
         print("No BOT_TOKEN")
-        return
+        return None
     
-    http = urllib3.PoolManager()
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+    url = f"{TELEGRAM_API_URL}/bot{BOT_TOKEN}/{method}"
+    try:
+        with span('telegram_api'):
+            response = telegram_http().request('POST', url, body=json.dumps(payload).encode('utf-8'),
+                                               headers={'Content-Type': 'application/json'})
+        data = json.loads(response.data.decode('utf-8'))
+    except Exception as e:
+        print(f"Error calling Telegram {method}: {e}")
+        return None
     
+    if not data.get('ok'):
+        print(f"Telegram {method} failed: {data.get('description')}")
+        return None
+    return data['result']
+
+
+def send_telegram_message(chat_id: int, text: str, parse_mode: str = None) -> Optional[int]:
+    """Send message to Telegram; returns its message_id"""
     payload = {'chat_id': chat_id, 'text': text}
     if parse_mode:
         payload['parse_mode'] = parse_mode
     
+    result = telegram_api('sendMessage', payload)
+    return result.get('message_id') if result else None
+
+
+def edit_telegram_message(chat_id: int, message_id: int, text: str, parse_mode: str = None) -> bool:
+    """Replace the text of a message the bot sent earlier"""
+    payload = {'chat_id': chat_id, 'message_id': message_id, 'text': text}
+    if parse_mode:
+        payload['parse_mode'] = parse_mode
+    
+    return telegram_api('editMessageText', payload) is not None
+
+
+class TelegramStatus:
+    """
+    A single status message for one request. The first update sends it and later
+    updates edit it in place, so progress and the result arrive as one message.
+    """
+    
+    def __init__(self, chat_id: int, message_id: Optional[int] = None):
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.text = None
+        self.updated_at = 0.0
+    
+    def progress(self, text: str, parse_mode: str = None):
+        """Intermediate step; skipped if the message was updated less than
+        TELEGRAM_PROGRESS_INTERVAL_SECONDS ago, since the next update replaces it anyway"""
+        if self.message_id is not None and time.monotonic() - self.updated_at < TELEGRAM_PROGRESS_INTERVAL_SECONDS:
+            return
+        self.update(text, parse_mode)
+    
+    def update(self, text: str, parse_mode: str = None):
+        """Show text now: results, errors and anything the user must see"""
+        # Telegram rejects edits that leave the message unchanged
+        if text == self.text:
+            return
+        
+        if self.message_id is None or not edit_telegram_message(self.chat_id, self.message_id, text, parse_mode):
+            self.message_id = send_telegram_message(self.chat_id, text, parse_mode=parse_mode)
+        self.text = text
+        self.updated_at = time.monotonic()
+
+
+class MatchLeaderboard:
+    """
+    Running leaderboard fed with match results as they are scored. Once the best
+    score clears the threshold it is shown at once; later changes to the top
+    three refine the message at the usual progress rate.
+    """
+    
+    def __init__(self, status: TelegramStatus, total: int, threshold: int = 75):
+        self.status = status
+        self.total = total
+        self.threshold = threshold
+        self.top = []
+        self.scored = 0
+        self.shown = None
+    
+    def add(self, match: Dict):
+        self.scored += 1
+        self.top = sorted(self.top + [match], key=lambda m: m['score'], reverse=True)[:3]
+        if self.top[0]['score'] < self.threshold:
+            return
+        
+        leaders = [(m['resume_id'], m['score']) for m in self.top]
+        if leaders == self.shown:
+            return
+        
+        msg = f"⏳ *Provisional best match* ({self.scored} of {self.total} scored)\n\n"
+        for i, m in enumerate(self.top, 1):
+            msg += f"{i}. *{m['resume_id']}* - {m['role']} - {m['score']}%\n"
+        
+        if self.shown is None:
+            self.status.update(msg, parse_mode='Markdown')
+        else:
+            self.status.progress(msg, parse_mode='Markdown')
+        self.shown = leaders
+
+
+def projection_kwargs(attributes: List[str]) -> Dict:
+    """Build ProjectionExpression kwargs, aliasing names since some (e.g. role) are reserved words"""
+    names = {f"#a{i}": attribute for i, attribute in enumerate(attributes)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
+
+def scan_pages(table_name: str, scan_kwargs: Dict,
+               stop: Optional[threading.Event] = None) -> Iterator[List[Dict]]:
+    """Yield every page of a (segment) scan, following LastEvaluatedKey"""
+    table = dynamodb.Table(table_name)
+    scan_kwargs = dict(scan_kwargs)
+    while not (stop and stop.is_set()):
+        with span('dynamodb_scan'):
+            response = table.scan(**scan_kwargs)
+        yield response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def iter_resume_pages(attributes: Optional[List[str]] = None,
+                      segments: Optional[int] = None,
+                      table_name: Optional[str] = None,
+                      filter_expression=None) -> Iterator[List[Dict]]:
+    """
+    Stream the resume catalog page by page.
+    With more than one segment, a parallel scan runs each Segment on its own
+    thread and pages are yielded as they arrive (order across segments is not fixed).
+    """
+    table_name = table_name or DYNAMODB_TABLE
+    segments = segments or CATALOG_SCAN_SEGMENTS
+    scan_kwargs = projection_kwargs(attributes or CATALOG_ATTRIBUTES)
+    if filter_expression is not None:
+        scan_kwargs['FilterExpression'] = filter_expression
+    
+    if segments <= 1:
+        yield from scan_pages(table_name, scan_kwargs)
+        return
+    
+    pages = queue.Queue()
+    stop = threading.Event()
+    
+    def scan_segment(segment: int):
+        try:
+            segment_kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=segments)
+            for page in scan_pages(table_name, segment_kwargs, stop):
+                pages.put(('page', page))
+            pages.put(('done', None))
+        except Exception as e:
+            pages.put(('error', e))
+    
+    executor = ThreadPoolExecutor(max_workers=segments)
     try:
-        http.request('POST', url, body=json.dumps(payload).encode('utf-8'),
-                    headers={'Content-Type': 'application/json'})
-    except Exception as e:
-        print(f"Error sending message: {e}")
+        for segment in range(segments):
+            executor.submit(scan_segment, segment)
+        
+        remaining = segments
+        while remaining:
+            kind, value = pages.get()
+            if kind == 'page':
+                yield value
+            elif kind == 'done':
+                remaining -= 1
+            else:
+                raise value
+    finally:
+        stop.set()
+        executor.shutdown(wait=False)
 
 
 def get_all_resumes() -> List[Dict]:
-    """Get all resumes from DynamoDB"""
+    """Get all resumes, served from the warm-container catalog cache"""
     try:
-        table = dynamodb.Table(DYNAMODB_TABLE)
-        response = table.scan()
-        return response.get('Items', [])
+        return get_catalog()
     except Exception as e:
         print(f"Error getting resumes: {e}")
         return []
 
 
+def get_catalog(now: Optional[float] = None) -> List[Dict]:
+    """
+    Return the resume catalog sorted by resume_id.
+    Within CATALOG_CACHE_TTL_SECONDS the cached copy is served as is. After that only
+    items created since the last refresh are fetched, from the created-day index, and
+    every CATALOG_FULL_RELOAD_SECONDS the catalog is reloaded in full to pick up deletes.
+    """
+    now = time.monotonic() if now is None else now
+    refresh_started = datetime.utcnow()
+    
+    with _catalog_lock:
+        cache = _catalog_cache
+        if cache['refreshed_at'] is not None and now - cache['refreshed_at'] < CATALOG_CACHE_TTL_SECONDS:
+            cache['hits'] += 1
+            trace_count('catalog_cache_hits')
+            return cache['ordered']
+        
+        cache['misses'] += 1
+        trace_count('catalog_cache_misses')
+        started = time.perf_counter()
+        full = cache['full_loaded_at'] is None or now - cache['full_loaded_at'] >= CATALOG_FULL_RELOAD_SECONDS
+        
+        if full:
+            resumes = {item['resume_id']: item for page in iter_resume_pages() for item in page}
+            cache['full_loaded_at'] = now
+            cache['full_reloads'] += 1
+        else:
+            resumes = dict(cache['resumes'])
+            for item in get_resumes_created_since(refresh_from(cache['watermark']), refresh_started):
+                resumes[item['resume_id']] = item
+            cache['incremental_refreshes'] += 1
+        
+        cache['resumes'] = resumes
+        cache['ordered'] = sorted(resumes.values(), key=lambda r: r['resume_id'])
+        # Items written from here on have a later created_at, so the next refresh only needs the days since
+        cache['watermark'] = refresh_started.isoformat()
+        cache['refreshed_at'] = now
+        cache['last_refresh_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        
+        print(f"Catalog cache {'full reload' if full else 'incremental refresh'}: "
+              f"{json.dumps(catalog_cache_stats(locked=True))}")
+        return cache['ordered']
+
+
+def get_resumes_created_since(since: str, until: datetime) -> List[Dict]:
+    """
+    Resumes with created_at >= since: one Query per UTC day partition of the
+    created-day index from since to until. Falls back to a filtered scan if
+    the index cannot be queried.
+    """
+    from boto3.dynamodb.conditions import Attr, Key
+    
+    try:
+        day = datetime.fromisoformat(since).date()
+        table = dynamodb.Table(DYNAMODB_TABLE)
+        items = []
+        while day <= until.date():
+            query_kwargs = projection_kwargs(CATALOG_ATTRIBUTES)
+            query_kwargs.update(
+                IndexName=CREATED_DAY_INDEX,
+                KeyConditionExpression=Key('created_day').eq(day.isoformat()) & Key('created_at').gte(since)
+            )
+            while True:
+                with span('dynamodb_query'):
+                    response = table.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            day += timedelta(days=1)
+        return items
+    except Exception as e:
+        print(f"Error querying {CREATED_DAY_INDEX}, falling back to a filtered scan: {e}")
+        return [item for page in iter_resume_pages(filter_expression=Attr('created_at').gte(since)) for item in page]
+
+
+def refresh_from(watermark: str) -> str:
+    """
+    Lower bound for an incremental refresh. Goes back CATALOG_REFRESH_OVERLAP_SECONDS
+    so items written late with an older created_at are still picked up.
+    """
+    if not watermark:
+        return ''
+    try:
+        start = datetime.fromisoformat(watermark) - timedelta(seconds=CATALOG_REFRESH_OVERLAP_SECONDS)
+        return start.isoformat()
+    except ValueError:
+        return watermark
+
+
+def remember_resume(item: Dict):
+    """Add a resume written by this container to the catalog cache"""
+    with _catalog_lock:
+        cache = _catalog_cache
+        if cache['refreshed_at'] is not None:
+            cache['resumes'][item['resume_id']] = {k: item[k] for k in CATALOG_ATTRIBUTES if k in item}
+            cache['ordered'] = sorted(cache['resumes'].values(), key=lambda r: r['resume_id'])
+
+
+def catalog_cache_stats(locked: bool = False) -> Dict:
+    """Hit/miss counters and refresh latency of the catalog cache"""
+    if not locked:
+        with _catalog_lock:
+            return catalog_cache_stats(locked=True)
+    
+    cache = _catalog_cache
+    return {
+        'size': len(cache['resumes']),
+        'hits': cache['hits'],
+        'misses': cache['misses'],
+        'incremental_refreshes': cache['incremental_refreshes'],
+        'full_reloads': cache['full_reloads'],
+        'last_refresh_ms': cache['last_refresh_ms'],
+        'watermark': cache['watermark']
+    }
+
+
+def cached_catalog() -> Optional[List[Dict]]:
+    """Return the cached catalog if it is still within its TTL, without refreshing it"""
+    with _catalog_lock:
+        cache = _catalog_cache
+        if cache['refreshed_at'] is None or time.monotonic() - cache['refreshed_at'] >= CATALOG_CACHE_TTL_SECONDS:
+            return None
+        cache['hits'] += 1
+        return cache['ordered']
+
+
+def index_skill_keys(skills: List[str]) -> List[str]:
+    """Canonical, de-duplicated skill keys used in the skill index"""
+    return sorted({normalize_skill(skill) for skill in skills or [] if normalize_skill(skill)})
+
+
+def update_skill_index(resume_id: str, skills: List[str]):
+    """Add resume_id to the inverted index entry of each of its skills"""
+    if not SKILL_INDEX_TABLE:
+        return
+    
+    try:
+        index_table = dynamodb.Table(SKILL_INDEX_TABLE)
+        for skill in index_skill_keys(skills):
+            with span('dynamodb_update'):
+                index_table.update_item(
+                    Key={'skill': skill},
+                    UpdateExpression='ADD resume_ids :ids',
+                    ExpressionAttributeValues={':ids': {resume_id}}
+                )
+        print(f"Indexed {resume_id} under {len(skills)} skills")
+    except Exception as e:
+        print(f"Error updating skill index: {e}")
+
+
+def batch_get_items(table_name: str, key_name: str, key_values: List[str],
+                    attributes: Optional[List[str]] = None) -> List[Dict]:
+    """BatchGetItem in chunks of 100 keys, retrying unprocessed keys"""
+    items = []
+    for start in range(0, len(key_values), 100):
+        request = {'Keys': [{key_name: value} for value in key_values[start:start + 100]]}
+        if attributes:
+            request.update(projection_kwargs(attributes))
+        
+        pending = {table_name: request}
+        while pending:
+            with span('dynamodb_batch_get'):
+                response = dynamodb.batch_get_item(RequestItems=pending)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            pending = response.get('UnprocessedKeys') or {}
+    
+    return items
+
+
+def get_resumes_for_skills(skills: List[str]) -> List[Dict]:
+    """
+    Load only resumes sharing at least one canonical skill with the given list,
+    reading the skill inverted index. Falls back to a full scan without an index.
+    (With a fresh catalog cache, retrieve_candidates uses shortlist_catalog instead.)
+    """
+    keys = expand_skills(skills)
+    
+    if not SKILL_INDEX_TABLE:
+        return get_all_resumes()
+    
+    try:
+        entries = batch_get_items(SKILL_INDEX_TABLE, 'skill', keys)
+        
+        resume_ids = set()
+        for entry in entries:
+            resume_ids.update(entry.get('resume_ids', set()))
+        
+        print(f"Skill index: {len(keys)} skills -> {len(resume_ids)} resumes")
+        resumes = batch_get_items(DYNAMODB_TABLE, 'resume_id', sorted(resume_ids), CATALOG_ATTRIBUTES)
+        return sorted(resumes, key=lambda r: r['resume_id'])
+    except Exception as e:
+        print(f"Error reading skill index, falling back to scan: {e}")
+        return get_all_resumes()
+
+
+def get_resumes_for_roles(roles: List[str]) -> List[Dict]:
+    """
+    Load the resumes stored under any of roles: one Query per role on the role
+    index, run in parallel
+    """
+    with ThreadPoolExecutor(max_workers=len(roles)) as executor:
+        partitions = list(executor.map(query_role_partition, roles))
+    
+    resumes = [resume for partition in partitions for resume in partition]
+    print(f"Role index: {len(roles)} roles -> {len(resumes)} resumes")
+    return sorted(resumes, key=lambda r: r['resume_id'])
+
+
+def query_role_partition(role: str) -> List[Dict]:
+    """Every resume in one role-index partition, following LastEvaluatedKey"""
+    from boto3.dynamodb.conditions import Key
+    
+    table = dynamodb.Table(DYNAMODB_TABLE)
+    query_kwargs = projection_kwargs(CATALOG_ATTRIBUTES)
+    query_kwargs.update(IndexName=ROLE_INDEX, KeyConditionExpression=Key('role').eq(role))
+    
+    items = []
+    while True:
+        with span('dynamodb_query'):
+            response = table.query(**query_kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def rebuild_skill_index() -> Dict:
+    """
+    Rebuild the skill inverted index from the metadata table.
+    Index entries for skills no resume has any more are deleted.
+    """
+    if not SKILL_INDEX_TABLE:
+        return {'error': 'SKILL_INDEX_TABLE_NAME is not configured'}
+    
+    index = {}
+    resume_count = 0
+    for page in iter_resume_pages(attributes=['resume_id', 'skills']):
+        for item in page:
+            resume_count += 1
+            for skill in index_skill_keys(item.get('skills', [])):
+                index.setdefault(skill, set()).add(item['resume_id'])
+    
+    stale = [
+        item['skill']
+        for page in iter_resume_pages(attributes=['skill'], table_name=SKILL_INDEX_TABLE)
+        for item in page
+        if item['skill'] not in index
+    ]
+    
+    index_table = dynamodb.Table(SKILL_INDEX_TABLE)
+    with span('dynamodb_batch_write'), index_table.batch_writer() as batch:
+        for skill, resume_ids in index.items():
+            batch.put_item(Item={'skill': skill, 'resume_ids': resume_ids})
+        for skill in stale:
+            batch.delete_item(Key={'skill': skill})
+    
+    summary = {'resumes': resume_count, 'skills': len(index), 'stale_removed': len(stale)}
+    print(f"Rebuilt skill index: {summary}")
+    return summary
+
+
+def add_stats_counter(stats_id: str, count: int) -> int:
+    """ADD count to the resume_count of one stats item, which ADD creates when missing; returns the new total"""
+    with span('dynamodb_update'):
+        response = dynamodb.Table(STATS_TABLE).update_item(
+            Key={'stats_id': stats_id},
+            UpdateExpression='ADD resume_count :n',
+            ExpressionAttributeValues={':n': count},
+            ReturnValues='UPDATED_NEW'
+        )
+    return int(response['Attributes']['resume_count'])
+
+
+def top_counts(counts: Dict[str, int]) -> Dict[str, int]:
+    """The STATS_TOP_COUNTERS largest counters, ties broken by name"""
+    return dict(sorted(((key, int(count)) for key, count in counts.items() if int(count) > 0),
+                       key=lambda item: (-item[1], item[0]))[:STATS_TOP_COUNTERS])
+
+
+def update_catalog_stats(resumes: int, role_counts: Dict[str, int], skill_counts: Dict[str, int]) -> List[str]:
+    """
+    ADD newly stored resumes to the materialized catalog stats. Each role and
+    skill has its own counter item (role#<role>, skill#<skill>); the catalog
+    item holds what /stats shows: resume_count, unique_skills and the top
+    STATS_TOP_COUNTERS roles and skills, so it stays small however many skills
+    the catalog has. Every counter is attempted; the ids that failed are
+    logged, counted in the trace and returned, as /stats drifts until
+    rebuild_catalog_stats runs.
+    """
+    if not STATS_TABLE:
+        return []
+    
+    counters = [(f"role#{role}", count) for role, count in role_counts.items()]
+    counters += [(f"skill#{skill}", count) for skill, count in skill_counts.items()]
+    
+    totals = {}
+    failed = []
+    error = None
+    for stats_id, count in counters:
+        try:
+            totals[stats_id] = add_stats_counter(stats_id, count)
+        except Exception as e:
+            failed.append(stats_id)
+            error = e
+    
+    # A skill counter whose total is what was just added was created by this update
+    new_skills = sum(1 for stats_id, count in counters if stats_id.startswith('skill#') and totals.get(stats_id) == count)
+    try:
+        update_catalog_summary(resumes, new_skills, totals)
+    except Exception as e:
+        failed.append(CATALOG_STATS_ID)
+        error = e
+    
+    if failed:
+        print(f"ERROR: {len(failed)} of {len(counters) + 1} catalog stats updates failed "
+              f"({', '.join(failed[:5])}{', ...' if len(failed) > 5 else ''}): {error}. "
+              "Run rebuild_catalog_stats to correct /stats")
+        trace_count('catalog_stats_write_failures', len(failed))
+    return failed
+
+
+def update_catalog_summary(resumes: int, new_skills: int, totals: Dict[str, int]):
+    """
+    ADD to resume_count and unique_skills of the catalog item and merge the new
+    counter totals into its top roles and skills. Merging is read-modify-write,
+    so the update is conditional on summary_version and retried when another
+    upload got there first.
+    """
+    table = dynamodb.Table(STATS_TABLE)
+    for _ in range(STATS_SUMMARY_ATTEMPTS):
+        with span('dynamodb_get'):
+            item = table.get_item(Key={'stats_id': CATALOG_STATS_ID}, ConsistentRead=True).get('Item', {})
+        version = int(item.get('summary_version', 0))
+        top = {'role': dict(item.get('top_roles', {})), 'skill': dict(item.get('top_skills', {}))}
+        for stats_id, total in totals.items():
+            kind, _, key = stats_id.partition('#')
+            # Counters only grow, so a larger value already in the summary is the newer one
+            top[kind][key] = max(int(top[kind].get(key, 0)), total)
+        
+        try:
+            with span('dynamodb_update'):
+                table.update_item(
+                    Key={'stats_id': CATALOG_STATS_ID},
+                    UpdateExpression='ADD resume_count :resumes, unique_skills :new_skills '
+                                     'SET top_roles = :roles, top_skills = :skills, summary_version = :next',
+                    ConditionExpression='attribute_not_exists(summary_version) OR summary_version = :version',
+                    ExpressionAttributeValues={':resumes': resumes, ':new_skills': new_skills,
+                                               ':roles': top_counts(top['role']), ':skills': top_counts(top['skill']),
+                                               ':version': version, ':next': version + 1}
+                )
+            return
+        except Exception as e:
+            if bedrock_error_code(e) != 'ConditionalCheckFailedException':
+                raise
+    raise RuntimeError(f"catalog summary changed on each of {STATS_SUMMARY_ATTEMPTS} attempts")
+
+
+def catalog_stats_from_item(item: Dict) -> Dict:
+    """Resume count, unique skill count and top roles and skills of the catalog item"""
+    return {
+        'resumes': int(item.get('resume_count', 0)),
+        'unique_skills': int(item.get('unique_skills', 0)),
+        'roles': top_counts(item.get('top_roles', {})),
+        'skills': top_counts(item.get('top_skills', {}))
+    }
+
+
+def count_catalog(resumes: Iterable[Dict]) -> Dict:
+    """Catalog stats counted from resume items, with every role and skill counter"""
+    stats = {'resumes': 0, 'roles': {}, 'skills': {}}
+    for resume in resumes:
+        stats['resumes'] += 1
+        role = resume.get('role', DEFAULT_ROLE)
+        stats['roles'][role] = stats['roles'].get(role, 0) + 1
+        for skill in index_skill_keys(resume.get('skills', [])):
+            stats['skills'][skill] = stats['skills'].get(skill, 0) + 1
+    return stats
+
+
+def summarize_catalog(stats: Dict) -> Dict:
+    """count_catalog stats in the shape get_catalog_stats returns"""
+    return {'resumes': stats['resumes'], 'unique_skills': len(stats['skills']),
+            'roles': top_counts(stats['roles']), 'skills': top_counts(stats['skills'])}
+
+
+def get_catalog_stats() -> Dict:
+    """
+    Catalog stats from the materialized catalog item: one GetItem whatever the
+    catalog size. Counted from the catalog when no stats table is configured
+    or the item has not been built yet.
+    """
+    if STATS_TABLE:
+        try:
+            with span('dynamodb_get'):
+                item = dynamodb.Table(STATS_TABLE).get_item(Key={'stats_id': CATALOG_STATS_ID}).get('Item')
+            if item:
+                return catalog_stats_from_item(item)
+            print("Catalog stats item missing, counting the catalog (run rebuild_catalog_stats)")
+        except Exception as e:
+            print(f"Error reading catalog stats: {e}")
+    return summarize_catalog(count_catalog(get_all_resumes()))
+
+
+def rebuild_catalog_stats() -> Dict:
+    """
+    Recount the catalog stats items from the metadata table, e.g. to backfill
+    them, and delete role and skill items no resume has any more.
+    Uploads that land during the scan may be counted twice or not at all.
+    """
+    if not STATS_TABLE:
+        return {'error': 'STATS_TABLE_NAME is not configured'}
+    
+    stats = count_catalog(item for page in iter_resume_pages(attributes=['resume_id', 'role', 'skills'])
+                          for item in page)
+    table = dynamodb.Table(STATS_TABLE)
+    with span('dynamodb_get'):
+        previous = table.get_item(Key={'stats_id': CATALOG_STATS_ID}).get('Item', {})
+    items = [{'stats_id': CATALOG_STATS_ID, 'resume_count': stats['resumes'], 'unique_skills': len(stats['skills']),
+              'top_roles': top_counts(stats['roles']), 'top_skills': top_counts(stats['skills']),
+              # A new version makes summary merges that read the old item retry against this one
+              'summary_version': int(previous.get('summary_version', 0)) + 1}]
+    items += [{'stats_id': f"role#{role}", 'resume_count': count} for role, count in stats['roles'].items()]
+    items += [{'stats_id': f"skill#{skill}", 'resume_count': count} for skill, count in stats['skills'].items()]
+    current = {item['stats_id'] for item in items}
+    stale = [item['stats_id'] for page in scan_pages(STATS_TABLE, projection_kwargs(['stats_id'])) for item in page
+             if item['stats_id'].partition('#')[0] in ('role', 'skill') and item['stats_id'] not in current]
+    
+    with span('dynamodb_batch_write'), table.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+        for stats_id in stale:
+            batch.delete_item(Key={'stats_id': stats_id})
+    
+    summary = {'resumes': stats['resumes'], 'roles': len(stats['roles']), 'skills': len(stats['skills']),
+               'stale_removed': len(stale)}
+    print(f"Rebuilt catalog stats: {summary}")
+    return summary
+
+
+def clip_text(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis"""
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+def list_cursor_id(page: int) -> str:
+    return f"list#{page}"
+
+
+def get_resume_page(page: int) -> Dict:
+    """
+    One page of LIST_PAGE_SIZE resumes, read with Scan Limit/ExclusiveStartKey.
+    The resume_id each page starts after is kept in its own list#<page> item
+    of the stats table, fetched with the resume count in one BatchGetItem, so
+    paging costs the same however large the catalog is. A page with no cursor
+    yet walks the keys up to it once and remembers every page it passes.
+    """
+    known = {}
+    if STATS_TABLE:
+        keys = [CATALOG_STATS_ID] + ([list_cursor_id(page)] if page > 1 else [])
+        try:
+            known = {item['stats_id']: item for item in
+                     batch_get_items(STATS_TABLE, 'stats_id', keys, ['stats_id', 'resume_count', 'resume_id'])}
+        except Exception as e:
+            print(f"Error reading list cursor: {e}")
+    total = int(known[CATALOG_STATS_ID].get('resume_count', 0)) if CATALOG_STATS_ID in known else None
+    
+    remember = {}
+    start_after = None
+    if page > 1:
+        if list_cursor_id(page) in known:
+            start_after = known[list_cursor_id(page)]['resume_id']
+        else:
+            remember = walk_page_cursors(page)
+            if page not in remember:
+                return {'resumes': [], 'has_more': False, 'total': total}
+            start_after = remember[page]
+    
+    # One extra item tells whether another page follows; LastEvaluatedKey alone does
+    # not, since DynamoDB returns it whenever Limit is hit, even on the last page
+    scan_kwargs = projection_kwargs(['resume_id', 'role', 'skills'])
+    scan_kwargs['Limit'] = LIST_PAGE_SIZE + 1
+    if start_after:
+        scan_kwargs['ExclusiveStartKey'] = {'resume_id': start_after}
+    with span('dynamodb_scan'):
+        response = dynamodb.Table(DYNAMODB_TABLE).scan(**scan_kwargs)
+    resumes = response.get('Items', [])[:LIST_PAGE_SIZE + 1]
+    has_more = len(resumes) > LIST_PAGE_SIZE
+    resumes = resumes[:LIST_PAGE_SIZE]
+    
+    if has_more:
+        remember[page + 1] = resumes[-1]['resume_id']
+    if remember and STATS_TABLE:
+        remember_list_cursors(remember)
+    
+    return {'resumes': resumes, 'has_more': has_more, 'total': total}
+
+
+def walk_page_cursors(page: int) -> Dict[int, str]:
+    """
+    The resume_id each of pages 2..page starts after, reading keys only from
+    the start of the scan. Pages past the end of the catalog are left out.
+    """
+    table = dynamodb.Table(DYNAMODB_TABLE)
+    scan_kwargs = projection_kwargs(['resume_id'])
+    wanted = (page - 1) * LIST_PAGE_SIZE
+    cursors = {}
+    seen = 0
+    while seen < wanted:
+        scan_kwargs['Limit'] = wanted - seen
+        with span('dynamodb_scan'):
+            response = table.scan(**scan_kwargs)
+        for item in response.get('Items', [])[:wanted - seen]:
+            seen += 1
+            if seen % LIST_PAGE_SIZE == 0:
+                cursors[seen // LIST_PAGE_SIZE + 1] = item['resume_id']
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return cursors
+
+
+def remember_list_cursors(cursors: Dict[int, str]):
+    """Put one list#<page> item per cursor, each expiring LIST_CURSOR_TTL_SECONDS after it was last written"""
+    expires_at = int(time.time()) + LIST_CURSOR_TTL_SECONDS
+    try:
+        with span('dynamodb_batch_write'), dynamodb.Table(STATS_TABLE).batch_writer() as batch:
+            for page, resume_id in cursors.items():
+                batch.put_item(Item={'stats_id': list_cursor_id(page), 'resume_id': resume_id,
+                                     'expires_at': expires_at})
+    except Exception as e:
+        print(f"Error saving list cursors: {e}")
+
+
 def generate_presigned_url(s3_key: str) -> str:
     """Generate presigned URL"""
     try:
-        return s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': S3_BUCKET, 'Key': s3_key},
-            ExpiresIn=3600
-        )
+        with span('s3_presign'):
+            return s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': S3_BUCKET, 'Key': s3_key},
+                ExpiresIn=3600
+            )
     except Exception as e:
         print(f"Error generating URL: {e}")
         return ""
@@ -699,13 +3468,10 @@ def handle_direct_api(body: Dict):
     
     # Use AI for API calls too
     jd_requirements = extract_jd_requirements_with_ai(jd)
-    resumes = get_all_resumes()
+    candidates, _ = retrieve_candidates(jd, jd_requirements)
     
-    matches = []
-    for resume in resumes:
-        match_result = semantic_match_with_ai(jd_requirements, resume)
-        if match_result['score'] >= 75:
-            matches.append(match_result)
+    matches = [m for m in score_resumes(jd_requirements, candidates, top_k=5) if m['score'] >= 75]
+    print(f"Bedrock cache: {json.dumps(bedrock_cache_stats())}, invoker: {json.dumps(bedrock_invoker.snapshot())}")
     
     matches.sort(key=lambda x: x['score'], reverse=True)
     
@@ -715,6 +3481,9 @@ def handle_direct_api(body: Dict):
             'required_skills': jd_requirements.get('skills', [])
         })}
     
+    if MATCH_ENGINE == 'taxonomy':
+        explain_matches_with_ai(jd_requirements, matches[:5])
+    
     best = matches[0]
     return {'statusCode': 200, 'body': json.dumps({
         'best_match': {
@@ -726,4 +3495,18 @@ def handle_direct_api(body: Dict):
             'explanation': best.get('explanation', '')
         },
         'all_matches': matches[:5]
-    })}
\ No newline at end of file
+    })}
+
+
+if __name__ == '__main__':
+    import sys
+    
+    if sys.argv[1:] == ['rebuild-skill-index']:
+        print(json.dumps(rebuild_skill_index()))
+    elif sys.argv[1:] == ['migrate-skill-vectors']:
+        print(json.dumps(migrate_skill_vectors()))
+    elif sys.argv[1:] == ['rebuild-catalog-stats']:
+        print(json.dumps(rebuild_catalog_stats()))
+    else:
+        print("Usage: python lambda_function.py rebuild-skill-index | migrate-skill-vectors | rebuild-catalog-stats")
+        sys.exit(1)
@@ -4,11 +4,16 @@
 rm -rf package
 mkdir -p package
 
-# Install dependencies
-pip install -r requirements.txt -t package/
+# Install dependencies as Lambda (python3.11, x86_64) wheels, whatever the build host;
+# numpy is compiled, so a macOS or ARM wheel would fail to import on Lambda
+pip install -r requirements.txt -t package/ \
+    --platform manylinux2014_x86_64 --implementation cp --python-version 3.11 --only-binary=:all:
 
 # Copy Lambda code
-cp lambda_function.py package/
+cp lambda_function.py skill_taxonomy.json skill_dictionary.json skill_vocabulary.json package/
+
+# Precompile the handler; Lambda cannot write __pycache__ at runtime
+python3 -m compileall -q --invalidation-mode unchecked-hash package/lambda_function.py
 
 # Create zip
 cd package
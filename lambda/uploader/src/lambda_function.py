@@ -1,27 +1,262 @@
 import json
 import os
-import boto3
+import re
 import base64
+import hashlib
+import math
+import random
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List
-import PyPDF2
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import io
 
-# Initialize AWS clients
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+
+class LazyAWS:
+    """
+    Proxy for a boto3 client or resource, created on first attribute access
+    so that importing this module does not pay for boto3
+    """
+    _lock = threading.Lock()
+    
+    def __init__(self, kind: str, service: str, **kwargs):
+        self._kind = kind
+        self._service = service
+        self._kwargs = kwargs
+        self._instance = None
+    
+    def __getattr__(self, name):
+        if self._instance is None:
+            # boto3's default session is not thread-safe while creating clients
+            with LazyAWS._lock:
+                if self._instance is None:
+                    import boto3
+                    kwargs = dict(self._kwargs)
+                    if isinstance(kwargs.get('config'), dict):
+                        from botocore.config import Config
+                        kwargs['config'] = Config(**kwargs['config'])
+                    self._instance = getattr(boto3, self._kind)(self._service, **kwargs)
+        return getattr(self._instance, name)
+
+
+# Initialize AWS clients (lazily, on first use)
+s3_client = LazyAWS('client', 's3')
+dynamodb = LazyAWS('resource', 'dynamodb')
+# Retries happen in BedrockInvoker, which knows about throttling; botocore makes a single attempt
+bedrock_runtime = LazyAWS('client', 'bedrock-runtime', region_name='us-east-1',
+                          config={'retries': {'mode': 'standard', 'max_attempts': 1}})
 
 # Environment variables
 S3_BUCKET = os.environ.get('S3_BUCKET_NAME')
 DYNAMODB_TABLE = os.environ.get('DYNAMODB_TABLE_NAME')
+SKILL_INDEX_TABLE = os.environ.get('SKILL_INDEX_TABLE_NAME', '')
+BEDROCK_CACHE_TABLE = os.environ.get('BEDROCK_CACHE_TABLE_NAME', '')
+STATS_TABLE = os.environ.get('STATS_TABLE_NAME', '')
+# Must match the matcher's, which reads the catalog stats item
+STATS_TOP_COUNTERS = 20
+STATS_SUMMARY_ATTEMPTS = 5
+BEDROCK_CACHE_ENABLED = os.environ.get('BEDROCK_CACHE_ENABLED', 'true').lower() == 'true'
+BEDROCK_CACHE_TTL_SECONDS = int(os.environ.get('BEDROCK_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+BEDROCK_MODEL_ID = 'anthropic.claude-3-haiku-20240307-v1:0'
+EMBEDDING_DIMS = int(os.environ.get('EMBEDDING_DIMS', '256'))
+EMBEDDING_TEXT_CHARS = 4000
+EMBEDDING_NGRAMS = (3, 4)
+CONTENT_HASH_INDEX = 'content-hash-index'
+PDF_TEXT_CHAR_BUDGET = int(os.environ.get('PDF_TEXT_CHAR_BUDGET', '20000'))
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', '30'))
+PDF_TIME_BUDGET_SECONDS = float(os.environ.get('PDF_TIME_BUDGET_SECONDS', '10'))
+SKILL_DATA_DIR = os.environ.get('SKILL_DATA_DIR', os.path.dirname(os.path.abspath(__file__)))
+SKILL_EXTRACTION_MODE = os.environ.get('SKILL_EXTRACTION_MODE', 'bedrock')  # bedrock | dictionary
+SKILL_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+|[^\sA-Za-z0-9]")
+# A separator inside a skill name that resumes also drop or space out (node.js, ci/cd, http/2)
+SKILL_SEPARATOR_PATTERN = re.compile(r"(?<=[a-z])[.\-/_](?=[a-z0-9])|(?<=[0-9])[.\-/_](?=[a-z])")
+BULK_PARSE_WORKERS = int(os.environ.get('BULK_PARSE_WORKERS', str(os.cpu_count() or 1)))
+BULK_BEDROCK_CONCURRENCY = int(os.environ.get('BULK_BEDROCK_CONCURRENCY', '4'))
+BULK_IO_CONCURRENCY = int(os.environ.get('BULK_IO_CONCURRENCY', '16'))
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', '100'))
+BULK_WRITE_ATTEMPTS = 4
+# Optional per-container pacing, as in the matcher; 0 leaves it to AIMD and throttle retries
+BEDROCK_REQUESTS_PER_MINUTE = float(os.environ.get('BEDROCK_REQUESTS_PER_MINUTE', '0'))
+BEDROCK_TOKENS_PER_MINUTE = float(os.environ.get('BEDROCK_TOKENS_PER_MINUTE', '0'))
+BEDROCK_MAX_CONCURRENCY = int(os.environ.get('BEDROCK_MAX_CONCURRENCY', str(BULK_BEDROCK_CONCURRENCY)))
+BEDROCK_MAX_ATTEMPTS = int(os.environ.get('BEDROCK_MAX_ATTEMPTS', '4'))
+BEDROCK_BACKOFF_BASE_SECONDS = float(os.environ.get('BEDROCK_BACKOFF_BASE_SECONDS', '0.5'))
+BEDROCK_BACKOFF_MAX_SECONDS = float(os.environ.get('BEDROCK_BACKOFF_MAX_SECONDS', '8'))
+BEDROCK_BREAKER_THRESHOLD = int(os.environ.get('BEDROCK_BREAKER_THRESHOLD', '5'))
+BEDROCK_BREAKER_COOLDOWN_SECONDS = float(os.environ.get('BEDROCK_BREAKER_COOLDOWN_SECONDS', '30'))
+BEDROCK_RETRYABLE_ERRORS = {'ThrottlingException', 'ServiceUnavailableException', 'ModelNotReadyException',
+                            'InternalServerException', 'ModelTimeoutException'}
+TRACE_ENABLED = os.environ.get('TRACE_ENABLED', 'true').lower() == 'true'
+TRACE_NAMESPACE = os.environ.get('TRACE_NAMESPACE', 'TalentMatch')
+LOG_EVENT_MAX_CHARS = int(os.environ.get('LOG_EVENT_MAX_CHARS', '2000'))  # 0 disables event logging
+LOG_FIELD_MAX_CHARS = int(os.environ.get('LOG_FIELD_MAX_CHARS', '200'))
+LOG_PARSE_MAX_CHARS = 64 * 1024
+LOG_REDACTED_FIELDS = {'resume_data', 'authorization', 'cookie'}
+
+# Trace of the running invocation (one per container at a time)
+_trace = None
+
+
+class Trace:
+    """
+    Per-invocation span timings and counters, printed as one CloudWatch EMF log line
+    """
+    
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.route = 'unknown'
+        self.started = time.perf_counter()
+        self.spans = {}  # name -> [count, total_ms, max_ms]
+        self.counters = {}
+        self.lock = threading.Lock()
+    
+    def add_span(self, name: str, elapsed_ms: float):
+        with self.lock:
+            entry = self.spans.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+    
+    def count(self, name: str, amount: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def record(self) -> Dict:
+        record = {
+            'Handler': self.handler,
+            'Route': self.route,
+            'duration_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'span_max_ms': {}
+        }
+        metrics = [{'Name': 'duration_ms', 'Unit': 'Milliseconds'}]
+        with self.lock:
+            for name, (count, total_ms, max_ms) in sorted(self.spans.items()):
+                record[f"{name}_ms"] = round(total_ms, 2)
+                record[f"{name}_count"] = count
+                record['span_max_ms'][name] = round(max_ms, 2)
+                metrics.append({'Name': f"{name}_ms", 'Unit': 'Milliseconds'})
+                metrics.append({'Name': f"{name}_count", 'Unit': 'Count'})
+            for name, value in sorted(self.counters.items()):
+                record[name] = value
+                metrics.append({'Name': name, 'Unit': 'Count'})
+        
+        record['_aws'] = {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': TRACE_NAMESPACE,
+                'Dimensions': [['Handler', 'Route']],
+                'Metrics': metrics
+            }]
+        }
+        return record
+
+
+class Span:
+    __slots__ = ('trace', 'name', 'started')
+    
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.trace.add_span(self.name, (time.perf_counter() - self.started) * 1000)
+
+
+class NoSpan:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        pass
+
+
+_no_span = NoSpan()
+
+
+def span(name: str):
+    """
+    Time a `with` block into the running trace; a shared no-op when tracing is disabled
+    """
+    trace = _trace
+    return Span(trace, name) if trace is not None else _no_span
+
+
+def trace_count(name: str, amount: int = 1):
+    trace = _trace
+    if trace is not None:
+        trace.count(name, amount)
+
+
+def start_trace(route: str):
+    global _trace
+    _trace = Trace('uploader') if TRACE_ENABLED else None
+    if _trace is not None:
+        _trace.route = route
+
+
+def finish_trace():
+    global _trace
+    trace, _trace = _trace, None
+    if trace is not None:
+        print(json.dumps(trace.record()))
+
+
+def redact_for_log(value):
+    """
+    Copy of an event with uploads and credentials masked and long strings truncated
+    """
+    if isinstance(value, dict):
+        return {
+            key: f"[redacted {len(str(item))} chars]" if str(key).lower() in LOG_REDACTED_FIELDS else redact_for_log(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_for_log(item) for item in value[:20]] + ([f"[{len(value) - 20} more]"] if len(value) > 20 else [])
+    if isinstance(value, str) and value[:1] in ('{', '['):
+        # Large JSON bodies are base64 uploads; they are summarized without being parsed
+        if len(value) > LOG_PARSE_MAX_CHARS:
+            return f"[{len(value)} chars of JSON not logged]"
+        try:
+            return redact_for_log(json.loads(value))
+        except ValueError:
+            pass
+    if isinstance(value, str) and len(value) > LOG_FIELD_MAX_CHARS:
+        return f"{value[:LOG_FIELD_MAX_CHARS]}...[{len(value)} chars]"
+    return value
+
+
+def log_event(event: Dict):
+    if LOG_EVENT_MAX_CHARS <= 0:
+        return
+    
+    text = json.dumps(redact_for_log(event), ensure_ascii=False, default=str)
+    if len(text) > LOG_EVENT_MAX_CHARS:
+        text = f"{text[:LOG_EVENT_MAX_CHARS]}...[{len(text)} chars]"
+    print(f"Received event: {text}")
+
 
 def lambda_handler(event, context):
     """
     Handle resume upload and processing
     """
+    start_trace('bulk_ingest' if 'bulk_ingest' in event else 'upload')
     try:
-        print(f"Received event: {json.dumps(event)}")
+        log_event(event)
+        
+        if 'bulk_ingest' in event:
+            return handle_bulk_ingest_event(event['bulk_ingest'])
         
         # Parse input
         body = json.loads(event.get('body', '{}'))
@@ -46,8 +281,26 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': f'Invalid base64 data: {str(e)}'})
             }
         
+        # Identical PDFs reuse the stored resume instead of being parsed and analyzed again
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        existing = find_resume_by_content_hash(digest)
+        if existing:
+            print(f"Duplicate upload of {existing['resume_id']} ({digest})")
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    'message': 'Resume already uploaded',
+                    'resume_id': existing['resume_id'],
+                    'skills_extracted': existing.get('skills', []),
+                    's3_key': existing.get('s3_key'),
+                    'role': existing.get('role'),
+                    'duplicate': True
+                })
+            }
+        
         # Extract text from PDF
-        resume_text = extract_text_from_pdf(pdf_bytes)
+        with span('pdf_parse'):
+            resume_text = extract_text_from_pdf(pdf_bytes)
         
         if not resume_text:
             return {
@@ -55,43 +308,46 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': 'Could not extract text from PDF'})
             }
         
-        print(f"Extracted resume text (first 500 chars): {resume_text[:500]}")
+        print(f"Extracted {len(resume_text)} characters of resume text")
         
-        # Use Bedrock to extract skills
-        skills = extract_skills_with_bedrock(resume_text)
+        # Use Bedrock (or only the skill dictionary) to extract skills
+        skills = extract_skills(resume_text)
         
         print(f"Extracted skills: {skills}")
         
         # Generate unique resume ID
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        resume_id = f"{role.lower().replace(' ', '_')}_{timestamp}"
+        resume_id = f"{role.lower().replace(' ', '_')}_{timestamp}_{digest[:8]}"
         
         # Upload to S3
-        s3_key = f"resumes/{role.lower().replace(' ', '-')}/{resume_name}"
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=s3_key,
-            Body=pdf_bytes,
-            ContentType='application/pdf'
-        )
+        s3_key = f"resumes/{role.lower().replace(' ', '-')}/{digest}.pdf"
+        upload_pdf(s3_key, pdf_bytes)
         
         print(f"Uploaded to S3: {s3_key}")
         
         # Save metadata to DynamoDB
         table = dynamodb.Table(DYNAMODB_TABLE)
-        table.put_item(
-            Item={
+        created_at = datetime.utcnow().isoformat()
+        with span('dynamodb_put'):
+            table.put_item(Item={
                 'resume_id': resume_id,
                 'role': role,
                 'skills': skills,
                 's3_key': s3_key,
-                'created_at': datetime.utcnow().isoformat(),
-                'filename': resume_name
-            }
-        )
+                'created_at': created_at,
+                'created_day': created_at[:10],
+                'filename': resume_name,
+                'content_hash': digest,
+                'skill_bits': encode_skill_bits(skills),
+                'embedding': embed_text(' '.join(skills) + '\n' + resume_text[:EMBEDDING_TEXT_CHARS])
+            })
         
         print(f"Saved metadata to DynamoDB: {resume_id}")
         
+        update_skill_index(resume_id, skills)
+        stats_failed = update_catalog_stats(
+            1, {role: 1}, dict.fromkeys({str(s).lower().strip() for s in skills if str(s).strip()}, 1))
+        
         return {
             'statusCode': 200,
             'body': json.dumps({
@@ -99,7 +355,8 @@ def lambda_handler(event, context):
                 'resume_id': resume_id,
                 'skills_extracted': skills,
                 's3_key': s3_key,
-                'role': role
+                'role': role,
+                'stats_updated': not stats_failed
             })
         }
         
@@ -111,26 +368,93 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
+    finally:
+        finish_trace()
+
+
+def upload_pdf(s3_key: str, pdf_bytes: bytes):
+    """
+    Store a resume PDF in the resumes bucket
+    """
+    with span('s3_put'):
+        s3_client.put_object(
+            Bucket=S3_BUCKET,
+            Key=s3_key,
+            Body=pdf_bytes,
+            ContentType='application/pdf'
+        )
+
+
+def find_resume_by_content_hash(digest: str) -> Optional[Dict]:
+    """
+    Return the resume already stored for this PDF content, if any
+    """
+    from boto3.dynamodb.conditions import Key
+    
+    try:
+        table = dynamodb.Table(DYNAMODB_TABLE)
+        with span('dynamodb_query'):
+            response = table.query(
+                IndexName=CONTENT_HASH_INDEX,
+                KeyConditionExpression=Key('content_hash').eq(digest),
+                Limit=1
+            )
+    except Exception as e:
+        print(f"Content hash lookup failed: {str(e)}")
+        return None
+    
+    items = response.get('Items', [])
+    return items[0] if items else None
+
+
+def iter_pdf_pages(pdf_bytes: bytes) -> Iterator[str]:
+    """
+    Lazily yield the text of each PDF page, stopping at the page and time caps
+    """
+    import PyPDF2
+    
+    deadline = time.monotonic() + PDF_TIME_BUDGET_SECONDS
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    
+    for page_number, page in enumerate(pdf_reader.pages):
+        if page_number >= PDF_MAX_PAGES:
+            print(f"PDF page cap reached ({PDF_MAX_PAGES} pages)")
+            return
+        if time.monotonic() > deadline:
+            print(f"PDF time budget reached after {page_number} pages")
+            return
+        yield page.extract_text() or ''
 
 
 def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     """
-    Extract text from PDF bytes
+    Extract text from PDF bytes, stopping once PDF_TEXT_CHAR_BUDGET characters are collected
     """
     try:
-        pdf_file = io.BytesIO(pdf_bytes)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        chunks = []
+        collected = 0
+        for page_text in iter_pdf_pages(pdf_bytes):
+            chunks.append(page_text)
+            collected += len(page_text) + 1
+            if collected >= PDF_TEXT_CHAR_BUDGET:
+                break
         
-        return text.strip()
+        return '\n'.join(chunks)[:PDF_TEXT_CHAR_BUDGET].strip()
     except Exception as e:
         print(f"Error extracting text from PDF: {str(e)}")
         return ""
 
 
+def extract_skills(resume_text: str) -> List[str]:
+    """
+    Extract skills with Bedrock, or only with the local skill dictionary
+    when SKILL_EXTRACTION_MODE is 'dictionary'
+    """
+    if SKILL_EXTRACTION_MODE == 'dictionary':
+        return extract_skills_from_dictionary(resume_text)
+    return extract_skills_with_bedrock(resume_text)
+
+
 def extract_skills_with_bedrock(resume_text: str) -> List[str]:
     """
     Use Amazon Bedrock (Claude) to intelligently extract skills from resume
@@ -154,26 +478,22 @@ Example format: ["python", "aws", "docker", "kubernetes", "terraform"]
 
 Skills:"""
 
-        # Call Bedrock (Claude 3 Haiku - fast and cheap)
-        response = bedrock_runtime.invoke_model(
-            modelId='anthropic.claude-3-haiku-20240307-v1:0',
-            body=json.dumps({
-                'anthropic_version': 'bedrock-2023-05-31',
-                'max_tokens': 1024,
-                'messages': [
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ]
-            })
-        )
-        
-        # Parse response
-        response_body = json.loads(response['body'].read())
-        skills_text = response_body['content'][0]['text'].strip()
+        # Reuse the cached response if this exact prompt was answered before
+        cache_key = bedrock_cache_key(BEDROCK_MODEL_ID, prompt, 1024)
+        skills_text = bedrock_cache_get(cache_key)
+        fresh = skills_text is None
         
-        print(f"Bedrock raw response: {skills_text}")
+        if fresh:
+            # Call Bedrock (Claude 3 Haiku - fast and cheap), paced and retried by the invoker
+            with span('bedrock_invoke'):
+                response_body = bedrock_invoker.invoke(prompt, 1024)
+            
+            usage = response_body.get('usage', {})
+            trace_count('bedrock_input_tokens', usage.get('input_tokens', 0))
+            trace_count('bedrock_output_tokens', usage.get('output_tokens', 0))
+            skills_text = response_body['content'][0]['text'].strip()
+            
+            print(f"Bedrock raw response: {skills_text}")
         
         # Clean up response (remove markdown formatting if present)
         skills_text = skills_text.replace('```json', '').replace('```', '').strip()
@@ -183,6 +503,8 @@ Skills:"""
         
         # Ensure it's a list and deduplicate
         if isinstance(skills, list):
+            if fresh:
+                bedrock_cache_put(cache_key, skills_text)
             return list(set([s.lower().strip() for s in skills if s]))
         
         return []
@@ -190,23 +512,812 @@ Skills:"""
     except Exception as e:
         print(f"Error extracting skills with Bedrock: {str(e)}")
         # Fallback to basic keyword extraction
-        return extract_skills_fallback(resume_text)
+        return extract_skills_from_dictionary(resume_text)
+
+
+_skill_phrases = None
+
+
+def load_skill_phrases() -> Dict:
+    """
+    Compile skill_taxonomy.json and skill_dictionary.json (shipped from the matcher)
+    into the same token phrase table the matcher uses
+    """
+    global _skill_phrases
+    if _skill_phrases is not None:
+        return _skill_phrases
+    
+    forms, case_sensitive, ignore = {}, [], set()
+    try:
+        with open(os.path.join(SKILL_DATA_DIR, 'skill_taxonomy.json'), encoding='utf-8') as f:
+            taxonomy = json.load(f)
+        aliases = {k.lower().strip(): v.lower().strip() for k, v in taxonomy.get('aliases', {}).items()}
+        forms.update(aliases)
+        for category, members in taxonomy.get('categories', {}).items():
+            for skill in members + [category]:
+                skill = aliases.get(skill.lower().strip(), skill.lower().strip())
+                forms.setdefault(skill, skill)
+        
+        with open(os.path.join(SKILL_DATA_DIR, 'skill_dictionary.json'), encoding='utf-8') as f:
+            dictionary = json.load(f)
+        for skill in dictionary.get('skills', []):
+            forms.setdefault(skill.lower().strip(), skill.lower().strip())
+        for alias, skill in dictionary.get('aliases', {}).items():
+            forms.setdefault(alias.lower().strip(), aliases.get(skill.lower().strip(), skill.lower().strip()))
+        case_sensitive = dictionary.get('case_sensitive', [])
+        ignore = {skill.lower().strip() for skill in dictionary.get('ignore', [])}
+    except Exception as e:
+        print(f"Error loading skill dictionary: {str(e)}")
+    
+    for form, skill in list(forms.items()):
+        for variant in skill_spelling_variants(form):
+            forms.setdefault(variant, skill)
+    
+    ambiguous = {form.lower() for form in case_sensitive}
+    phrases, prefixes = {}, set()
+    for form, skill in forms.items():
+        if form in ambiguous or skill in ignore:
+            continue
+        key = tuple(SKILL_TOKEN_PATTERN.findall(form))
+        if key:
+            phrases[key] = skill
+            prefixes.update(key[:i] for i in range(1, len(key)))
+    exact = {form: forms.get(form.lower(), form.lower()) for form in case_sensitive}
+    
+    _skill_phrases = {'phrases': phrases, 'prefixes': prefixes, 'exact': exact}
+    return _skill_phrases
+
+
+def skill_spelling_variants(form: str) -> Set[str]:
+    """
+    Other spellings of a dictionary form, as in the matcher: node.js -> nodejs,
+    node js; machine learning -> machine-learning
+    """
+    variants = {SKILL_SEPARATOR_PATTERN.sub('', form), SKILL_SEPARATOR_PATTERN.sub(' ', form)}
+    if ' ' in form:
+        variants.add(form.replace(' ', '-'))
+    return {variant for variant in variants if variant != form and len(variant) > 2}
+
+
+_skill_vocabulary = None
+SKILL_BITS_HEADER = struct.Struct('<HH')  # vocabulary version, skills outside the vocabulary
+
+
+def load_skill_vocabulary() -> Dict:
+    """Load skill_vocabulary.json (shipped from the matcher): skill -> bit position"""
+    global _skill_vocabulary
+    if _skill_vocabulary is not None:
+        return _skill_vocabulary
+    
+    path = os.path.join(SKILL_DATA_DIR, 'skill_vocabulary.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+        skills = [str(skill).lower().strip() for skill in raw['skills']]
+        version = int(raw['version'])
+    except Exception as e:
+        print(f"WARNING: could not load skill vocabulary from {path}: {str(e)}. "
+              "Every skill will be encoded as outside the vocabulary; check the package includes it.")
+        skills, version = [], 0
+    
+    _skill_vocabulary = {
+        'version': version,
+        'positions': {skill: i for i, skill in enumerate(skills)},
+        'width': (len(skills) + 63) // 64 * 8
+    }
+    return _skill_vocabulary
+
+
+def encode_skill_bits(skills: List[str]) -> bytes:
+    """
+    Pack skills as the matcher's skill_bits: header (vocabulary version, count of
+    skills outside the vocabulary) and a little-endian bitset over the vocabulary
+    """
+    vocabulary = load_skill_vocabulary()
+    mask = 0
+    outside = 0
+    for skill in {str(s).lower().strip() for s in skills or [] if str(s).strip()}:
+        position = vocabulary['positions'].get(skill)
+        if position is None:
+            outside += 1
+        else:
+            mask |= 1 << position
+    return SKILL_BITS_HEADER.pack(vocabulary['version'], min(outside, 0xFFFF)) + mask.to_bytes(vocabulary['width'], 'little')
+
+
+def extract_skills_from_dictionary(resume_text: str) -> List[str]:
+    """
+    Extract canonical skills in a single pass over the resume's tokens,
+    taking the longest dictionary phrase at each position
+    """
+    table = load_skill_phrases()
+    phrases, prefixes, exact = table['phrases'], table['prefixes'], table['exact']
+    tokens = SKILL_TOKEN_PATTERN.findall(resume_text)
+    lowered = [token.lower() for token in tokens]
+    
+    found = set()
+    i = 0
+    while i < len(lowered):
+        skill, end = None, i + 1
+        key = ()
+        for j in range(i, len(lowered)):
+            key += (lowered[j],)
+            if key in phrases:
+                skill, end = phrases[key], j + 1
+            if key not in prefixes:
+                break
+        if skill is None:
+            skill = exact.get(tokens[i])
+        if skill:
+            found.add(skill)
+        i = end
+    
+    return sorted(found)
+
+
+class BedrockUnavailable(Exception):
+    """
+    Bedrock was skipped because the circuit breaker is open, or kept failing
+    """
+
+
+class TokenBucket:
+    """
+    rate_per_minute units per minute, holding at most one second's worth so bursts are smoothed
+    """
+    
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount (the balance may go negative) and return the seconds to wait first
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
 
 
-def extract_skills_fallback(resume_text: str) -> List[str]:
+class BedrockInvoker:
     """
-    Fallback: Basic keyword matching if Bedrock fails
+    Throttle-aware Bedrock calls, shared by single uploads and bulk ingest:
+    optional request and token rate limits, AIMD concurrency (halved on throttling,
+    grown by 1/limit per success), jittered exponential backoff on throttles
+    and transient errors, and a circuit breaker that rejects calls for a
+    cooldown after repeated failures so skill extraction falls back to the dictionary.
+    A copy of the matcher's BedrockInvoker without stream(): uploads never
+    stream, so keep the rest of the two in step.
     """
-    common_skills = [
-        'python', 'java', 'javascript', 'typescript', 'go', 'rust', 'c++', 'c#',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
-        'react', 'angular', 'vue', 'node', 'django', 'flask', 'spring',
-        'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'dynamodb', 'redis',
-        'jenkins', 'gitlab', 'github', 'ci/cd', 'devops', 'agile', 'scrum',
-        'linux', 'bash', 'git', 'rest api', 'graphql', 'microservices'
-    ]
     
-    text_lower = resume_text.lower()
-    found_skills = [skill for skill in common_skills if skill in text_lower]
+    def __init__(self, client=None, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_concurrency: Optional[int] = None,
+                 max_attempts: Optional[int] = None, breaker_threshold: Optional[int] = None, sleep=time.sleep):
+        self.client = client
+        # An explicit 0 disables pacing or the breaker, so only None falls back to the settings
+        if requests_per_minute is None:
+            requests_per_minute = BEDROCK_REQUESTS_PER_MINUTE
+        if tokens_per_minute is None:
+            tokens_per_minute = BEDROCK_TOKENS_PER_MINUTE
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_concurrency = max(1, BEDROCK_MAX_CONCURRENCY if max_concurrency is None else max_concurrency)
+        self.max_attempts = max(1, BEDROCK_MAX_ATTEMPTS if max_attempts is None else max_attempts)
+        self.breaker_threshold = BEDROCK_BREAKER_THRESHOLD if breaker_threshold is None else breaker_threshold
+        self.sleep = sleep
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.decreased_at = 0.0
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.condition = threading.Condition()
+        self.stats = {'calls': 0, 'throttles': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
     
-    return list(set(found_skills))
+    def invoke(self, prompt: str, max_tokens: int) -> Dict:
+        """Send one Anthropic messages request; returns the parsed response body"""
+        self.enter_breaker()
+        body = self.request_body(prompt, max_tokens)
+        
+        for attempt in range(1, self.max_attempts + 1):
+            self.pace(prompt, max_tokens)
+            self.acquire()
+            try:
+                self.count('calls')
+                response = (self.client or bedrock_runtime).invoke_model(modelId=BEDROCK_MODEL_ID, body=body)
+                result = json.loads(response['body'].read())
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+            else:
+                self.increase()
+                self.record_success()
+                return result
+            finally:
+                self.release()
+            self.sleep(delay)
+    
+    @staticmethod
+    def request_body(prompt: str, max_tokens: int) -> str:
+        return json.dumps({
+            'anthropic_version': 'bedrock-2023-05-31',
+            'max_tokens': max_tokens,
+            'messages': [{'role': 'user', 'content': prompt}]
+        })
+    
+    def pace(self, prompt: str, max_tokens: int):
+        """Wait for the configured buckets; the token quota is charged for max_tokens up front"""
+        wait = self.requests.reserve(1) if self.requests else 0.0
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(len(prompt) // 4 + 1 + max_tokens))
+        if wait:
+            self.sleep(wait)
+    
+    def retry_delay(self, error: Exception, attempt: int) -> float:
+        """Account for a failed attempt; re-raises it unless it should be retried, else returns the backoff"""
+        code = getattr(error, 'response', {}).get('Error', {}).get('Code')
+        if code == 'ThrottlingException':
+            self.count('throttles')
+            self.decrease()
+        if code not in BEDROCK_RETRYABLE_ERRORS or attempt == self.max_attempts:
+            self.record_failure()
+            raise error
+        self.count('retries')
+        delay = random.uniform(0, min(BEDROCK_BACKOFF_MAX_SECONDS, BEDROCK_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+        print(f"Bedrock {code} (attempt {attempt}/{self.max_attempts}), retrying in {delay:.2f}s")
+        return delay
+    
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+    
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+    
+    def increase(self):
+        with self.condition:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+    
+    def decrease(self):
+        # A burst of throttles from calls already in flight only halves the limit once
+        with self.condition:
+            now = time.monotonic()
+            if now - self.decreased_at >= 1.0:
+                self.limit = max(1.0, self.limit / 2)
+                self.decreased_at = now
+    
+    def enter_breaker(self):
+        with self.condition:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < BEDROCK_BREAKER_COOLDOWN_SECONDS or self.probing:
+                self.stats['rejected'] += 1
+                trace_count('bedrock_rejected')
+                raise BedrockUnavailable('Bedrock circuit breaker is open')
+            # Cooldown over: this call is the probe that decides whether the breaker closes
+            self.probing = True
+    
+    def record_success(self):
+        with self.condition:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+    
+    def record_failure(self):
+        with self.condition:
+            self.stats['failures'] += 1
+            self.failures += 1
+            if self.probing or 0 < self.breaker_threshold <= self.failures:
+                if self.opened_at is None or self.probing:
+                    print(f"Bedrock circuit breaker opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+                self.probing = False
+    
+    def count(self, name: str):
+        with self.condition:
+            self.stats[name] += 1
+        trace_count(f"bedrock_{name}")
+    
+    def snapshot(self) -> Dict:
+        with self.condition:
+            return dict(self.stats, limit=round(self.limit, 2), breaker_open=self.opened_at is not None)
+
+
+bedrock_invoker = BedrockInvoker()
+
+
+def update_skill_index(resume_id: str, skills: List[str]):
+    """
+    Add resume_id to the skill inverted index entry of each of its skills
+    """
+    if not SKILL_INDEX_TABLE:
+        return
+    
+    try:
+        index_table = dynamodb.Table(SKILL_INDEX_TABLE)
+        for skill in sorted({str(s).lower().strip() for s in skills if str(s).strip()}):
+            with span('dynamodb_update'):
+                index_table.update_item(
+                    Key={'skill': skill},
+                    UpdateExpression='ADD resume_ids :ids',
+                    ExpressionAttributeValues={':ids': {resume_id}}
+                )
+        print(f"Indexed {resume_id} under {len(skills)} skills")
+    except Exception as e:
+        print(f"Error updating skill index: {str(e)}")
+
+
+def add_stats_counter(stats_id: str, count: int) -> int:
+    """ADD count to the resume_count of one stats item, which ADD creates when missing; returns the new total"""
+    with span('dynamodb_update'):
+        response = dynamodb.Table(STATS_TABLE).update_item(
+            Key={'stats_id': stats_id},
+            UpdateExpression='ADD resume_count :n',
+            ExpressionAttributeValues={':n': count},
+            ReturnValues='UPDATED_NEW'
+        )
+    return int(response['Attributes']['resume_count'])
+
+
+def top_counts(counts: Dict[str, int]) -> Dict[str, int]:
+    """The STATS_TOP_COUNTERS largest counters, ties broken by name"""
+    return dict(sorted(((key, int(count)) for key, count in counts.items() if int(count) > 0),
+                       key=lambda item: (-item[1], item[0]))[:STATS_TOP_COUNTERS])
+
+
+def update_catalog_stats(resumes: int, role_counts: Dict[str, int], skill_counts: Dict[str, int],
+                         pool: Optional[ThreadPoolExecutor] = None) -> List[str]:
+    """
+    ADD newly stored resumes to the materialized catalog stats read by /stats
+    (same items as the matcher: a role#<role> and skill#<skill> counter item
+    each, and the catalog item's resume_count, unique_skills and top roles and
+    skills). Counter updates run on pool when given. Returns the ids whose
+    update failed, after logging them.
+    """
+    if not STATS_TABLE:
+        return []
+    
+    counters = [(f"role#{role}", count) for role, count in role_counts.items()]
+    counters += [(f"skill#{skill}", count) for skill, count in skill_counts.items()]
+    
+    def add(counter):
+        try:
+            return counter[0], add_stats_counter(*counter), None
+        except Exception as e:
+            return counter[0], None, e
+    
+    results = list(pool.map(add, counters) if pool else map(add, counters))
+    totals = {stats_id: total for stats_id, total, _ in results if total is not None}
+    failures = [(stats_id, error) for stats_id, _, error in results if error]
+    
+    # A skill counter whose total is what was just added was created by this update
+    new_skills = sum(1 for stats_id, count in counters if stats_id.startswith('skill#') and totals.get(stats_id) == count)
+    try:
+        update_catalog_summary(resumes, new_skills, totals)
+    except Exception as e:
+        failures.append(('catalog', e))
+    
+    if failures:
+        failed = [stats_id for stats_id, _ in failures]
+        print(f"ERROR: {len(failed)} of {len(counters) + 1} catalog stats updates failed "
+              f"({', '.join(failed[:5])}{', ...' if len(failed) > 5 else ''}): {str(failures[-1][1])}. "
+              "Run rebuild_catalog_stats on the matcher to correct /stats")
+        trace_count('catalog_stats_write_failures', len(failed))
+    return [stats_id for stats_id, _ in failures]
+
+
+def update_catalog_summary(resumes: int, new_skills: int, totals: Dict[str, int]):
+    """
+    ADD to resume_count and unique_skills of the catalog item and merge the new
+    counter totals into its top roles and skills, conditional on
+    summary_version and retried like the matcher's
+    """
+    table = dynamodb.Table(STATS_TABLE)
+    for _ in range(STATS_SUMMARY_ATTEMPTS):
+        with span('dynamodb_get'):
+            item = table.get_item(Key={'stats_id': 'catalog'}, ConsistentRead=True).get('Item', {})
+        version = int(item.get('summary_version', 0))
+        top = {'role': dict(item.get('top_roles', {})), 'skill': dict(item.get('top_skills', {}))}
+        for stats_id, total in totals.items():
+            kind, _, key = stats_id.partition('#')
+            top[kind][key] = max(int(top[kind].get(key, 0)), total)
+        
+        try:
+            with span('dynamodb_update'):
+                table.update_item(
+                    Key={'stats_id': 'catalog'},
+                    UpdateExpression='ADD resume_count :resumes, unique_skills :new_skills '
+                                     'SET top_roles = :roles, top_skills = :skills, summary_version = :next',
+                    ConditionExpression='attribute_not_exists(summary_version) OR summary_version = :version',
+                    ExpressionAttributeValues={':resumes': resumes, ':new_skills': new_skills,
+                                               ':roles': top_counts(top['role']), ':skills': top_counts(top['skill']),
+                                               ':version': version, ':next': version + 1}
+                )
+            return
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+    raise RuntimeError(f"catalog summary changed on each of {STATS_SUMMARY_ATTEMPTS} attempts")
+
+
+def bedrock_cache_key(model_id: str, prompt: str, max_tokens: int) -> str:
+    """
+    Content-addressed cache key for a Bedrock request
+    """
+    payload = json.dumps([model_id, prompt, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def bedrock_cache_get(cache_key: str) -> Optional[str]:
+    """
+    Look up a cached Bedrock response in the shared cache table
+    """
+    if not (BEDROCK_CACHE_ENABLED and BEDROCK_CACHE_TABLE):
+        return None
+    
+    try:
+        with span('dynamodb_get'):
+            item = dynamodb.Table(BEDROCK_CACHE_TABLE).get_item(Key={'cache_key': cache_key}).get('Item')
+        # DynamoDB TTL deletes lazily, so check expiry ourselves
+        if item and int(item.get('expires_at', 0)) > time.time():
+            print(f"Bedrock cache hit: {cache_key[:12]}")
+            trace_count('bedrock_cache_hits')
+            return item['response']
+    except Exception as e:
+        print(f"Error reading Bedrock cache: {str(e)}")
+    
+    print(f"Bedrock cache miss: {cache_key[:12]}")
+    trace_count('bedrock_cache_misses')
+    return None
+
+
+def bedrock_cache_put(cache_key: str, response_text: str):
+    """
+    Store a Bedrock response in the shared cache table
+    """
+    if not (BEDROCK_CACHE_ENABLED and BEDROCK_CACHE_TABLE):
+        return
+    
+    try:
+        with span('dynamodb_put'):
+            dynamodb.Table(BEDROCK_CACHE_TABLE).put_item(Item={
+                'cache_key': cache_key,
+                'model_id': BEDROCK_MODEL_ID,
+                'response': response_text,
+                'expires_at': int(time.time()) + BEDROCK_CACHE_TTL_SECONDS
+            })
+    except Exception as e:
+        print(f"Error writing Bedrock cache: {str(e)}")
+
+
+def embed_text(text: str) -> bytes:
+    """
+    Embed text as a hashed character n-gram vector (same scheme as the matcher),
+    L2-normalized and packed as little-endian float16
+    """
+    counts = [0] * EMBEDDING_DIMS
+    normalized = ' ' + ' '.join(text.lower().split()) + ' '
+    for n in EMBEDDING_NGRAMS:
+        for i in range(len(normalized) - n + 1):
+            counts[zlib.crc32(normalized[i:i + n].encode('utf-8')) % EMBEDDING_DIMS] += 1
+    
+    weights = [1 + math.log(c) if c else 0.0 for c in counts]
+    norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+    return struct.pack(f'<{EMBEDDING_DIMS}e', *(w / norm for w in weights))
+
+
+def handle_bulk_ingest_event(request: Dict) -> Dict:
+    """
+    Bulk ingest entry point for events shaped like
+    {"bulk_ingest": {"zip_key": "imports/batch.zip"}} or {"bulk_ingest": {"s3_prefix": "imports/batch/"}},
+    with optional "bucket" (default S3_BUCKET_NAME) and "role" (default General)
+    """
+    bucket = request.get('bucket', S3_BUCKET)
+    role = request.get('role', 'General')
+    
+    if request.get('zip_key'):
+        archive = read_s3_object(bucket, request['zip_key'])
+        sources = iter_zip_sources(io.BytesIO(archive))
+    elif request.get('s3_prefix'):
+        sources = iter_s3_sources(bucket, request['s3_prefix'])
+    else:
+        return {
+            'statusCode': 400,
+            'body': json.dumps({'error': 'bulk_ingest requires zip_key or s3_prefix'})
+        }
+    
+    report = bulk_ingest(sources, role)
+    return {
+        'statusCode': 200,
+        'body': json.dumps(report)
+    }
+
+
+def iter_zip_sources(archive) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """
+    Yield (name, loader) for every PDF in a zip archive (path or file object)
+    """
+    zip_file = zipfile.ZipFile(archive)
+    for info in zip_file.infolist():
+        if not info.is_dir() and info.filename.lower().endswith('.pdf'):
+            yield info.filename, partial(zip_file.read, info.filename)
+
+
+def iter_s3_sources(bucket: str, prefix: str) -> Iterator[Tuple[str, Callable[[], bytes]]]:
+    """
+    Yield (key, loader) for every PDF under an S3 prefix
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            if obj['Key'].lower().endswith('.pdf'):
+                yield obj['Key'], partial(read_s3_object, bucket, obj['Key'])
+
+
+def read_s3_object(bucket: str, key: str) -> bytes:
+    with span('s3_get'):
+        return s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+
+
+def open_parse_pool():
+    """
+    Process pool for PDF parsing. Lambda has no /dev/shm for multiprocessing,
+    so fall back to threads when a process pool cannot be created.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    try:
+        return ProcessPoolExecutor(max_workers=BULK_PARSE_WORKERS)
+    except (OSError, NotImplementedError) as e:
+        print(f"Process pool unavailable ({str(e)}), parsing in threads")
+        return ThreadPoolExecutor(max_workers=BULK_PARSE_WORKERS)
+
+
+def bulk_ingest(sources: Iterable[Tuple[str, Callable[[], bytes]]], role: str = 'General',
+                progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    Ingest many resumes in chunks of BULK_CHUNK_SIZE: PDFs are parsed in a process pool,
+    skills are extracted with at most BULK_BEDROCK_CONCURRENCY Bedrock calls in flight,
+    S3 uploads and lookups run concurrently and metadata is written with batch_writer.
+    Returns a report with counts, throughput and one error entry per failed file.
+    """
+    started = time.perf_counter()
+    report = {'total': 0, 'ingested': 0, 'duplicates': 0, 'failed': 0, 'stats_failures': 0, 'errors': []}
+    seen_hashes = set()
+    sources = iter(sources)
+    
+    parse_pool = open_parse_pool()
+    try:
+        with ThreadPoolExecutor(max_workers=BULK_IO_CONCURRENCY) as io_pool, \
+                ThreadPoolExecutor(max_workers=BULK_BEDROCK_CONCURRENCY) as bedrock_pool:
+            while True:
+                chunk = list(islice(sources, BULK_CHUNK_SIZE))
+                if not chunk:
+                    break
+                
+                ingest_bulk_chunk(chunk, role, report, seen_hashes, parse_pool, io_pool, bedrock_pool)
+                
+                elapsed = time.perf_counter() - started
+                print(f"Bulk ingest progress: {report['total']} files, {report['ingested']} ingested, "
+                      f"{report['duplicates']} duplicates, {report['failed']} failed "
+                      f"({report['ingested'] / elapsed:.1f} resumes/sec)")
+                if progress:
+                    progress(report)
+    finally:
+        parse_pool.shutdown()
+    
+    elapsed = time.perf_counter() - started
+    report['elapsed_seconds'] = round(elapsed, 3)
+    report['resumes_per_second'] = round(report['ingested'] / elapsed, 2) if elapsed else 0.0
+    report['bedrock'] = bedrock_invoker.snapshot()
+    return report
+
+
+def record_bulk_error(report: Dict, name: str, stage: str, error):
+    report['failed'] += 1
+    report['errors'].append({'file': name, 'stage': stage, 'error': str(error)})
+    print(f"Bulk ingest failed at {stage} for {name}: {str(error)}")
+
+
+def ingest_bulk_chunk(chunk: List[Tuple[str, Callable[[], bytes]]], role: str, report: Dict,
+                      seen_hashes: Set[str], parse_pool, io_pool, bedrock_pool):
+    """
+    Run one chunk through load/dedup, parse, skill extraction, upload and batch write
+    """
+    def load(loader):
+        pdf_bytes = loader()
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        return pdf_bytes, digest, find_resume_by_content_hash(digest)
+    
+    # Load and deduplicate concurrently
+    pending = []
+    for (name, loader), future in [(source, io_pool.submit(load, source[1])) for source in chunk]:
+        report['total'] += 1
+        try:
+            pdf_bytes, digest, existing = future.result()
+        except Exception as e:
+            record_bulk_error(report, name, 'download', e)
+            continue
+        if existing or digest in seen_hashes:
+            report['duplicates'] += 1
+            continue
+        seen_hashes.add(digest)
+        pending.append({'name': name, 'pdf_bytes': pdf_bytes, 'digest': digest})
+    
+    # Parse in the process pool; workers do not trace, so the span covers the whole chunk
+    parsed = []
+    with span('pdf_parse'):
+        futures = [(entry, parse_pool.submit(extract_text_from_pdf, entry['pdf_bytes'])) for entry in pending]
+        wait(future for _, future in futures)
+    for entry, future in futures:
+        try:
+            entry['text'] = future.result()
+        except Exception as e:
+            record_bulk_error(report, entry['name'], 'parse', e)
+            continue
+        if not entry['text']:
+            record_bulk_error(report, entry['name'], 'parse', 'Could not extract text from PDF')
+            continue
+        parsed.append(entry)
+    
+    # Extract skills with bounded Bedrock concurrency, then upload concurrently
+    for entry, future in [(entry, bedrock_pool.submit(extract_skills, entry['text'])) for entry in parsed]:
+        entry['skills'] = future.result()
+    
+    role_slug = role.lower().replace(' ', '-')
+    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    uploads = []
+    for entry in parsed:
+        entry['s3_key'] = f"resumes/{role_slug}/{entry['digest']}.pdf"
+        uploads.append((entry, io_pool.submit(upload_pdf, entry['s3_key'], entry['pdf_bytes'])))
+    
+    stored = []
+    for entry, future in uploads:
+        try:
+            future.result()
+        except Exception as e:
+            record_bulk_error(report, entry['name'], 'upload', e)
+            continue
+        stored.append(entry)
+    
+    # Batch write metadata, then add the resumes that were written to the skill index in one update per skill
+    entries = {}
+    items = []
+    for entry in stored:
+        resume_id = f"{role.lower().replace(' ', '_')}_{timestamp}_{entry['digest'][:8]}"
+        created_at = datetime.utcnow().isoformat()
+        entries[resume_id] = entry
+        items.append({
+            'resume_id': resume_id,
+            'role': role,
+            'skills': entry['skills'],
+            's3_key': entry['s3_key'],
+            'created_at': created_at,
+            'created_day': created_at[:10],
+            'filename': os.path.basename(entry['name']),
+            'content_hash': entry['digest'],
+            'skill_bits': encode_skill_bits(entry['skills']),
+            'embedding': embed_text(' '.join(entry['skills']) + '\n' + entry['text'][:EMBEDDING_TEXT_CHARS])
+        })
+    
+    written, failed = batch_put_items(DYNAMODB_TABLE, 'resume_id', items)
+    for item, error in failed:
+        record_bulk_error(report, entries[item['resume_id']]['name'], 'write', error)
+    if not written:
+        return
+    
+    skill_ids = {}
+    for item in written:
+        for skill in {str(s).lower().strip() for s in item['skills'] if str(s).strip()}:
+            skill_ids.setdefault(skill, set()).add(item['resume_id'])
+    
+    report['ingested'] += len(written)
+    list(io_pool.map(lambda entry: add_to_skill_index(*entry), skill_ids.items()))
+    report['stats_failures'] += len(update_catalog_stats(
+        len(written), {role: len(written)}, {skill: len(ids) for skill, ids in skill_ids.items()}, io_pool))
+
+
+def batch_put_items(table_name: str, key_name: str,
+                    items: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, Exception]]]:
+    """
+    Put items with BatchWriteItem, 25 per request, retrying unprocessed items and
+    failed requests with jittered backoff (a put is idempotent). Returns the
+    items written and (item, error) for the rest. When a request still fails,
+    BatchGetItem decides which of its items landed anyway, so only those that
+    did not are reported.
+    """
+    written = []
+    failed = []
+    for start in range(0, len(items), 25):
+        pending = {item[key_name]: item for item in items[start:start + 25]}
+        error = None
+        for attempt in range(1, BULK_WRITE_ATTEMPTS + 1):
+            try:
+                with span('dynamodb_batch_write'):
+                    response = dynamodb.batch_write_item(RequestItems={
+                        table_name: [{'PutRequest': {'Item': item}} for item in pending.values()]})
+                unprocessed = {request['PutRequest']['Item'][key_name]
+                               for request in response.get('UnprocessedItems', {}).get(table_name, [])}
+                error = None
+            except Exception as e:
+                unprocessed = set(pending)
+                error = e
+            written.extend(item for key, item in pending.items() if key not in unprocessed)
+            pending = {key: item for key, item in pending.items() if key in unprocessed}
+            if not pending:
+                break
+            if attempt < BULK_WRITE_ATTEMPTS:
+                time.sleep(random.uniform(0, min(1.0, 0.05 * 2 ** attempt)))
+        
+        if pending and error is not None:
+            try:
+                landed = stored_keys(table_name, key_name, list(pending))
+            except Exception as e:
+                print(f"Could not check which writes landed: {str(e)}")
+                landed = set()
+            written.extend(item for key, item in pending.items() if key in landed)
+            pending = {key: item for key, item in pending.items() if key not in landed}
+        failed.extend((item, error or RuntimeError('Unprocessed after retries')) for item in pending.values())
+    return written, failed
+
+
+def stored_keys(table_name: str, key_name: str, keys: List[str]) -> Set[str]:
+    """Which of up to 100 keys exist in the table, read with BatchGetItem"""
+    found = set()
+    request = {table_name: {'Keys': [{key_name: key} for key in keys],
+                            'ProjectionExpression': '#k', 'ExpressionAttributeNames': {'#k': key_name},
+                            'ConsistentRead': True}}
+    while request:
+        with span('dynamodb_batch_get'):
+            response = dynamodb.batch_get_item(RequestItems=request)
+        found.update(item[key_name] for item in response.get('Responses', {}).get(table_name, []))
+        request = response.get('UnprocessedKeys') or {}
+    return found
+
+
+def add_to_skill_index(skill: str, resume_ids: Set[str]):
+    """
+    Add several resume_ids to one skill's inverted index entry
+    """
+    if not SKILL_INDEX_TABLE:
+        return
+    
+    try:
+        with span('dynamodb_update'):
+            dynamodb.Table(SKILL_INDEX_TABLE).update_item(
+                Key={'skill': skill},
+                UpdateExpression='ADD resume_ids :ids',
+                ExpressionAttributeValues={':ids': resume_ids}
+            )
+    except Exception as e:
+        print(f"Error updating skill index for {skill}: {str(e)}")
+
+
+if __name__ == '__main__':
+    import sys
+    
+    if len(sys.argv) in (3, 4) and sys.argv[1] == 'bulk-ingest':
+        source = sys.argv[2]
+        role = sys.argv[3] if len(sys.argv) == 4 else 'General'
+        if source.startswith('s3://'):
+            bucket, _, prefix = source[len('s3://'):].partition('/')
+            sources = iter_s3_sources(bucket, prefix)
+        else:
+            sources = iter_zip_sources(source)
+        
+        report = bulk_ingest(sources, role)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report['failed'] else 0)
+    else:
+        print("Usage: python lambda_function.py bulk-ingest <archive.zip | s3://bucket/prefix> [role]")
+        sys.exit(1)
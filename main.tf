@@ -20,6 +20,10 @@ module "iam" {
     lambda_function_name = "${var.project_name}-lambda-${var.environment_name}-${data.aws_caller_identity.current.account_id}"
     s3_bucket_arn = module.s3_bucket.bucket_arn
     dynamodb_table_arn = module.dynamodb_table.table_arn
+    skill_index_table_arn = module.dynamodb_table.skill_index_table_arn
+    bedrock_cache_table_arn = module.dynamodb_table.bedrock_cache_table_arn
+    stats_table_arn = module.dynamodb_table.stats_table_arn
+    ingest_queue_arn = module.ingest_queue.queue_arn
 }
 
 
@@ -32,11 +36,23 @@ module "lambda_matcher" {
   lambda_role_arn     = module.iam.lambda_role_arn
   s3_bucket_name      = module.s3_bucket.bucket_id
   dynamodb_table_name = module.dynamodb_table.table_name
+  skill_index_table_name = module.dynamodb_table.skill_index_table_name
+  bedrock_cache_table_name = module.dynamodb_table.bedrock_cache_table_name
+  stats_table_name = module.dynamodb_table.stats_table_name
+  ingest_queue_url = module.ingest_queue.queue_url
   telegram_bot_token  = var.telegram_bot_token
   lambda_zip_path     = "${path.root}/lambda_matcher.zip"
 }
 
 
+module "ingest_queue" {
+  source               = "./modules/sqs"
+  project_name         = var.project_name
+  queue_name           = "${var.project_name}-ingest-${var.environment_name}"
+  worker_function_name = module.lambda_matcher.function_name
+}
+
+
 module "lambda_uploader" {
   source = "./modules/lambda"
 
@@ -46,6 +62,9 @@ module "lambda_uploader" {
   lambda_role_arn     = module.iam.lambda_role_arn
   s3_bucket_name      = module.s3_bucket.bucket_id
   dynamodb_table_name = module.dynamodb_table.table_name
+  skill_index_table_name = module.dynamodb_table.skill_index_table_name
+  bedrock_cache_table_name = module.dynamodb_table.bedrock_cache_table_name
+  stats_table_name = module.dynamodb_table.stats_table_name
   telegram_bot_token  = ""
   lambda_zip_path     = "${path.root}/lambda_uploader.zip"
   timeout             = 30  
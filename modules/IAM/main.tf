@@ -39,12 +39,25 @@ resource "aws_iam_role_policy" "lambda_custom_policy" {
                 Effect = "Allow"
                 Action = [
                 "dynamodb:GetItem",
+                "dynamodb:BatchGetItem",
+                "dynamodb:BatchWriteItem",
                 "dynamodb:Query",
                 "dynamodb:Scan",
                 "dynamodb:PutItem",
-                "dynamodb:UpdateItem"
+                "dynamodb:UpdateItem",
+                "dynamodb:DeleteItem"
                 ]
-                Resource = [var.dynamodb_table_arn,"${var.dynamodb_table_arn}/index/*"]
+                Resource = [var.dynamodb_table_arn,"${var.dynamodb_table_arn}/index/*",var.skill_index_table_arn,var.bedrock_cache_table_arn,var.stats_table_arn]
+            },
+            {
+                Effect = "Allow"
+                Action = [
+                "sqs:SendMessage",
+                "sqs:ReceiveMessage",
+                "sqs:DeleteMessage",
+                "sqs:GetQueueAttributes"
+                ]
+                Resource = [var.ingest_queue_arn]
             },
             {
         Effect = "Allow"
@@ -17,4 +17,20 @@ variable "s3_bucket_arn" {
 variable "dynamodb_table_arn" {
     type = string
     
+}
+variable "skill_index_table_arn" {
+    type = string
+
+}
+variable "bedrock_cache_table_arn" {
+    type = string
+
+}
+variable "stats_table_arn" {
+    type = string
+
+}
+variable "ingest_queue_arn" {
+    type = string
+
 }
\ No newline at end of file
@@ -11,6 +11,18 @@ resource "aws_dynamodb_table" "main" {
     name = "role"
     type = "S"
     }
+    attribute {
+    name = "content_hash"
+    type = "S"
+    }
+    attribute {
+    name = "created_day"
+    type = "S"
+    }
+    attribute {
+    name = "created_at"
+    type = "S"
+    }
 
     global_secondary_index {
         name = "role-index"
@@ -18,10 +30,79 @@ resource "aws_dynamodb_table" "main" {
         projection_type = "ALL"
         
     }
+
+    global_secondary_index {
+        name = "content-hash-index"
+        hash_key = "content_hash"
+        projection_type = "ALL"
+    }
+
+    # Incremental catalog refreshes query the last day or two of uploads
+    global_secondary_index {
+        name = "created-day-index"
+        hash_key = "created_day"
+        range_key = "created_at"
+        projection_type = "ALL"
+    }
     point_in_time_recovery {
         enabled = true
     }
     tags = {
         Name = "${var.table_name}-metadata"
     }
+}
+
+resource "aws_dynamodb_table" "skill_index" {
+    name = "${var.table_name}-skill-index"
+    billing_mode = var.billing_mode
+    hash_key = "skill"
+
+    attribute {
+    name = "skill"
+    type = "S"
+    }
+
+    tags = {
+        Name = "${var.table_name}-skill-index"
+    }
+}
+
+resource "aws_dynamodb_table" "bedrock_cache" {
+    name = "${var.table_name}-bedrock-cache"
+    billing_mode = var.billing_mode
+    hash_key = "cache_key"
+
+    attribute {
+    name = "cache_key"
+    type = "S"
+    }
+
+    ttl {
+        attribute_name = "expires_at"
+        enabled = true
+    }
+
+    tags = {
+        Name = "${var.table_name}-bedrock-cache"
+    }
+}
+
+resource "aws_dynamodb_table" "stats" {
+    name = "${var.table_name}-stats"
+    billing_mode = var.billing_mode
+    hash_key = "stats_id"
+
+    attribute {
+    name = "stats_id"
+    type = "S"
+    }
+
+    ttl {
+        attribute_name = "expires_at"
+        enabled = true
+    }
+
+    tags = {
+        Name = "${var.table_name}-stats"
+    }
 }
\ No newline at end of file
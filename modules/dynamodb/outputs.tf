@@ -7,3 +7,21 @@ output "table_arn" {
 output "table_id" {
   value = aws_dynamodb_table.main.id
 }
+output "skill_index_table_name" {
+  value = aws_dynamodb_table.skill_index.name
+}
+output "skill_index_table_arn" {
+  value = aws_dynamodb_table.skill_index.arn
+}
+output "bedrock_cache_table_name" {
+  value = aws_dynamodb_table.bedrock_cache.name
+}
+output "bedrock_cache_table_arn" {
+  value = aws_dynamodb_table.bedrock_cache.arn
+}
+output "stats_table_name" {
+  value = aws_dynamodb_table.stats.name
+}
+output "stats_table_arn" {
+  value = aws_dynamodb_table.stats.arn
+}
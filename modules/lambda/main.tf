@@ -11,10 +11,14 @@ resource "aws_lambda_function" "main" {
 
   environment {
     variables = {
-      S3_BUCKET_NAME      = var.s3_bucket_name
-      DYNAMODB_TABLE_NAME = var.dynamodb_table_name
-      ENVIRONMENT         = var.environment
-      TELEGRAM_BOT_TOKEN  = var.telegram_bot_token
+      S3_BUCKET_NAME           = var.s3_bucket_name
+      DYNAMODB_TABLE_NAME      = var.dynamodb_table_name
+      SKILL_INDEX_TABLE_NAME   = var.skill_index_table_name
+      BEDROCK_CACHE_TABLE_NAME = var.bedrock_cache_table_name
+      STATS_TABLE_NAME         = var.stats_table_name
+      INGEST_QUEUE_URL         = var.ingest_queue_url
+      ENVIRONMENT              = var.environment
+      TELEGRAM_BOT_TOKEN       = var.telegram_bot_token
     }
   }
 
@@ -57,6 +57,30 @@ variable "dynamodb_table_name" {
   type        = string
 }
 
+variable "skill_index_table_name" {
+  description = "DynamoDB skill inverted index table name for environment variable"
+  type        = string
+  default     = ""
+}
+
+variable "bedrock_cache_table_name" {
+  description = "DynamoDB Bedrock response cache table name for environment variable"
+  type        = string
+  default     = ""
+}
+
+variable "stats_table_name" {
+  description = "DynamoDB catalog stats table name for environment variable"
+  type        = string
+  default     = ""
+}
+
+variable "ingest_queue_url" {
+  description = "SQS resume ingestion queue URL for environment variable"
+  type        = string
+  default     = ""
+}
+
 variable "telegram_bot_token" {
   description = "Telegram bot token"
   type        = string
@@ -0,0 +1,32 @@
+# Resume ingestion queue: the Telegram webhook enqueues uploads, the matcher
+# Lambda consumes them as an SQS worker
+resource "aws_sqs_queue" "ingest_dlq" {
+  name                      = "${var.queue_name}-dlq"
+  message_retention_seconds = 1209600
+
+  tags = {
+    Name = "${var.project_name}-ingest-dlq"
+  }
+}
+
+resource "aws_sqs_queue" "ingest" {
+  name                       = var.queue_name
+  visibility_timeout_seconds = var.visibility_timeout_seconds
+  message_retention_seconds  = 86400
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.ingest_dlq.arn
+    maxReceiveCount     = 3
+  })
+
+  tags = {
+    Name = "${var.project_name}-ingest-queue"
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "ingest_worker" {
+  event_source_arn        = aws_sqs_queue.ingest.arn
+  function_name           = var.worker_function_name
+  batch_size              = 1
+  function_response_types = ["ReportBatchItemFailures"]
+}
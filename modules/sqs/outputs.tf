@@ -0,0 +1,11 @@
+output "queue_url" {
+  value = aws_sqs_queue.ingest.url
+}
+
+output "queue_arn" {
+  value = aws_sqs_queue.ingest.arn
+}
+
+output "dlq_arn" {
+  value = aws_sqs_queue.ingest_dlq.arn
+}
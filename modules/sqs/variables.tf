@@ -0,0 +1,18 @@
+variable "project_name" {
+  type = string
+}
+
+variable "queue_name" {
+  type = string
+}
+
+variable "worker_function_name" {
+  description = "Lambda function that consumes the ingest queue"
+  type        = string
+}
+
+variable "visibility_timeout_seconds" {
+  description = "Must be at least the worker Lambda timeout"
+  type        = number
+  default     = 180
+}
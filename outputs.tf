@@ -13,6 +13,12 @@ output "dynamodb_table_name" {
 output "table_arn" {
   value = module.dynamodb_table.table_arn
 }
+output "skill_index_table_name" {
+  value = module.dynamodb_table.skill_index_table_name
+}
+output "stats_table_name" {
+  value = module.dynamodb_table.stats_table_name
+}
 output "lambda_role_arn" {
   description = "ARN of the Lambda execution role"
   value       = module.iam.lambda_role_arn
@@ -33,7 +33,9 @@ fi
 
 # Install dependencies
 echo "📥 Installing Python dependencies..."
-pip3 install -r requirements.txt -t ../package/ --upgrade --quiet
+# Lambda (python3.11, x86_64) wheels whatever the build host; numpy is compiled
+pip3 install -r requirements.txt -t ../package/ --upgrade --quiet \
+    --platform manylinux2014_x86_64 --implementation cp --python-version 3.11 --only-binary=:all:
 
 # Check if PyPDF2 was installed
 if [ ! -d "../package/PyPDF2" ]; then
@@ -44,8 +46,12 @@ fi
 echo "✅ PyPDF2 installed"
 
 # Copy Lambda function
-echo "📄 Copying lambda_function.py..."
-cp lambda_function.py ../package/
+echo "📄 Copying lambda_function.py and skill data files..."
+cp lambda_function.py skill_taxonomy.json skill_dictionary.json skill_vocabulary.json ../package/
+
+# Precompile: Lambda's filesystem is read-only, so otherwise every cold start
+# recompiles the handler (only used when the local python3 is 3.11)
+python3 -m compileall -q --invalidation-mode unchecked-hash ../package/lambda_function.py
 
 # Verify function exists
 if [ ! -f "../package/lambda_function.py" ]; then
@@ -68,7 +74,7 @@ echo "✅ Package created: $ZIP_SIZE"
 # Verify contents
 echo ""
 echo "📋 Package contents:"
-unzip -l lambda_function.zip | grep -E "(lambda_function.py|PyPDF2)" | head -5
+unzip -l lambda_function.zip | grep -E "(lambda_function.py|skill_taxonomy.json|skill_dictionary.json|skill_vocabulary.json|PyPDF2)" | head -7
 
 # Update Lambda
 echo ""
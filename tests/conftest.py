@@ -0,0 +1,189 @@
+"""
+Shared fixtures. The matcher handler is imported once with test settings;
+DynamoDB goes to moto and Bedrock to FakeBedrockClient.
+"""
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+os.environ.update({
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'DYNAMODB_TABLE_NAME': 'test-resumes',
+    'SKILL_INDEX_TABLE_NAME': 'test-resumes-skill-index',
+    'BEDROCK_CACHE_TABLE_NAME': '',
+    'STATS_TABLE_NAME': '',
+    'S3_BUCKET_NAME': 'test-resumes-bucket',
+    'TELEGRAM_BOT_TOKEN': 'test-token',
+    'INGEST_QUEUE_URL': '',
+    'TRACE_ENABLED': 'false',
+    'LOG_EVENT_MAX_CHARS': '0',
+})
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lambda', 'matcher', 'src'))
+
+import lambda_function  # noqa: E402
+
+REQUIRED_PATTERN = re.compile(r"Required Skills \(from Job Description\):\n(.*)\n")
+CANDIDATE_PATTERN = re.compile(r"Candidate Skills \(from Resume\):\n(.*)\n")
+BATCH_PATTERN = re.compile(r"Candidates \(resume_id: skills\):\n(.*)\Z", re.S)
+
+
+def client_error(code: str, operation: str = 'InvokeModel') -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+
+class FakeBedrockClient:
+    """
+    bedrock-runtime stand-in for single-resume and batched scoring prompts. The
+    score is the share of required skills the candidate lists; scores(required,
+    candidate) can be replaced. Resumes whose skills include a name in fail_on
+    raise, and batch answers leave out the resume_ids in omit.
+    The next calls raise the error codes queued in errors, one per call; a
+    stream raises those queued in mid_stream_errors after its first text chunk.
+    Tracks calls and the most calls seen in flight at once.
+    """
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self.fail_on = set()
+        self.omit = set()
+        self.errors = []
+        self.mid_stream_errors = []
+        self.calls = 0
+        self.batch_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def scores(required, candidate) -> int:
+        return round(100 * len(set(required) & set(candidate)) / max(1, len(required)))
+
+    def match(self, required, candidate) -> dict:
+        return {'match_score': self.scores(required, candidate),
+                'matched_skills': sorted(set(required) & set(candidate)),
+                'missing_skills': sorted(set(required) - set(candidate)), 'explanation': 'fake'}
+
+    def answer(self, body: str) -> str:
+        prompt = json.loads(body)['messages'][0]['content']
+        required = REQUIRED_PATTERN.search(prompt).group(1).split(', ')
+        batch = BATCH_PATTERN.search(prompt)
+        if batch:
+            candidates = dict(line[2:].split(': ', 1) for line in batch.group(1).splitlines())
+            candidate = [skill for skills in candidates.values() for skill in skills.split(', ')]
+        else:
+            candidate = CANDIDATE_PATTERN.search(prompt).group(1).split(', ')
+        with self.lock:
+            self.calls += 1
+            self.batch_calls += bool(batch)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            error = self.errors.pop(0) if self.errors else None
+        try:
+            time.sleep(self.latency_s)
+            if error:
+                raise client_error(error)
+            if self.fail_on.intersection(candidate):
+                raise RuntimeError('model error')
+            if batch:
+                return json.dumps([dict(self.match(required, skills.split(', ')), resume_id=resume_id)
+                                   for resume_id, skills in candidates.items() if resume_id not in self.omit])
+            return json.dumps(self.match(required, candidate))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def invoke_model(self, modelId: str, body: str, **kwargs):
+        payload = {'content': [{'text': self.answer(body)}], 'usage': {'input_tokens': 1, 'output_tokens': 1}}
+        return {'body': io.BytesIO(json.dumps(payload).encode('utf-8'))}
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str, **kwargs):
+        """The invoke_model answer as Anthropic stream events, in two text chunks"""
+        text = self.answer(body)
+        with self.lock:
+            error = self.mid_stream_errors.pop(0) if self.mid_stream_errors else None
+
+        def event(chunk):
+            return {'chunk': {'bytes': json.dumps(chunk).encode('utf-8')}}
+
+        def events():
+            yield event({'type': 'message_start', 'message': {'usage': {'input_tokens': 1}}})
+            for part in (text[:len(text) // 2], text[len(text) // 2:]):
+                yield event({'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': part}})
+                if error:
+                    raise client_error(error, 'InvokeModelWithResponseStream')
+            yield event({'type': 'message_delta', 'usage': {'output_tokens': 1}})
+            yield event({'type': 'message_stop'})
+
+        return {'body': events()}
+
+
+def make_resume(resume_id: str, skills, role: str = 'Software Engineer', created_at: str = '2024-01-01T00:00:00'):
+    return {'resume_id': resume_id, 'role': role, 'skills': list(skills),
+            's3_key': f"resumes/{resume_id}.pdf", 'created_at': created_at, 'created_day': created_at[:10]}
+
+
+@pytest.fixture
+def matcher(monkeypatch):
+    """The matcher module with empty in-process caches and the Bedrock response cache off"""
+    module = lambda_function
+    monkeypatch.setattr(module, 'BEDROCK_CACHE_ENABLED', False)
+    monkeypatch.setitem(module._catalog_cache, 'resumes', {})
+    monkeypatch.setitem(module._catalog_cache, 'ordered', [])
+    monkeypatch.setitem(module._catalog_cache, 'watermark', '')
+    monkeypatch.setitem(module._catalog_cache, 'refreshed_at', None)
+    monkeypatch.setitem(module._catalog_cache, 'full_loaded_at', None)
+    for counter in ('hits', 'misses', 'incremental_refreshes', 'full_reloads'):
+        monkeypatch.setitem(module._catalog_cache, counter, 0)
+    module._score_cache.clear()
+    return module
+
+
+@pytest.fixture
+def bedrock(matcher, monkeypatch):
+    """A FakeBedrockClient behind an unthrottled invoker"""
+    client = FakeBedrockClient()
+    monkeypatch.setattr(matcher, 'bedrock_invoker', matcher.BedrockInvoker(
+        client=client, requests_per_minute=10 ** 9, tokens_per_minute=10 ** 9, max_concurrency=64))
+    return client
+
+
+@pytest.fixture
+def aws(matcher, monkeypatch):
+    """moto DynamoDB with the metadata table (and its indexes) and the skill index table"""
+    import boto3
+    from moto import mock_aws
+
+    with mock_aws():
+        resource = boto3.resource('dynamodb', region_name='us-east-1')
+        resource.create_table(
+            TableName=matcher.DYNAMODB_TABLE,
+            KeySchema=[{'AttributeName': 'resume_id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': name, 'AttributeType': 'S'}
+                                  for name in ('resume_id', 'role', 'content_hash', 'created_day', 'created_at')],
+            GlobalSecondaryIndexes=[
+                {'IndexName': index, 'KeySchema': [{'AttributeName': key, 'KeyType': 'HASH'}],
+                 'Projection': {'ProjectionType': 'ALL'}}
+                for index, key in ((matcher.ROLE_INDEX, 'role'), (matcher.CONTENT_HASH_INDEX, 'content_hash'))
+            ] + [{'IndexName': matcher.CREATED_DAY_INDEX,
+                  'KeySchema': [{'AttributeName': 'created_day', 'KeyType': 'HASH'},
+                                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}],
+                  'Projection': {'ProjectionType': 'ALL'}}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        resource.create_table(
+            TableName=matcher.SKILL_INDEX_TABLE,
+            KeySchema=[{'AttributeName': 'skill', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'skill', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        monkeypatch.setattr(matcher, 'dynamodb', resource)
+        yield resource
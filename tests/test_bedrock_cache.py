@@ -0,0 +1,107 @@
+import time
+from collections import OrderedDict
+
+import pytest
+
+from conftest import make_resume
+
+CACHE_TABLE = 'test-bedrock-cache'
+REQUIREMENTS = {'skills': ['python', 'aws', 'docker']}
+
+
+@pytest.fixture
+def cache(matcher, monkeypatch):
+    """The Bedrock response cache switched on, empty, with fresh counters"""
+    monkeypatch.setattr(matcher, 'BEDROCK_CACHE_ENABLED', True)
+    monkeypatch.setattr(matcher, '_bedrock_cache', OrderedDict())
+    monkeypatch.setattr(matcher, '_bedrock_cache_stats',
+                        {'memory_hits': 0, 'persistent_hits': 0, 'misses': 0, 'bypassed': 0})
+    return matcher._bedrock_cache
+
+
+@pytest.fixture
+def cache_table(matcher, aws, cache, monkeypatch):
+    """The persistent cache table, created in moto and configured on the matcher"""
+    table = aws.create_table(
+        TableName=CACHE_TABLE,
+        KeySchema=[{'AttributeName': 'cache_key', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'cache_key', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    monkeypatch.setattr(matcher, 'BEDROCK_CACHE_TABLE', CACHE_TABLE)
+    return table
+
+
+def score(matcher, skills):
+    return matcher.semantic_match_with_ai(REQUIREMENTS, make_resume('resume_1', skills))
+
+
+def test_repeat_request_is_served_from_memory(matcher, bedrock, cache):
+    first = score(matcher, ['python', 'aws'])
+    second = score(matcher, ['python', 'aws'])
+    score(matcher, ['python', 'docker'])
+
+    assert second == first
+    assert bedrock.calls == 2
+    stats = matcher.bedrock_cache_stats()
+    assert (stats['memory_hits'], stats['misses'], stats['size']) == (1, 2, 2)
+    assert stats['hit_rate'] == pytest.approx(1 / 3, abs=0.001)
+
+
+def test_key_changes_with_model_prompt_and_max_tokens(matcher):
+    key = matcher.bedrock_cache_key('model-a', 'prompt', 800)
+
+    assert matcher.bedrock_cache_key('model-a', 'prompt', 800) == key
+    assert len({key, matcher.bedrock_cache_key('model-b', 'prompt', 800),
+                matcher.bedrock_cache_key('model-a', 'prompt!', 800),
+                matcher.bedrock_cache_key('model-a', 'prompt', 801)}) == 4
+
+
+def test_new_model_misses_the_cache(matcher, bedrock, cache, monkeypatch):
+    score(matcher, ['python'])
+    monkeypatch.setattr(matcher, 'BEDROCK_MODEL_ID', 'anthropic.claude-3-5-haiku-20241022-v1:0')
+    score(matcher, ['python'])
+
+    assert bedrock.calls == 2
+    assert len(cache) == 2
+
+
+def test_lru_evicts_least_recently_used(matcher, bedrock, cache, monkeypatch):
+    monkeypatch.setattr(matcher, 'BEDROCK_CACHE_MAX_ENTRIES', 2)
+    score(matcher, ['python'])
+    score(matcher, ['aws'])
+    score(matcher, ['python'])
+    score(matcher, ['docker'])
+
+    score(matcher, ['python'])
+    assert bedrock.calls == 3
+    score(matcher, ['aws'])
+    assert bedrock.calls == 4
+
+
+def test_persistent_cache_serves_other_containers_until_expiry(matcher, bedrock, cache, cache_table):
+    score(matcher, ['python', 'aws'])
+    cache.clear()
+
+    score(matcher, ['python', 'aws'])
+    assert bedrock.calls == 1
+    assert matcher.bedrock_cache_stats()['persistent_hits'] == 1
+
+    for item in cache_table.scan()['Items']:
+        assert item['expires_at'] > time.time() + matcher.BEDROCK_CACHE_TTL_SECONDS - 60
+        cache_table.put_item(Item=dict(item, expires_at=int(time.time()) - 1))
+    cache.clear()
+
+    score(matcher, ['python', 'aws'])
+    assert bedrock.calls == 2
+    assert cache_table.scan()['Items'][0]['expires_at'] > time.time()
+
+
+def test_non_json_responses_are_not_cached(matcher, bedrock, cache, monkeypatch):
+    monkeypatch.setattr(bedrock, 'answer', lambda body: 'Sorry, I cannot help with that.')
+
+    score(matcher, ['python'])
+    score(matcher, ['python'])
+
+    assert len(cache) == 0
+    assert matcher.bedrock_cache_stats()['misses'] == 2
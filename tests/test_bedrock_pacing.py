@@ -0,0 +1,164 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from conftest import FakeBedrockClient
+
+PROMPT = "Required Skills (from Job Description):\npython\nCandidate Skills (from Resume):\npython\n"
+
+
+def test_pacing_is_off_by_default(matcher):
+    waits = []
+    invoker = matcher.BedrockInvoker(client=FakeBedrockClient(), sleep=waits.append)
+
+    for _ in range(50):
+        invoker.invoke(PROMPT, 4000)
+
+    assert (invoker.requests, invoker.tokens) == (None, None)
+    assert waits == []
+
+
+def test_configured_pacing_spaces_calls_to_the_share(matcher):
+    waits = []
+    invoker = matcher.BedrockInvoker(client=FakeBedrockClient(), requests_per_minute=60,
+                                     tokens_per_minute=10 ** 9, sleep=waits.append)
+
+    for _ in range(3):
+        invoker.invoke(PROMPT, 100)
+
+    # One request per second: the first goes at once, then each waits about a second more
+    assert len(waits) == 2
+    assert 0.9 < waits[0] <= 1.0 and 1.9 < waits[1] <= 2.0
+
+
+def invoker_for(matcher, client, waits, **kwargs):
+    return matcher.BedrockInvoker(client=client, requests_per_minute=0, tokens_per_minute=0,
+                                  sleep=waits.append, **kwargs)
+
+
+def test_explicit_zero_overrides_the_settings(matcher, monkeypatch):
+    monkeypatch.setattr(matcher, 'BEDROCK_REQUESTS_PER_MINUTE', 60.0)
+    monkeypatch.setattr(matcher, 'BEDROCK_BREAKER_THRESHOLD', 5)
+
+    invoker = matcher.BedrockInvoker(client=FakeBedrockClient(), requests_per_minute=0, breaker_threshold=0)
+
+    assert invoker.requests is None
+    assert invoker.breaker_threshold == 0
+
+
+def test_throttles_are_retried_with_full_jitter_backoff(matcher, monkeypatch):
+    client = FakeBedrockClient()
+    client.errors = ['ThrottlingException', 'ThrottlingException']
+    ranges = []
+    monkeypatch.setattr(matcher.random, 'uniform', lambda low, high: ranges.append((low, high)) or high / 2)
+    waits = []
+    invoker = invoker_for(matcher, client, waits, max_attempts=4)
+
+    result = invoker.invoke(PROMPT, 100)
+
+    assert '"match_score": 100' in result['content'][0]['text']
+    assert client.calls == 3
+    base = matcher.BEDROCK_BACKOFF_BASE_SECONDS
+    assert ranges == [(0, base), (0, base * 2)]
+    assert waits == [base / 2, base]
+    assert (invoker.stats['throttles'], invoker.stats['retries'], invoker.stats['failures']) == (2, 2, 0)
+
+
+def test_retries_stop_at_max_attempts_and_for_non_retryable_errors(matcher):
+    client = FakeBedrockClient()
+    client.errors = ['ThrottlingException'] * 3 + ['ValidationException']
+    invoker = invoker_for(matcher, client, [], max_attempts=3)
+
+    with pytest.raises(ClientError):
+        invoker.invoke(PROMPT, 100)
+    assert client.calls == 3
+    with pytest.raises(ClientError):
+        invoker.invoke(PROMPT, 100)
+    assert client.calls == 4
+    assert invoker.stats['failures'] == 2
+
+
+def test_throttling_halves_the_limit_once_per_burst_and_success_grows_it(matcher):
+    client = FakeBedrockClient()
+    invoker = invoker_for(matcher, client, [], max_concurrency=8)
+
+    client.errors = ['ThrottlingException', 'ThrottlingException']
+    invoker.invoke(PROMPT, 100)
+    assert invoker.limit == 4.25
+
+    invoker.decreased_at = 0.0
+    client.errors = ['ThrottlingException']
+    invoker.invoke(PROMPT, 100)
+    assert invoker.limit == pytest.approx(2.125 + 1 / 2.125)
+
+    for _ in range(200):
+        invoker.invoke(PROMPT, 100)
+    assert invoker.limit == 8
+
+
+def test_breaker_opens_probes_once_after_cooldown_and_closes(matcher, monkeypatch):
+    client = FakeBedrockClient()
+    invoker = invoker_for(matcher, client, [], max_attempts=1, breaker_threshold=2)
+
+    client.errors = ['ServiceUnavailableException'] * 2
+    for _ in range(2):
+        with pytest.raises(ClientError):
+            invoker.invoke(PROMPT, 100)
+    with pytest.raises(matcher.BedrockUnavailable):
+        invoker.invoke(PROMPT, 100)
+    assert client.calls == 2
+
+    monkeypatch.setattr(matcher, 'BEDROCK_BREAKER_COOLDOWN_SECONDS', 0)
+    client.errors = ['ServiceUnavailableException']
+    with pytest.raises(ClientError):
+        invoker.invoke(PROMPT, 100)
+    assert invoker.snapshot()['breaker_open']
+
+    # While the probe is in flight every other call is still rejected
+    answer = client.answer
+    rejected = []
+
+    def probe(body):
+        with pytest.raises(matcher.BedrockUnavailable):
+            invoker.invoke(PROMPT, 100)
+        rejected.append(True)
+        return answer(body)
+
+    monkeypatch.setattr(client, 'answer', probe)
+    invoker.invoke(PROMPT, 100)
+
+    assert rejected == [True]
+    assert not invoker.snapshot()['breaker_open']
+    assert client.calls == 4
+
+
+def test_breaker_threshold_zero_never_opens(matcher):
+    client = FakeBedrockClient()
+    invoker = invoker_for(matcher, client, [], max_attempts=1, breaker_threshold=0)
+
+    client.errors = ['ServiceUnavailableException'] * 10
+    for _ in range(10):
+        with pytest.raises(ClientError):
+            invoker.invoke(PROMPT, 100)
+
+    invoker.invoke(PROMPT, 100)
+    assert not invoker.snapshot()['breaker_open']
+
+
+def test_stream_retries_only_before_the_first_text(matcher):
+    client = FakeBedrockClient()
+    invoker = invoker_for(matcher, client, [], max_attempts=3)
+
+    client.errors = ['ThrottlingException']
+    events = list(invoker.stream(PROMPT, 100))
+    assert client.calls == 2
+    assert '"match_score": 100' in ''.join(text for kind, text in events if kind == 'text')
+    assert events[-1] == ('usage', {'input_tokens': 1, 'output_tokens': 1})
+
+    client.mid_stream_errors = ['ThrottlingException']
+    received = []
+    with pytest.raises(ClientError):
+        for kind, text in invoker.stream(PROMPT, 100):
+            received.append(text)
+    assert client.calls == 3
+    assert len(received) == 1
+    assert invoker.stats['failures'] == 1
@@ -0,0 +1,98 @@
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import client_error
+
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'lambda')
+UPLOADER_SOURCE = os.path.join(LAMBDA_DIR, 'uploader', 'src', 'lambda_function.py')
+
+
+@pytest.fixture
+def uploader(aws, monkeypatch):
+    """The uploader handler, loaded under its own name, with DynamoDB on moto and no Bedrock or S3"""
+    spec = importlib.util.spec_from_file_location('uploader_function', UPLOADER_SOURCE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, 'dynamodb', aws)
+    monkeypatch.setattr(module, 'SKILL_DATA_DIR', os.path.join(LAMBDA_DIR, 'matcher', 'src'))
+    monkeypatch.setattr(module, 'SKILL_EXTRACTION_MODE', 'dictionary')
+    monkeypatch.setattr(module, 'extract_text_from_pdf', lambda pdf_bytes: pdf_bytes.decode())
+    monkeypatch.setattr(module, 'upload_pdf', lambda s3_key, pdf_bytes: None)
+    return module
+
+
+def ingest(uploader, count):
+    chunk = [(f"cv{i}.pdf", lambda i=i: f"Resume {i}: python and docker".encode()) for i in range(count)]
+    report = {'total': 0, 'ingested': 0, 'duplicates': 0, 'failed': 0, 'stats_failures': 0, 'errors': []}
+    with ThreadPoolExecutor(2) as pool:
+        uploader.ingest_bulk_chunk(chunk, 'Software Engineer', report, set(), pool, pool, pool)
+    return report
+
+
+def stored_ids(aws, uploader):
+    return {item['resume_id'] for item in aws.Table(uploader.DYNAMODB_TABLE).scan()['Items']}
+
+
+def indexed_ids(aws, uploader, skill):
+    return aws.Table(uploader.SKILL_INDEX_TABLE).get_item(Key={'skill': skill})['Item']['resume_ids']
+
+
+def test_chunk_is_written_in_batches_of_25(uploader, aws, monkeypatch):
+    batch_write_item = aws.batch_write_item
+    sizes = []
+
+    def record(RequestItems):
+        sizes.append(len(RequestItems[uploader.DYNAMODB_TABLE]))
+        return batch_write_item(RequestItems=RequestItems)
+
+    monkeypatch.setattr(aws, 'batch_write_item', record)
+
+    report = ingest(uploader, 30)
+
+    assert sizes == [25, 5]
+    assert (report['ingested'], report['failed']) == (30, 0)
+    assert indexed_ids(aws, uploader, 'python') == stored_ids(aws, uploader)
+
+
+def test_unprocessed_items_are_retried(uploader, aws, monkeypatch):
+    batch_write_item = aws.batch_write_item
+    calls = []
+
+    def throttle_half_once(RequestItems):
+        requests = RequestItems[uploader.DYNAMODB_TABLE]
+        calls.append(len(requests))
+        if len(calls) > 1:
+            return batch_write_item(RequestItems=RequestItems)
+        batch_write_item(RequestItems={uploader.DYNAMODB_TABLE: requests[:2]})
+        return {'UnprocessedItems': {uploader.DYNAMODB_TABLE: requests[2:]}}
+
+    monkeypatch.setattr(aws, 'batch_write_item', throttle_half_once)
+
+    report = ingest(uploader, 5)
+
+    assert calls == [5, 3]
+    assert (report['ingested'], report['failed']) == (5, 0)
+    assert len(stored_ids(aws, uploader)) == 5
+
+
+def test_failed_request_reports_only_items_that_did_not_land(uploader, aws, monkeypatch):
+    batch_write_item = aws.batch_write_item
+
+    def write_half_then_fail(RequestItems):
+        requests = RequestItems[uploader.DYNAMODB_TABLE]
+        batch_write_item(RequestItems={uploader.DYNAMODB_TABLE: requests[:len(requests) // 2 or 1]})
+        raise client_error('ProvisionedThroughputExceededException', 'BatchWriteItem')
+
+    monkeypatch.setattr(aws, 'batch_write_item', write_half_then_fail)
+
+    report = ingest(uploader, 8)
+
+    written = stored_ids(aws, uploader)
+    assert 0 < len(written) < 8
+    assert (report['ingested'], report['failed']) == (len(written), 8 - len(written))
+    assert {error['stage'] for error in report['errors']} == {'write'}
+    assert indexed_ids(aws, uploader, 'python') == written
+    assert indexed_ids(aws, uploader, 'docker') == written
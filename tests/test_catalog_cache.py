@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import make_resume
+
+
+@pytest.fixture
+def catalog(matcher, aws, monkeypatch):
+    """The metadata table with three stored resumes and a short cache TTL; returns the table"""
+    monkeypatch.setattr(matcher, 'CATALOG_CACHE_TTL_SECONDS', 30)
+    monkeypatch.setattr(matcher, 'CATALOG_FULL_RELOAD_SECONDS', 900)
+    table = aws.Table(matcher.DYNAMODB_TABLE)
+    for i in range(3):
+        table.put_item(Item=make_resume(f"resume_{i}", ['python']))
+    return table
+
+
+def ids(resumes):
+    return [r['resume_id'] for r in resumes]
+
+
+def new_resume(resume_id: str):
+    return make_resume(resume_id, ['go'], created_at=datetime.utcnow().isoformat())
+
+
+def test_cached_copy_is_served_within_ttl(matcher, catalog):
+    assert ids(matcher.get_catalog(now=0)) == ['resume_0', 'resume_1', 'resume_2']
+    catalog.put_item(Item=new_resume('resume_3'))
+
+    assert ids(matcher.get_catalog(now=29)) == ['resume_0', 'resume_1', 'resume_2']
+    stats = matcher.catalog_cache_stats()
+    assert (stats['hits'], stats['full_reloads'], stats['incremental_refreshes']) == (1, 1, 0)
+
+
+def test_refresh_after_ttl_queries_only_new_days(matcher, catalog, monkeypatch):
+    matcher.get_catalog(now=0)
+    catalog.put_item(Item=new_resume('resume_3'))
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError('incremental refresh scanned the table')
+
+    monkeypatch.setattr(matcher, 'iter_resume_pages', no_scan)
+    queries = []
+    query = catalog.meta.client.query
+    monkeypatch.setattr(catalog.meta.client, 'query', lambda **kwargs: queries.append(kwargs) or query(**kwargs))
+
+    assert ids(matcher.get_catalog(now=31)) == ['resume_0', 'resume_1', 'resume_2', 'resume_3']
+    assert matcher.catalog_cache_stats()['incremental_refreshes'] == 1
+    assert queries and all(q['IndexName'] == matcher.CREATED_DAY_INDEX for q in queries)
+    assert len(queries) <= 2  # today, and yesterday when the refresh window crosses midnight
+
+
+def test_full_reload_drops_deleted_resumes(matcher, catalog):
+    matcher.get_catalog(now=0)
+    catalog.delete_item(Key={'resume_id': 'resume_1'})
+
+    assert ids(matcher.get_catalog(now=31)) == ['resume_0', 'resume_1', 'resume_2']
+    assert ids(matcher.get_catalog(now=901)) == ['resume_0', 'resume_2']
+    assert matcher.catalog_cache_stats()['full_reloads'] == 2
+
+
+def test_refresh_falls_back_to_scan_without_index(matcher, catalog, monkeypatch):
+    matcher.get_catalog(now=0)
+    catalog.put_item(Item=new_resume('resume_3'))
+    monkeypatch.setattr(matcher, 'CREATED_DAY_INDEX', 'missing-index')
+
+    assert ids(matcher.get_catalog(now=31)) == ['resume_0', 'resume_1', 'resume_2', 'resume_3']
@@ -0,0 +1,139 @@
+import pytest
+
+from conftest import make_resume
+
+STATS_TABLE = 'test-resumes-stats'
+
+
+@pytest.fixture
+def stats(matcher, aws, monkeypatch):
+    """The stats table, created in moto and configured on the matcher"""
+    table = aws.create_table(
+        TableName=STATS_TABLE,
+        KeySchema=[{'AttributeName': 'stats_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'stats_id', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    monkeypatch.setattr(matcher, 'STATS_TABLE', STATS_TABLE)
+    return table
+
+
+def catalog():
+    return [make_resume('resume_0', ['python', 'aws']),
+            make_resume('resume_1', ['python', 'docker'], role='DevOps Engineer'),
+            make_resume('resume_2', ['react'], role='Frontend Developer')]
+
+
+def store(matcher, aws, resumes):
+    with aws.Table(matcher.DYNAMODB_TABLE).batch_writer() as batch:
+        for resume in resumes:
+            batch.put_item(Item=resume)
+
+
+def ingest(matcher, resume):
+    return matcher.update_catalog_stats(1, {resume['role']: 1},
+                                        {skill: 1 for skill in matcher.index_skill_keys(resume['skills'])})
+
+
+def test_uploads_keep_counters_in_their_own_items(matcher, aws, stats):
+    resumes = catalog()
+    store(matcher, aws, resumes)
+
+    assert [ingest(matcher, resume) for resume in resumes] == [[], [], []]
+
+    assert matcher.get_catalog_stats() == matcher.summarize_catalog(matcher.count_catalog(resumes))
+    assert matcher.get_catalog_stats()['unique_skills'] == 4
+    assert stats.get_item(Key={'stats_id': 'skill#python'})['Item']['resume_count'] == 2
+
+
+def test_stats_item_stays_bounded_as_skills_grow(matcher, aws, stats, monkeypatch):
+    monkeypatch.setattr(matcher, 'STATS_TOP_COUNTERS', 5)
+    resumes = [make_resume(f"resume_{i:02d}", ['python', f"tool{i:02d}"]) for i in range(30)]
+    store(matcher, aws, resumes)
+
+    for resume in resumes:
+        ingest(matcher, resume)
+
+    result = matcher.get_catalog_stats()
+    assert result == matcher.summarize_catalog(matcher.count_catalog(resumes))
+    assert result['unique_skills'] == 31
+    assert list(result['skills']) == ['python', 'tool00', 'tool01', 'tool02', 'tool03']
+    assert result['skills']['python'] == 30
+    assert len(stats.get_item(Key={'stats_id': 'catalog'})['Item']['top_skills']) == 5
+
+
+def test_failed_counter_is_returned_and_the_rest_applied(matcher, aws, stats, monkeypatch):
+    add = matcher.add_stats_counter
+
+    def add_fails_for_docker(stats_id, count):
+        if stats_id == 'skill#docker':
+            raise RuntimeError('ProvisionedThroughputExceededException')
+        return add(stats_id, count)
+
+    monkeypatch.setattr(matcher, 'add_stats_counter', add_fails_for_docker)
+
+    assert ingest(matcher, catalog()[1]) == ['skill#docker']
+    assert matcher.get_catalog_stats() == {'resumes': 1, 'unique_skills': 1,
+                                           'roles': {'DevOps Engineer': 1}, 'skills': {'python': 1}}
+
+
+def test_summary_merge_retries_when_another_upload_wins(matcher, aws, stats, monkeypatch):
+    get_item = stats.get_item
+    raced = []
+
+    class RacingTable:
+        """Bumps summary_version behind the first read, as a concurrent upload would"""
+
+        def __getattr__(self, name):
+            return getattr(stats, name)
+
+        def get_item(self, **kwargs):
+            item = get_item(**kwargs)
+            if not raced:
+                raced.append(True)
+                stats.put_item(Item={'stats_id': 'catalog', 'resume_count': 1, 'unique_skills': 1,
+                                     'top_roles': {'Data Engineer': 1}, 'top_skills': {'spark': 1},
+                                     'summary_version': 1})
+            return item
+
+    table = matcher.dynamodb.Table
+    monkeypatch.setattr(matcher.dynamodb, 'Table', lambda name: RacingTable() if name == STATS_TABLE else table(name))
+
+    assert ingest(matcher, catalog()[0]) == []
+    assert matcher.get_catalog_stats() == {'resumes': 2, 'unique_skills': 3,
+                                           'roles': {'Data Engineer': 1, 'Software Engineer': 1},
+                                           'skills': {'aws': 1, 'python': 1, 'spark': 1}}
+
+
+def test_rebuild_replaces_single_item_counters_and_removes_stale(matcher, aws, stats):
+    resumes = catalog()
+    store(matcher, aws, resumes)
+    stats.put_item(Item={'stats_id': 'catalog', 'resume_count': 9, 'skill#python': 9, 'role#Data Engineer': 9})
+    stats.put_item(Item={'stats_id': 'skill#cobol', 'resume_count': 4})
+
+    summary = matcher.rebuild_catalog_stats()
+
+    assert summary['stale_removed'] == 1
+    assert matcher.get_catalog_stats() == matcher.summarize_catalog(matcher.count_catalog(resumes))
+    assert 'skill#python' not in stats.get_item(Key={'stats_id': 'catalog'})['Item']
+    assert 'Item' not in stats.get_item(Key={'stats_id': 'skill#cobol'})
+
+
+def test_list_cursors_are_one_expiring_item_per_page(matcher, aws, stats, monkeypatch):
+    monkeypatch.setattr(matcher, 'LIST_PAGE_SIZE', 3)
+    resumes = [make_resume(f"resume_{i:02d}", ['python']) for i in range(14)]
+    store(matcher, aws, resumes)
+    matcher.rebuild_catalog_stats()
+
+    paged = [r['resume_id'] for page in range(1, 6) for r in matcher.get_resume_page(page)['resumes']]
+    cursors = {page: stats.get_item(Key={'stats_id': f"list#{page}"}).get('Item') for page in range(2, 7)}
+    for page in range(2, 6):
+        stats.delete_item(Key={'stats_id': f"list#{page}"})
+    jumped = matcher.get_resume_page(4)
+
+    assert sorted(paged) == sorted(r['resume_id'] for r in resumes)
+    assert cursors[6] is None
+    assert all(set(cursors[page]) == {'stats_id', 'resume_id', 'expires_at'} for page in range(2, 6))
+    assert [r['resume_id'] for r in jumped['resumes']] == paged[9:12]
+    assert jumped['total'] == 14
+    assert stats.get_item(Key={'stats_id': 'list#3'})['Item']['resume_id'] == paged[5]
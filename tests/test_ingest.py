@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+JOB = {'chat_id': 42, 'file_id': 'file-1', 'file_name': 'cv.pdf', 'status_message_id': 7}
+
+
+@pytest.fixture
+def telegram(matcher, monkeypatch):
+    """Texts sent or edited on Telegram; the PDF download succeeds unless a test says otherwise"""
+    sent = []
+    monkeypatch.setattr(matcher, 'INGEST_STAGE_ATTEMPTS', 1)
+    monkeypatch.setattr(matcher, 'telegram_api',
+                        lambda method, payload: sent.append(payload['text']) or {'message_id': 7})
+    monkeypatch.setattr(matcher, 'get_telegram_file', lambda file_id: {'file_path': 'documents/cv.pdf'})
+    monkeypatch.setattr(matcher, 'download_telegram_file', lambda file_path: b'%PDF-1.4')
+    monkeypatch.setattr(matcher, 'find_resume_by_content_hash', lambda digest: None)
+    return sent
+
+
+def record(message_id: str, body):
+    return {'messageId': message_id, 'eventSource': 'aws:sqs',
+            'body': body if isinstance(body, str) else json.dumps(body)}
+
+
+def test_retryable_failure_is_reported_for_redelivery(matcher, telegram, monkeypatch):
+    monkeypatch.setattr(matcher, 'download_telegram_file', lambda file_path: None)
+
+    result = matcher.handle_ingest_records([record('m1', JOB)])
+
+    assert result == {'batchItemFailures': [{'itemIdentifier': 'm1'}]}
+    assert telegram[-1] == "❌ Error: Could not download file"
+
+
+def test_unexpected_error_is_reported_for_redelivery(matcher, telegram, monkeypatch):
+    monkeypatch.setattr(matcher, 'extract_text_from_pdf', lambda pdf_bytes: 'python aws docker')
+    monkeypatch.setattr(matcher, 'SKILL_EXTRACTION_MODE', 'dictionary')
+
+    def store_fails(*args):
+        raise RuntimeError('ProvisionedThroughputExceededException')
+
+    monkeypatch.setattr(matcher, 'ingest_store', store_fails)
+
+    result = matcher.handle_ingest_records([record('m1', JOB), record('m2', dict(JOB, chat_id=43))])
+
+    assert result == {'batchItemFailures': [{'itemIdentifier': 'm1'}, {'itemIdentifier': 'm2'}]}
+
+
+def test_permanent_failure_is_not_retried(matcher, telegram, monkeypatch):
+    monkeypatch.setattr(matcher, 'extract_text_from_pdf', lambda pdf_bytes: '')
+
+    result = matcher.handle_ingest_records([record('m1', JOB)])
+
+    assert result == {'batchItemFailures': []}
+    assert telegram[-1].startswith("❌ Could not extract text from PDF")
+
+
+@pytest.mark.parametrize('body', ['not json', {'chat_id': 42}, ['chat_id', 'file_id']])
+def test_malformed_records_are_dropped(matcher, telegram, body):
+    assert matcher.handle_ingest_records([record('m1', body)]) == {'batchItemFailures': []}
+    assert telegram == []
+
+
+def test_inline_upload_reports_without_raising(matcher, telegram, monkeypatch):
+    monkeypatch.setattr(matcher, 'download_telegram_file', lambda file_path: None)
+
+    matcher.process_ingest_job(dict(JOB))
+
+    assert telegram[-1] == "❌ Error: Could not download file"
+
+
+def test_resumes_stored_in_the_same_second_keep_their_own_rows(matcher, aws, monkeypatch):
+    class FrozenClock(matcher.datetime):
+        @classmethod
+        def utcnow(cls):
+            return cls(2025, 12, 17, 12, 34, 56)
+
+    monkeypatch.setattr(matcher, 'datetime', FrozenClock)
+    monkeypatch.setattr(matcher, 's3_client', type('S3', (), {'put_object': lambda self, **kwargs: None})())
+
+    first = matcher.ingest_store(dict(JOB), b'%PDF-1 a', 'python developer', ['python'], 'a' * 64)
+    second = matcher.ingest_store(dict(JOB, chat_id=43), b'%PDF-1 b', 'java developer', ['java'], 'b' * 64)
+
+    assert first['resume_id'] != second['resume_id']
+    table = aws.Table(matcher.DYNAMODB_TABLE)
+    assert table.get_item(Key={'resume_id': first['resume_id']})['Item']['skills'] == ['python']
+    assert table.get_item(Key={'resume_id': second['resume_id']})['Item']['skills'] == ['java']
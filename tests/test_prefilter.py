@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from conftest import make_resume
+
+ROLES = ['DevOps Engineer', 'Data Engineer', 'Frontend Developer', 'Software Engineer']
+SKILLS = ['kubernetes', 'docker', 'terraform', 'aws', 'spark', 'kafka', 'python', 'sql', 'react', 'css',
+          'Internal Tool X', 'cobol']
+
+
+def store_catalog(matcher, aws, count: int = 300):
+    rng = random.Random(3)
+    table = aws.Table(matcher.DYNAMODB_TABLE)
+    with table.batch_writer() as batch:
+        for i in range(count):
+            batch.put_item(Item=make_resume(f"resume_{i:04d}", rng.sample(SKILLS, rng.randint(1, 5)),
+                                            role=ROLES[i % len(ROLES)]))
+    matcher.rebuild_skill_index()
+
+
+@pytest.mark.parametrize('mode', ['skills', 'role'])
+def test_warm_catalog_shortlist_matches_index_path(matcher, aws, monkeypatch, mode):
+    monkeypatch.setattr(matcher, 'RETRIEVAL_MODE', mode)
+    monkeypatch.setattr(matcher, 'ROLE_MIN_CANDIDATES', 1)
+    store_catalog(matcher, aws)
+    builds = []
+    build = matcher.build_skill_matrix
+    monkeypatch.setattr(matcher, 'build_skill_matrix', lambda resumes: builds.append(len(resumes)) or build(resumes))
+    requirements = {'skills': ['Kubernetes', 'terraform', 'internal tool x', 'go'], 'role': 'DevOps Engineer'}
+
+    cold, cold_pool = matcher.retrieve_candidates('jd', requirements)
+    matcher.get_catalog()
+    builds.clear()
+    warm, warm_pool = matcher.retrieve_candidates('jd', requirements)
+    again, _ = matcher.retrieve_candidates('jd', requirements)
+
+    assert [r['resume_id'] for r in warm] == [r['resume_id'] for r in cold]
+    assert again == warm
+    assert builds == [300]
+    if mode == 'role':
+        assert warm_pool == cold_pool
+
+
+@pytest.mark.parametrize('mode', ['embedding', 'hybrid'])
+def test_embedding_modes_search_the_warm_catalog(matcher, aws, monkeypatch, mode):
+    monkeypatch.setattr(matcher, 'RETRIEVAL_MODE', mode)
+    monkeypatch.setattr(matcher, 'CATALOG_ATTRIBUTES', matcher.CATALOG_ATTRIBUTES + ['embedding'])
+    rng = random.Random(5)
+    with aws.Table(matcher.DYNAMODB_TABLE).batch_writer() as batch:
+        for i in range(50):
+            skills = rng.sample(SKILLS, rng.randint(1, 5))
+            batch.put_item(Item=dict(make_resume(f"resume_{i:04d}", skills),
+                                     embedding=matcher.embed_text(' '.join(skills))))
+    requirements = {'skills': ['kubernetes', 'terraform']}
+    catalog = matcher.get_catalog()
+    monkeypatch.setattr(matcher, 'get_catalog', lambda: pytest.fail('warm catalog was loaded again'))
+
+    candidates, pool = matcher.retrieve_candidates('Hiring for kubernetes and terraform', requirements)
+
+    assert pool == len(catalog) == 50
+    assert candidates
+    assert all(r['embedding'] for r in candidates)
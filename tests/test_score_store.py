@@ -0,0 +1,94 @@
+import pytest
+
+from conftest import make_resume
+
+REQUIREMENTS = {'skills': ['python', 'aws', 'docker']}
+
+
+@pytest.fixture
+def ai_engine(matcher, bedrock, monkeypatch):
+    """AI scoring one resume per call, one call at a time, with the in-process score store"""
+    monkeypatch.setattr(matcher, 'MATCH_ENGINE', 'ai')
+    monkeypatch.setattr(matcher, 'SCORE_CACHE_ENABLED', True)
+    monkeypatch.setattr(matcher, 'BATCH_SCORING_ENABLED', False)
+    monkeypatch.setattr(matcher, 'MAX_SCORING_CONCURRENCY', 1)
+    monkeypatch.setattr(matcher, 'RANKING_EARLY_STOP_ENABLED', True)
+    return bedrock
+
+
+def catalog():
+    strong = [make_resume(f"{name}_strong", ['python', 'aws', 'docker']) for name in 'bcd']
+    return [make_resume('a_weak', ['cobol'])] + strong + [make_resume('e_weak', ['fortran'])]
+
+
+def stored_scores(matcher):
+    return {key.rsplit('#', 1)[1]: entry['match']['score'] for key, entry in matcher._score_cache.items()}
+
+
+def test_early_stop_stores_scores_under_the_resume_they_belong_to(matcher, ai_engine):
+    matches = matcher.score_resumes(REQUIREMENTS, catalog(), top_k=3)
+
+    assert [m['resume_id'] for m in matches] == ['b_strong', 'c_strong', 'd_strong']
+    assert ai_engine.calls == 3
+    assert stored_scores(matcher) == {'b_strong': 100, 'c_strong': 100, 'd_strong': 100}
+
+
+def test_stored_scores_are_reused_without_top_k(matcher, ai_engine):
+    matcher.score_resumes(REQUIREMENTS, catalog(), top_k=3)
+
+    matches = matcher.score_resumes(REQUIREMENTS, catalog())
+
+    assert {m['resume_id']: m['score'] for m in matches} == {
+        'a_weak': 0, 'b_strong': 100, 'c_strong': 100, 'd_strong': 100, 'e_weak': 0}
+    assert ai_engine.calls == 5
+    assert stored_scores(matcher)['a_weak'] == 0
+
+
+def lenient_scores(matcher):
+    """Taxonomy credit for related skills and 0.3 for the rest, within match_score_upper_bound"""
+    def scores(required, candidate):
+        credits = [matcher.match_skills_with_taxonomy([skill], candidate)['score'] / 100 or 0.3 for skill in required]
+        return round(100 * sum(credits) / len(credits), 2)
+    return scores
+
+
+def top(matches, k: int):
+    ranked = sorted(matches, key=lambda m: m['score'], reverse=True)
+    return [(m['resume_id'], m['score']) for m in ranked[:k]]
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_early_stop_top_k_equals_exhaustive_top_k(matcher, bedrock, monkeypatch, workers):
+    monkeypatch.setattr(matcher, 'RANKING_EARLY_STOP_ENABLED', True)
+    bedrock.scores = lenient_scores(matcher)
+    pool = ['python', 'django', 'flask', 'aws', 'gcp', 'docker', 'kubernetes', 'jenkins', 'react', 'cobol']
+    resumes = [make_resume(f"resume_{i:02d}", pool[i % 7:i % 7 + 1 + i % 4]) for i in range(40)]
+    requirements = {'skills': ['python', 'aws', 'kubernetes', 'ci/cd']}
+
+    exhaustive = matcher.score_resumes_concurrently(requirements, resumes, max_workers=workers, batched=False)
+    exhaustive_calls = bedrock.calls
+    bounded = matcher.score_resumes_concurrently(requirements, resumes, max_workers=workers, batched=False, top_k=3)
+
+    assert top(bounded, 3) == top(exhaustive, 3)
+    assert bedrock.calls - exhaustive_calls < exhaustive_calls
+
+
+@pytest.mark.parametrize('reply, score', [('85', 85), ('85%', 85), (140, 100), (-5, 0)])
+def test_early_stop_coerces_and_clamps_scores(matcher, bedrock, monkeypatch, reply, score):
+    monkeypatch.setattr(matcher, 'RANKING_EARLY_STOP_ENABLED', True)
+    bedrock.scores = lambda required, candidate: reply
+
+    matches = matcher.score_resumes_concurrently(REQUIREMENTS, catalog(), batched=False, top_k=3)
+
+    assert {m['score'] for m in matches} == {score}
+
+
+@pytest.mark.parametrize('reply', [None, 'high', True])
+def test_early_stop_falls_back_on_unusable_scores(matcher, bedrock, monkeypatch, reply):
+    monkeypatch.setattr(matcher, 'RANKING_EARLY_STOP_ENABLED', True)
+    bedrock.scores = lambda required, candidate: reply
+
+    matches = matcher.score_resumes_concurrently(REQUIREMENTS, catalog(), batched=False, top_k=3)
+
+    assert top(matches, 3) == [('b_strong', 100), ('c_strong', 100), ('d_strong', 100)]
+    assert all(m['explanation'] == matcher.FALLBACK_EXPLANATION for m in matches)
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from conftest import make_resume
+
+REQUIREMENTS = {'skills': ['python', 'aws', 'docker', 'kubernetes']}
+SKILL_POOL = ['python', 'aws', 'docker', 'kubernetes', 'java', 'sql', 'react', 'terraform']
+
+
+def catalog(count: int):
+    return [make_resume(f"resume_{i:02d}", SKILL_POOL[i % 5:i % 5 + 3]) for i in range(count)]
+
+
+def test_concurrent_scoring_matches_sequential(matcher, bedrock):
+    resumes = catalog(24)
+
+    sequential = matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=1, batched=False)
+    concurrent = matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=8, batched=False)
+
+    assert concurrent == sequential
+    assert [m['resume_id'] for m in concurrent] == [r['resume_id'] for r in resumes]
+    assert bedrock.calls == 48
+
+
+def test_concurrency_bounds_calls_in_flight_and_divides_wall_time(matcher, bedrock):
+    bedrock.latency_s = 0.05
+    resumes = catalog(16)
+
+    start = time.perf_counter()
+    matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=1, batched=False)
+    sequential_s = time.perf_counter() - start
+    assert bedrock.max_in_flight == 1
+
+    start = time.perf_counter()
+    matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=8, batched=False)
+    concurrent_s = time.perf_counter() - start
+
+    assert bedrock.max_in_flight == 8
+    assert concurrent_s < sequential_s / 3
+
+
+def test_failed_resume_falls_back_without_affecting_others(matcher, bedrock):
+    resumes = catalog(6) + [make_resume('resume_broken', ['python', 'cobol'])]
+    bedrock.fail_on = {'cobol'}
+
+    matches = matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=4, batched=False)
+
+    by_id = {m['resume_id']: m for m in matches}
+    assert by_id['resume_broken']['explanation'] == matcher.FALLBACK_EXPLANATION
+    assert all(by_id[r['resume_id']]['explanation'] == 'fake' for r in resumes[:6])
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_batched_scores_match_per_resume_scores(matcher, bedrock, monkeypatch, workers):
+    monkeypatch.setattr(matcher, 'BATCH_MAX_RESUMES', 5)
+    resumes = catalog(23)
+
+    single = matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=workers, batched=False)
+    bedrock.calls = 0
+    batched = matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=workers, batched=True)
+
+    assert batched == single
+    assert bedrock.calls == bedrock.batch_calls == 5
+
+
+def test_missing_batch_entries_are_rescored_one_by_one(matcher, bedrock, monkeypatch):
+    monkeypatch.setattr(matcher, 'BATCH_MAX_RESUMES', 5)
+    resumes = catalog(10)
+    single = matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=1, batched=False)
+    bedrock.calls = 0
+    bedrock.omit = {'resume_01', 'resume_07'}
+
+    batched = matcher.score_resumes_concurrently(REQUIREMENTS, resumes, max_workers=1, batched=True)
+
+    assert batched == single
+    assert (bedrock.batch_calls, bedrock.calls) == (2, 4)
+
+
+def test_unparseable_batch_scores_are_rescored(matcher, bedrock, monkeypatch):
+    resumes = catalog(4)
+    match = bedrock.match
+    monkeypatch.setattr(bedrock, 'match', lambda required, candidate: dict(match(required, candidate),
+                                                                           match_score='high'))
+
+    batched = matcher.semantic_match_batch_with_ai(REQUIREMENTS, resumes)
+
+    assert batched == [matcher.simple_match_result(REQUIREMENTS, resume) for resume in resumes]
+    assert (bedrock.batch_calls, bedrock.calls) == (1, 5)
@@ -0,0 +1,93 @@
+import random
+
+import numpy as np
+import pytest
+
+OUTSIDE = ['in-house tool 1', 'in-house tool 2', 'Internal Tool X']
+
+
+@pytest.fixture
+def vocabulary(matcher):
+    return matcher.load_skill_vocabulary()
+
+
+def bit_positions(matcher, blob):
+    bits, _ = matcher.decode_skill_bits(blob)
+    value = int.from_bytes(bits, 'little')
+    return {i for i in range(len(bits) * 8) if value >> i & 1}
+
+
+def test_encode_decode_round_trip(matcher, vocabulary):
+    skills = ['Python', 'docker ', 'python', 'in-house tool 1']
+
+    blob = matcher.encode_skill_bits(skills)
+    bits, outside = matcher.decode_skill_bits(blob)
+
+    assert len(blob) == matcher.SKILL_BITS_HEADER.size + vocabulary['width']
+    assert len(bits) == vocabulary['width']
+    assert outside == 1
+    assert bit_positions(matcher, blob) == {vocabulary['positions']['python'], vocabulary['positions']['docker']}
+
+
+def test_decode_accepts_dynamodb_binary(matcher):
+    from boto3.dynamodb.types import Binary
+
+    blob = matcher.encode_skill_bits(['aws'])
+
+    assert matcher.decode_skill_bits(Binary(blob)) == matcher.decode_skill_bits(blob)
+    assert matcher.decode_skill_bits(None) is None
+    assert matcher.decode_skill_bits(b'\x01') is None
+
+
+def test_version_rules_for_stored_bitsets(matcher, vocabulary, monkeypatch):
+    inside = matcher.encode_skill_bits(['python'])
+    with_outside = matcher.encode_skill_bits(['python', 'in-house tool 1'])
+
+    monkeypatch.setattr(matcher, '_skill_vocabulary', dict(vocabulary, version=vocabulary['version'] + 1,
+                                                           width=vocabulary['width'] + 8))
+    bits, outside = matcher.decode_skill_bits(inside)
+    assert outside == 0 and len(bits) == vocabulary['width'] + 8
+    assert bits.rstrip(b'\0') == inside[matcher.SKILL_BITS_HEADER.size:].rstrip(b'\0')
+    # Its outside skill may have a bit in the newer vocabulary
+    assert matcher.decode_skill_bits(with_outside) is None
+
+    monkeypatch.setattr(matcher, '_skill_vocabulary', dict(vocabulary, version=vocabulary['version'] - 1))
+    assert matcher.decode_skill_bits(inside) is None
+
+
+def test_containment_and_jaccard_match_sets(matcher, vocabulary):
+    rng = random.Random(7)
+    names = list(vocabulary['positions'])
+    resumes = []
+    for i in range(200):
+        skills = rng.sample(names, rng.randint(0, 12)) + rng.sample(OUTSIDE, rng.randint(0, 2))
+        resume = {'resume_id': f"resume_{i:03d}", 'skills': [s.upper() if rng.random() < 0.3 else s for s in skills]}
+        if i % 2:
+            resume['skill_bits'] = matcher.encode_skill_bits(resume['skills'])
+        resumes.append(resume)
+    matrix = matcher.build_skill_matrix(resumes)
+    sizes = matcher.popcount_rows(matrix['bits'])
+    for rows in matrix['outside'].values():
+        sizes[rows] += 1
+
+    for _ in range(20):
+        required = rng.sample(names, 6) + rng.sample(OUTSIDE + ['cobol 85'], 2)
+        required_set = {matcher.normalize_skill(s) for s in required}
+        shared = matcher.skill_overlap_counts(matrix, required)
+        union = sizes + len(required_set) - shared
+
+        for i, resume in enumerate(resumes):
+            resume_set = {matcher.normalize_skill(s) for s in resume['skills']}
+            assert shared[i] / len(required_set) == len(required_set & resume_set) / len(required_set)
+            assert shared[i] / max(1, union[i]) == len(required_set & resume_set) / max(1, len(required_set | resume_set))
+
+
+def test_without_a_vocabulary_everything_is_outside(matcher, monkeypatch):
+    monkeypatch.setattr(matcher, '_skill_vocabulary', {'version': 0, 'positions': {}, 'width': 0})
+    resumes = [{'resume_id': 'a', 'skills': ['python', 'aws']}, {'resume_id': 'b', 'skills': ['react']}]
+
+    matrix = matcher.build_skill_matrix(resumes)
+
+    assert matcher.decode_skill_bits(matcher.encode_skill_bits(['python', 'aws'])) == (b'', 2)
+    assert list(matcher.skill_overlap_counts(matrix, ['Python', 'AWS', 'go'])) == [2, 0]
+    assert np.array_equal(matcher.popcount_rows(matrix['bits']), [0, 0])
@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.mark.parametrize('text, skills', [
+    ('Built dashboards in Power BI and styled them with Tailwind CSS', ['power bi', 'tailwind css']),
+    ('Shipped a React Native app alongside the React site', ['react', 'react native']),
+    ('Moved the data lake to Spring Boot microservices', ['data lake', 'microservices', 'spring boot']),
+    ('Applied machine-learning to logs', ['machine learning']),
+])
+def test_multi_word_phrases_match_as_one_skill(matcher, text, skills):
+    assert matcher.extract_skills_from_dictionary(text) == skills
+
+
+def test_longest_phrase_wins_over_its_prefix(matcher):
+    assert matcher.extract_skills_from_dictionary('spring cleaning; Spring Boot') == ['spring boot']
+    assert matcher.extract_skills_from_dictionary('a data lake of data') == ['data lake']
+
+
+@pytest.mark.parametrize('text, skills', [
+    ('Senior JavaScript developer', ['javascript']),
+    ('Java and JavaScript', ['java', 'javascript']),
+    ('Worked at Google on search', []),
+    ('the go-to person for releases', []),
+    ('Wrote services in Go', ['go']),
+])
+def test_skills_match_whole_words_only(matcher, text, skills):
+    assert matcher.extract_skills_from_dictionary(text) == skills
+
+
+def test_spellings_and_aliases_resolve_to_canonical_skills(matcher):
+    assert matcher.extract_skills_from_dictionary('NodeJS, golang, k8s and CI/CD') == \
+        ['ci/cd', 'go', 'kubernetes', 'nodejs']
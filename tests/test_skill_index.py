@@ -0,0 +1,70 @@
+import pytest
+
+from conftest import make_resume
+
+COMMON_SKILLS = ['python', 'sql', 'react', 'css', 'java', 'docker']
+COBOL_IDS = ['cobol_0', 'cobol_1', 'cobol_2']
+
+
+def store(matcher, aws, resumes):
+    with aws.Table(matcher.DYNAMODB_TABLE).batch_writer() as batch:
+        for resume in resumes:
+            batch.put_item(Item=resume)
+
+
+def catalog(unrelated: int):
+    return [make_resume(resume_id, ['cobol', 'mainframe']) for resume_id in COBOL_IDS] + [
+        make_resume(f"resume_{i:04d}", COMMON_SKILLS[i % 5:i % 5 + 2]) for i in range(unrelated)]
+
+
+def spy_reads(matcher, monkeypatch) -> dict:
+    """Record the keys requested per table through batch_get_items; any scan fails the test"""
+    requested = {}
+    batch_get = matcher.batch_get_items
+
+    def spy(table_name, key_name, key_values, attributes=None):
+        requested.setdefault(table_name, []).extend(key_values)
+        return batch_get(table_name, key_name, key_values, attributes)
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError('skill lookup scanned a table')
+
+    monkeypatch.setattr(matcher, 'batch_get_items', spy)
+    monkeypatch.setattr(matcher, 'scan_pages', no_scan)
+    return requested
+
+
+@pytest.mark.parametrize('unrelated', [50, 500])
+def test_lookup_reads_only_posting_lists_and_their_resumes(matcher, aws, monkeypatch, unrelated):
+    store(matcher, aws, catalog(unrelated))
+    matcher.rebuild_skill_index()
+    requested = spy_reads(matcher, monkeypatch)
+
+    resumes = matcher.get_resumes_for_skills(['COBOL'])
+
+    assert [r['resume_id'] for r in resumes] == COBOL_IDS
+    assert requested[matcher.SKILL_INDEX_TABLE] == matcher.expand_skills(['COBOL'])
+    assert sorted(requested[matcher.DYNAMODB_TABLE]) == COBOL_IDS
+
+
+def test_lookup_finds_resumes_indexed_incrementally(matcher, aws, monkeypatch):
+    store(matcher, aws, catalog(100))
+    matcher.rebuild_skill_index()
+    late = make_resume('cobol_late', ['COBOL', 'jcl'])
+    store(matcher, aws, [late])
+    matcher.update_skill_index(late['resume_id'], late['skills'])
+    requested = spy_reads(matcher, monkeypatch)
+
+    resumes = matcher.get_resumes_for_skills(['cobol', 'go'])
+
+    assert [r['resume_id'] for r in resumes] == COBOL_IDS + ['cobol_late']
+    assert sorted(requested[matcher.DYNAMODB_TABLE]) == COBOL_IDS + ['cobol_late']
+
+
+def test_lookup_of_unindexed_skill_reads_no_resumes(matcher, aws, monkeypatch):
+    store(matcher, aws, catalog(100))
+    matcher.rebuild_skill_index()
+    requested = spy_reads(matcher, monkeypatch)
+
+    assert matcher.get_resumes_for_skills(['fortran']) == []
+    assert requested.get(matcher.DYNAMODB_TABLE, []) == []
@@ -0,0 +1,39 @@
+import pytest
+
+
+@pytest.mark.parametrize('required, resume', [(['kubernetes'], ['k8s']), (['k8s'], ['Kubernetes']),
+                                              (['Golang'], ['go'])])
+def test_aliases_resolve_to_exact_matches(matcher, required, resume):
+    result = matcher.match_skills_with_taxonomy(required, resume)
+
+    assert result['score'] == 100.0
+    assert result['matched_skills'] == required
+    assert result['missing_skills'] == []
+
+
+def test_category_is_satisfied_by_a_member(matcher):
+    result = matcher.match_skills_with_taxonomy(['ci/cd'], ['jenkins'])
+
+    assert result == {'score': 90.0, 'matched_skills': ['ci/cd (jenkins)'], 'missing_skills': []}
+
+
+@pytest.mark.parametrize('required, resume, score, label', [
+    (['jenkins'], ['circleci'], 50.0, 'jenkins (~circleci)'),
+    (['jenkins'], ['ci/cd'], 40.0, 'jenkins (~ci/cd)'),
+    (['container orchestration'], ['docker'], 50.0, 'container orchestration (~docker)'),
+])
+def test_siblings_and_parents_earn_partial_credit(matcher, required, resume, score, label):
+    assert matcher.match_skills_with_taxonomy(required, resume) == {
+        'score': score, 'matched_skills': [label], 'missing_skills': []}
+
+
+def test_score_averages_credit_over_required_skills(matcher):
+    result = matcher.match_skills_with_taxonomy(['python', 'aws', 'cobol', 'Python'], ['python', 'azure'])
+
+    assert result == {'score': 50.0, 'matched_skills': ['python', 'aws (~azure)'], 'missing_skills': ['cobol']}
+
+
+@pytest.mark.parametrize('required, resume', [(['python'], ['cobol']), (['docker'], ['kubernetes']),
+                                              (['aws', 'terraform'], []), ([], ['python'])])
+def test_no_overlap_scores_zero(matcher, required, resume):
+    assert matcher.match_skills_with_taxonomy(required, resume)['score'] == 0.0
@@ -0,0 +1,90 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class TelegramServer(BaseHTTPRequestHandler):
+    """
+    Local api.telegram.org: records (method, payload, client port) per call, so
+    calls on one keep-alive connection share a port. editMessageText fails
+    while fail_edits is set.
+    """
+    protocol_version = 'HTTP/1.1'
+    calls = []
+    fail_edits = False
+    lock = threading.Lock()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        method = self.path.rsplit('/', 1)[-1]
+        with self.lock:
+            self.calls.append((method, payload, self.client_address[1]))
+            message_id = len(self.calls)
+        if method == 'editMessageText' and self.fail_edits:
+            status, body = 400, {'ok': False, 'description': 'Bad Request: message to edit not found'}
+        else:
+            status, body = 200, {'ok': True, 'result': {'message_id': payload.get('message_id', message_id)}}
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def telegram(matcher, monkeypatch):
+    """TelegramServer on a free local port, with the matcher's client pointed at it"""
+    TelegramServer.calls = []
+    TelegramServer.fail_edits = False
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TelegramServer)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(matcher, 'TELEGRAM_API_URL', f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(matcher, 'BOT_TOKEN', 'test-token')
+    monkeypatch.setattr(matcher, '_telegram_http', None)
+    monkeypatch.setattr(matcher, 'TELEGRAM_PROGRESS_INTERVAL_SECONDS', 0)
+    yield TelegramServer
+    server.shutdown()
+    server.server_close()
+
+
+def test_calls_reuse_one_connection(matcher, telegram):
+    for i in range(5):
+        assert matcher.send_telegram_message(42, f"hello {i}") is not None
+
+    assert [method for method, _, _ in telegram.calls] == ['sendMessage'] * 5
+    assert len({port for _, _, port in telegram.calls}) == 1
+
+
+def test_status_edits_one_message_in_place(matcher, telegram):
+    status = matcher.TelegramStatus(42)
+
+    status.progress('⏳ Reading the job description...')
+    status.progress('🔍 Matching 3 resumes...')
+    status.update('✅ Best match: resume_1')
+    status.update('✅ Best match: resume_1')
+
+    assert [method for method, _, _ in telegram.calls] == ['sendMessage', 'editMessageText', 'editMessageText']
+    sent_id = status.message_id
+    assert all(payload['message_id'] == sent_id for _, payload, _ in telegram.calls[1:])
+    assert telegram.calls[-1][1]['text'] == '✅ Best match: resume_1'
+
+
+def test_failed_edit_falls_back_to_a_new_message(matcher, telegram):
+    status = matcher.TelegramStatus(42)
+    status.update('⏳ Working...')
+    first_id = status.message_id
+    telegram.fail_edits = True
+
+    status.update('✅ Done')
+
+    assert [method for method, _, _ in telegram.calls] == ['sendMessage', 'editMessageText', 'sendMessage']
+    assert telegram.calls[-1][1] == {'chat_id': 42, 'text': '✅ Done'}
+    assert status.message_id not in (None, first_id)
+    assert status.text == '✅ Done'